@@ -2,6 +2,8 @@
 
 """
     Script de lancement de la séparation d'images en sous-images
+
+    Exemple : python -m Sepim.main ../Donnees --sortie ../Resultats --moteur composantes_connexes --processus 4
 """
 
 # =================================================================================================
@@ -20,11 +22,30 @@ __status = 'dev'
 # ==================================================================================================
 
 from Sepim.modules.gestionnaire_des_images_a_traiter import GestionnaireDesImagesATraiter
+from Sepim.modules.gestionnaire_extraction_des_sous_images import MOTEURS_D_EXTRACTION
+from Sepim.modules.gestionnaire_d_image import ORDRES_DES_CANAUX
+from Sepim.modules.gestionnaire_des_destinations_de_sauvegarde import DESTINATIONS_DE_SAUVEGARDE
+from Sepim.modules.gestionnaire_rotation_des_images import MODES_D_ESTIMATION_DE_L_ANGLE, PRESETS_DE_ROTATION
+from Sepim.modules.gestionnaire_d_ecriture_des_images import NOMBRE_DE_FILS_D_ECRITURE_PAR_DEFAUT, LIMITE_D_OCTETS_EN_COURS_PAR_DEFAUT
+from Sepim.modules.gestionnaire_du_cache_des_resultats import CacheDesResultats, TAILLE_MAXIMALE_DU_CACHE_PAR_DEFAUT
+from Sepim.modules.gestionnaire_de_surveillance_du_dossier import SurveillanceDuDossier, INTERVALLE_DE_SCRUTATION_PAR_DEFAUT, DELAI_DE_STABILITE_PAR_DEFAUT
+import sys
+import signal
+import argparse
+import numpy
 
 # ==================================================================================================
 # INITIALISATIONS
 # ==================================================================================================
 
+# Nombre d'octets dans un mégaoctet (unité du budget mémoire et de la taille du cache passés en ligne de commande)
+OCTETS_PAR_MEGAOCTET = 1024 * 1024
+
+# Niveaux d'encodage passés en ligne de commande : (option, extensions concernées, niveau minimal, niveau maximal)
+NIVEAUX_D_ENCODAGE_DE_LA_LIGNE_DE_COMMANDE = (("compression_png", ("png", ), 0, 9),
+                                             ("qualite_jpeg", ("jpg", "jpeg"), 0, 100),
+                                             ("qualite_webp", ("webp", ), 1, 100))
+
 # ==================================================================================================
 # CLASSES
 # ==================================================================================================
@@ -33,11 +54,266 @@ from Sepim.modules.gestionnaire_des_images_a_traiter import GestionnaireDesImage
 # FONCTIONS
 # ==================================================================================================
 
+
+# ==================================
+def conversion_de_la_couleur(texte):
+    """
+        Fonction qui permet de convertir la couleur de séparation passée en ligne de commande : "R,G,B" ou "#RRGGBB"
+
+        :param texte: couleur de séparation
+        :type texte: str
+
+        :return: la couleur de séparation (RGB)
+        :rtype: numpy.ndarray
+    """
+
+    try:
+
+        if texte.startswith("#"):
+
+            composantes = [int(texte[indice:indice + 2], 16) for indice in (1, 3, 5)] if len(texte) == 7 else []
+
+        else:
+
+            composantes = [int(composante) for composante in texte.split(",")]
+
+    except ValueError:
+
+        composantes = []
+
+    if len(composantes) != 3 or not all(0 <= composante <= 255 for composante in composantes):
+
+        raise argparse.ArgumentTypeError("couleur invalide : {} (format attendu : R,G,B ou #RRGGBB)".format(texte))
+
+    return numpy.array(composantes)
+
+
+# ===================================
+def conversion_de_l_extension(texte):
+    """
+        Fonction qui permet de convertir une extension passée en ligne de commande en motif de fichier ("png" devient "*.png")
+
+        :param texte: extension ou motif de fichier
+        :type texte: str
+
+        :return: le motif de fichier
+        :rtype: str
+    """
+
+    return texte if any(caractere in texte for caractere in "*?[") else "*.{}".format(texte.lstrip("."))
+
+
+# ============================
+def creation_de_l_analyseur():
+    """
+        Fonction qui permet de créer l'analyseur des arguments de la ligne de commande
+
+        :return: l'analyseur des arguments
+        :rtype: argparse.ArgumentParser
+    """
+
+    analyseur = argparse.ArgumentParser(prog = "sepim", description = "Séparation d'images en sous-images")
+
+    # emplacements et fichiers
+    analyseur.add_argument("dossier", nargs = "?", default = "../Donnees", help = "dossier contenant les images à traiter (défaut : %(default)s)")
+    analyseur.add_argument("-s", "--sortie", default = None, help = "dossier de sauvegarde des sous-images (défaut : sous-dossier Sauvegarde du dossier des images)")
+    analyseur.add_argument("-e", "--extensions", nargs = "+", type = conversion_de_l_extension, default = ["*.png"],
+                           help = "extensions ou motifs des fichiers à traiter (défaut : *.png)")
+    analyseur.add_argument("-c", "--couleur", type = conversion_de_la_couleur, default = "181,230,29",
+                           help = "couleur de séparation, R,G,B ou #RRGGBB (défaut : %(default)s)")
+    analyseur.add_argument("-f", "--format", default = None, help = "extension des sous-images sauvegardées, par exemple png ou jpg (défaut : celle de l'image)")
+    analyseur.add_argument("-d", "--destination", choices = sorted(DESTINATIONS_DE_SAUVEGARDE), default = "fichiers",
+                           help = "destination des sous-images : un fichier par sous-image, une archive tar ou zip par image, "
+                                  "ou un fichier npz de tableaux par image (défaut : %(default)s)")
+    analyseur.add_argument("--compression-png", type = int, default = None, metavar = "0-9",
+                           help = "niveau de compression des sous-images PNG, 0 : le plus rapide (défaut : celui d'OpenCV)")
+    analyseur.add_argument("--qualite-jpeg", type = int, default = None, metavar = "0-100", help = "qualité des sous-images JPEG (défaut : celle d'OpenCV)")
+    analyseur.add_argument("--qualite-webp", type = int, default = None, metavar = "1-100",
+                           help = "qualité des sous-images WebP, 100 : sans perte (défaut : celle d'OpenCV)")
+
+    # réglages de performance
+    analyseur.add_argument("--moteur", choices = ["historique"] + sorted(MOTEURS_D_EXTRACTION), default = "historique",
+                           help = "moteur d'extraction des sous-images (défaut : %(default)s)")
+    analyseur.add_argument("--estimation-de-l-angle", choices = MODES_D_ESTIMATION_DE_L_ANGLE, default = "rectangle_minimal",
+                           help = "mode d'estimation de l'angle de rotation (défaut : %(default)s)")
+    analyseur.add_argument("--rotation", choices = sorted(PRESETS_DE_ROTATION), default = "bilineaire",
+                           help = "préréglage de rotation des sous-images (défaut : %(default)s) ; "
+                                  "qualite ne tourne les sous-images comme le traitement historique qu'avec --estimation-de-l-angle hough")
+    analyseur.add_argument("-p", "--processus", type = int, default = 1, help = "nombre de processus de traitement (défaut : %(default)s)")
+    analyseur.add_argument("--flux", action = "store_true", help = "traitement en flux : étapes reliées par des files bornées (ignore --processus)")
+    analyseur.add_argument("--taille-des-files", type = int, default = 2, help = "taille des files du traitement en flux (défaut : %(default)s)")
+    analyseur.add_argument("--fils-d-ecriture", type = int, default = NOMBRE_DE_FILS_D_ECRITURE_PAR_DEFAUT,
+                           help = "nombre de fils d'exécution d'écriture des sous-images (défaut : %(default)s)")
+    analyseur.add_argument("--budget-memoire", type = int, default = LIMITE_D_OCTETS_EN_COURS_PAR_DEFAUT // OCTETS_PAR_MEGAOCTET,
+                           help = "budget mémoire (en Mo) des sous-images en attente d'écriture (défaut : %(default)s)")
+    analyseur.add_argument("--ordre-des-canaux", choices = ORDRES_DES_CANAUX, default = "RGB",
+                           help = "ordre des canaux des images en mémoire ; BGR évite les conversions au chargement et à la sauvegarde (défaut : %(default)s)")
+    analyseur.add_argument("--palettes", action = "store_true",
+                           help = "charge les images à palette (PNG indexés) en plan d'indices : extraction sur un octet par pixel (nécessite Pillow)")
+    analyseur.add_argument("--rapport-json", default = None, help = "fichier du rapport JSON du traitement (mesure de chaque étape)")
+    analyseur.add_argument("--rapport-openmetrics", default = None, help = "fichier du rapport OpenMetrics du traitement (mesure de chaque étape)")
+    analyseur.add_argument("--hauteur-des-bandes", type = int, default = None,
+                           help = "mode grande image : mémoire projetée et extraction par bandes de cette hauteur (en pixels)")
+
+    # cache des résultats
+    analyseur.add_argument("--cache", default = None, help = "dossier du cache des résultats : les images inchangées dont les sous-images existent ne sont pas retraitées")
+    analyseur.add_argument("--taille-du-cache", type = int, default = TAILLE_MAXIMALE_DU_CACHE_PAR_DEFAUT // OCTETS_PAR_MEGAOCTET,
+                           help = "taille maximale (en Mo) du cache des résultats (défaut : %(default)s)")
+    analyseur.add_argument("--invalider-le-cache", action = "store_true", help = "vide le cache des résultats (--cache) puis termine, sans traiter d'image")
+
+    # mode démon
+    analyseur.add_argument("--surveillance", action = "store_true",
+                           help = "surveille le dossier en continu et traite les images nouvelles ou modifiées dès leur arrivée (arrêt : Ctrl+C)")
+    analyseur.add_argument("--intervalle", type = float, default = INTERVALLE_DE_SCRUTATION_PAR_DEFAUT,
+                           help = "intervalle (en secondes) entre deux scrutations du dossier (défaut : %(default)s)")
+    analyseur.add_argument("--delai-de-stabilite", type = float, default = DELAI_DE_STABILITE_PAR_DEFAUT,
+                           help = "délai (en secondes) pendant lequel un fichier doit rester inchangé avant son traitement (défaut : %(default)s)")
+
+    return analyseur
+
+
+# ==============================
+def principal(arguments = None):
+    """
+        Fonction principale de la ligne de commande : traitement des images puis affichage du résumé de chaque image
+
+        :param arguments: arguments de la ligne de commande (None : sys.argv)
+        :type arguments: None | list[str]
+
+        :return: le code de sortie (0 si toutes les images ont été traitées, 1 sinon ; le programme se termine avec le code 1
+                 si le dossier des images est introuvable ou si un rapport ne peut pas être écrit)
+        :rtype: int
+    """
+
+    analyseur = creation_de_l_analyseur()
+    arguments_analyses = analyseur.parse_args(arguments)
+
+    # invalidation du cache des résultats
+    if arguments_analyses.invalider_le_cache:
+
+        if arguments_analyses.cache is None:
+
+            analyseur.error("--invalider-le-cache nécessite --cache")
+
+        print("{} entrée(s) supprimée(s) du cache".format(CacheDesResultats(arguments_analyses.cache).invalidation()))
+
+        return 0
+
+    gestionnaire_des_images_a_traiter = GestionnaireDesImagesATraiter(moteur_d_extraction = arguments_analyses.moteur,
+                                                                      mode_d_estimation_de_l_angle = arguments_analyses.estimation_de_l_angle,
+                                                                      preset_de_rotation = arguments_analyses.rotation,
+                                                                      nombre_de_processus = arguments_analyses.processus,
+                                                                      parallelisme_des_etapes = {} if arguments_analyses.flux else None,
+                                                                      taille_des_files = arguments_analyses.taille_des_files,
+                                                                      nombre_de_fils_d_ecriture = arguments_analyses.fils_d_ecriture,
+                                                                      limite_d_octets_en_ecriture = arguments_analyses.budget_memoire * OCTETS_PAR_MEGAOCTET,
+                                                                      hauteur_des_bandes = arguments_analyses.hauteur_des_bandes,
+                                                                      dossier_contenant_les_images = arguments_analyses.dossier,
+                                                                      extensions_prises_en_charge = arguments_analyses.extensions,
+                                                                      couleur_de_separation = arguments_analyses.couleur,
+                                                                      dossier_de_sauvegarde = arguments_analyses.sortie,
+                                                                      format_de_sauvegarde = arguments_analyses.format,
+                                                                      rapport_json = arguments_analyses.rapport_json,
+                                                                      rapport_openmetrics = arguments_analyses.rapport_openmetrics,
+                                                                      dossier_du_cache = arguments_analyses.cache,
+                                                                      taille_maximale_du_cache = arguments_analyses.taille_du_cache * OCTETS_PAR_MEGAOCTET,
+                                                                      ordre_des_canaux = arguments_analyses.ordre_des_canaux,
+                                                                      destination_de_sauvegarde = arguments_analyses.destination,
+                                                                      niveaux_d_encodage = creation_des_niveaux_d_encodage(analyseur, arguments_analyses),
+                                                                      decodage_des_palettes = arguments_analyses.palettes)
+
+    # mode démon : traitement des images au fil de leur arrivée
+    if arguments_analyses.surveillance:
+
+        surveillance = SurveillanceDuDossier(gestionnaire_des_images_a_traiter, arguments_analyses.intervalle, arguments_analyses.delai_de_stabilite,
+                                             affichage_des_resumes)
+
+        # arrêt propre à la réception de SIGTERM (arrêt d'un service), à la fin du cycle en cours
+        signal.signal(signal.SIGTERM, lambda *_: surveillance.arret())
+
+        try:
+
+            surveillance.surveillance()
+
+        except KeyboardInterrupt:
+
+            pass
+
+        # dossier des images introuvable ou dossier de sauvegarde surveillé : message d'erreur sur une ligne, sans trace de la pile d'appels
+        except (OSError, ValueError) as exception:
+
+            analyseur.exit(1, "{}: erreur : {}\n".format(analyseur.prog, exception))
+
+        return 0
+
+    # le traitement de chaque image intercepte ses propres erreurs : seules les erreurs de listage des images et d'écriture des rapports parviennent ici
+    try:
+
+        resultats = gestionnaire_des_images_a_traiter.lancement_du_traitement_des_images()
+
+    except OSError as exception:
+
+        analyseur.exit(1, "{}: erreur : {}\n".format(analyseur.prog, exception))
+
+    affichage_des_resumes(resultats)
+
+    return 1 if any(resume["erreur"] is not None for resume in resultats) else 0
+
+
+# =================================================================
+def creation_des_niveaux_d_encodage(analyseur, arguments_analyses):
+    """
+        Fonction qui permet de vérifier et de regrouper par extension les niveaux d'encodage passés en ligne de commande
+        (l'analyseur termine le programme si un niveau est hors de son intervalle)
+
+        :param analyseur: analyseur des arguments
+        :type analyseur: argparse.ArgumentParser
+
+        :param arguments_analyses: arguments de la ligne de commande
+        :type arguments_analyses: argparse.Namespace
+
+        :return: le niveau d'encodage de chaque extension renseignée (None si aucun niveau n'est renseigné)
+        :rtype: None | dict[str, int]
+    """
+
+    niveaux_d_encodage = {}
+
+    for option, extensions, minimum, maximum in NIVEAUX_D_ENCODAGE_DE_LA_LIGNE_DE_COMMANDE:
+
+        niveau = getattr(arguments_analyses, option)
+
+        if niveau is None:
+
+            continue
+
+        if not minimum <= niveau <= maximum:
+
+            analyseur.error("--{} : niveau {} hors de l'intervalle {}-{}".format(option.replace("_", "-"), niveau, minimum, maximum))
+
+        niveaux_d_encodage.update(dict.fromkeys(extensions, niveau))
+
+    return niveaux_d_encodage or None
+
+
+# ===================================
+def affichage_des_resumes(resultats):
+    """
+        Fonction qui permet d'afficher une ligne de résumé pour chaque image traitée
+
+        :param resultats: résumé du traitement de chaque image
+        :type resultats: list[dict]
+    """
+
+    for resume in resultats:
+
+        print("{image} : {nombre_de_sous_images} sous-image(s), {nombre_de_rotations} rotation(s), {duree:.3f} s".format(**resume)
+              + (" (cache)" if resume["depuis_le_cache"] else "")
+              + ("" if resume["erreur"] is None else " - erreur : {}".format(resume["erreur"])), flush = True)
+
 # ==================================================================================================
 # UTILISATION
 # ==================================================================================================
 
 if __name__ == "__main__":
 
-    gestionnaire_des_images_a_traiter = GestionnaireDesImagesATraiter()
-    gestionnaire_des_images_a_traiter.lancement_du_traitement_des_images()
+    sys.exit(principal())
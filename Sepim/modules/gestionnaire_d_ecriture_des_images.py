@@ -0,0 +1,275 @@
+# coding=utf-8
+
+"""
+    Module qui permet d'encoder et d'écrire les sous-images de manière asynchrone
+"""
+
+# =================================================================================================
+# PARAMETRES GLOBAUX
+# =================================================================================================
+
+__author__ = 'Julien LEPAIN'
+__email__ = 'julien.lepain.31@gmail.com'
+__version__ = '1.0'
+__maintainer__ = 'Julien LEPAIN'
+__date__ = '16/05/2019'
+__status = 'dev'
+
+# ==================================================================================================
+# IMPORTS
+# ==================================================================================================
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# OpenCV (cv2) est importé à sa première utilisation, par les fils d'exécution d'écriture
+
+# ==================================================================================================
+# INITIALISATIONS
+# ==================================================================================================
+
+# Nombre de fils d'exécution d'écriture par défaut
+NOMBRE_DE_FILS_D_ECRITURE_PAR_DEFAUT = 4
+
+# Nombre maximal d'octets (données des sous-images) en attente d'écriture par défaut
+LIMITE_D_OCTETS_EN_COURS_PAR_DEFAUT = 256 * 1024 * 1024
+
+# Conversion (constante de cv2) appliquée avant l'encodage selon l'ordre des canaux des sous-images (None : aucune conversion)
+CONVERSIONS_AVANT_L_ECRITURE = {"RGB": "COLOR_RGB2BGR", "BGR": None}
+
+# ==================================================================================================
+# CLASSES
+# ==================================================================================================
+
+
+# ==============================
+class EcrivainDesImages(object):
+    """
+        Classe d'écriture asynchrone des sous-images
+
+        L'encodage (conversion des couleurs puis compression par OpenCV, qui libère le GIL) et l'écriture des fichiers
+        sont réalisés par un ensemble de fils d'exécution. Le nombre d'octets en attente d'écriture est borné :
+        une soumission est bloquante tant que la limite serait dépassée.
+
+        Seule la configuration est conservée lors de la copie de l'écrivain vers un autre processus :
+        l'ensemble de fils d'exécution est recréé à la première soumission, et doit être fermé par le détenteur de la copie.
+
+        :ivar __nombre_de_fils: nombre de fils d'exécution d'écriture
+        :type __nombre_de_fils: int
+
+        :ivar __limite_d_octets_en_cours: nombre maximal d'octets en attente d'écriture
+        :type __limite_d_octets_en_cours: int
+
+        :ivar __octets_en_cours: nombre d'octets en attente d'écriture
+        :type __octets_en_cours: int
+
+        :ivar __condition: condition protégeant le nombre d'octets en attente d'écriture
+        :type __condition: threading.Condition
+
+        :ivar __executeur: ensemble de fils d'exécution d'écriture (créé à la première soumission)
+        :type __executeur: None | concurrent.futures.ThreadPoolExecutor
+
+        :ivar __copie: True si l'écrivain est une copie recréée dans un autre processus (cf. __setstate__)
+        :type __copie: bool
+    """
+
+    # ========================================================================================================================================
+    def __init__(self, nombre_de_fils = NOMBRE_DE_FILS_D_ECRITURE_PAR_DEFAUT, limite_d_octets_en_cours = LIMITE_D_OCTETS_EN_COURS_PAR_DEFAUT):
+        """
+            Constructeur de la classe
+
+            :param nombre_de_fils: nombre de fils d'exécution d'écriture
+            :type nombre_de_fils: int
+
+            :param limite_d_octets_en_cours: nombre maximal d'octets en attente d'écriture
+            :type limite_d_octets_en_cours: int
+        """
+
+        # Attributs d'instance initialisés via les paramètres du constructeur
+        self.__nombre_de_fils = nombre_de_fils
+        self.__limite_d_octets_en_cours = limite_d_octets_en_cours
+
+        # Autres attributs d'instance
+        self.__octets_en_cours = 0
+        self.__condition = threading.Condition()
+        self.__executeur = None
+        self.__copie = False
+
+    # =====================
+    def __getstate__(self):
+        """
+            Méthode qui permet de copier l'écrivain vers un autre processus : seule sa configuration est conservée
+
+            :return: la configuration de l'écrivain
+            :rtype: tuple(int, int)
+        """
+
+        return self.__nombre_de_fils, self.__limite_d_octets_en_cours
+
+    # ===========================
+    def __setstate__(self, etat):
+        """
+            Méthode qui permet de recréer l'écrivain à partir de sa configuration
+
+            :param etat: configuration de l'écrivain
+            :type etat: tuple(int, int)
+        """
+
+        self.__init__(*etat)
+        self.__copie = True
+
+    # ==================
+    def get_copie(self):
+        """
+            Accesseur de l'attribut __copie
+
+            :return: __copie
+            :rtype: bool
+        """
+
+        return self.__copie
+
+    # ================================================================================================
+    def soumission(self, nom_du_fichier, donnees_image, ordre_des_canaux = "RGB", destination = None):
+        """
+            Méthode qui permet de soumettre l'écriture d'une sous-image
+            Cette méthode est bloquante tant que la limite d'octets en attente d'écriture serait dépassée
+            (une sous-image est toujours acceptée lorsqu'aucune écriture n'est en cours)
+
+            :param nom_du_fichier: nom absolu du fichier à écrire, ou nom de la sous-image dans la destination
+            :type nom_du_fichier: str
+
+            :param donnees_image: données de la sous-image
+            :type donnees_image: numpy.ndarray
+
+            :param ordre_des_canaux: ordre des canaux des données de la sous-image ("RGB" ou "BGR" : écriture sans conversion)
+            :type ordre_des_canaux: str
+
+            :param destination: destination de la sous-image (cf. Sepim.modules.gestionnaire_des_destinations_de_sauvegarde),
+            qui l'encode et l'enregistre (None : écriture dans le fichier indiqué avec les réglages par défaut d'OpenCV)
+            :type destination: None | object
+
+            :return: la tâche d'écriture
+            :rtype: concurrent.futures.Future
+        """
+
+        taille = donnees_image.nbytes
+
+        with self.__condition:
+
+            while self.__octets_en_cours > 0 and self.__octets_en_cours + taille > self.__limite_d_octets_en_cours:
+
+                self.__condition.wait()
+
+            self.__octets_en_cours += taille
+
+            if self.__executeur is None:
+
+                self.__executeur = ThreadPoolExecutor(max_workers = self.__nombre_de_fils)
+
+        return self.__executeur.submit(self.ecriture, nom_du_fichier, donnees_image, taille, ordre_des_canaux, destination)
+
+    # ======================================================================================================
+    def ecriture(self, nom_du_fichier, donnees_image, taille, ordre_des_canaux = "RGB", destination = None):
+        """
+            Méthode exécutée par les fils d'exécution d'écriture : encodage et écriture d'une sous-image
+
+            :param nom_du_fichier: nom absolu du fichier à écrire, ou nom de la sous-image dans la destination
+            :type nom_du_fichier: str
+
+            :param donnees_image: données de la sous-image
+            :type donnees_image: numpy.ndarray
+
+            :param taille: nombre d'octets de la sous-image comptabilisés lors de la soumission
+            :type taille: int
+
+            :param ordre_des_canaux: ordre des canaux des données de la sous-image (cf. CONVERSIONS_AVANT_L_ECRITURE)
+            :type ordre_des_canaux: str
+
+            :param destination: destination de la sous-image (None : écriture dans le fichier indiqué)
+            :type destination: None | object
+        """
+
+        try:
+
+            if destination is not None:
+
+                destination.ajout(nom_du_fichier, donnees_image)
+
+            else:
+
+                ecriture_d_un_fichier(nom_du_fichier, donnees_image, ordre_des_canaux)
+
+        finally:
+
+            with self.__condition:
+
+                self.__octets_en_cours -= taille
+                self.__condition.notify_all()
+
+    # ========================
+    def attente(self, taches):
+        """
+            Méthode qui permet d'attendre la fin des écritures soumises (par exemple celles des sous-images d'une même image)
+
+            :param taches: tâches d'écriture à attendre (cf. soumission)
+            :type taches: list[concurrent.futures.Future]
+
+            :raise Exception: la première erreur rencontrée lors des écritures, le cas échéant
+        """
+
+        wait(taches)
+
+        for tache in taches:
+
+            tache.result()
+
+    # ==================
+    def fermeture(self):
+        """
+            Méthode qui permet d'arrêter les fils d'exécution d'écriture, après la fin des écritures en cours
+        """
+
+        if self.__executeur is not None:
+
+            self.__executeur.shutdown(wait = True)
+            self.__executeur = None
+
+# ==================================================================================================
+# FONCTIONS
+# ==================================================================================================
+
+
+# ========================================================================================
+def ecriture_d_un_fichier(nom_absolu_du_fichier, donnees_image, ordre_des_canaux = "RGB"):
+    """
+        Fonction qui permet d'encoder et d'écrire une sous-image dans un fichier, avec les réglages par défaut d'OpenCV
+
+        :param nom_absolu_du_fichier: nom absolu du fichier à écrire
+        :type nom_absolu_du_fichier: str
+
+        :param donnees_image: données de la sous-image
+        :type donnees_image: numpy.ndarray
+
+        :param ordre_des_canaux: ordre des canaux des données de la sous-image (cf. CONVERSIONS_AVANT_L_ECRITURE)
+        :type ordre_des_canaux: str
+
+        :raise IOError: si la sous-image ne peut pas être écrite
+    """
+
+    import cv2
+
+    # OpenCV encode des données BGR : les données dans cet ordre sont écrites sans copie
+    conversion = CONVERSIONS_AVANT_L_ECRITURE[ordre_des_canaux]
+
+    if conversion is not None:
+
+        donnees_image = cv2.cvtColor(donnees_image, getattr(cv2, conversion))
+
+    if not cv2.imwrite(nom_absolu_du_fichier, donnees_image):
+
+        raise IOError("Écriture impossible : {}".format(nom_absolu_du_fichier))
+
+# ==================================================================================================
+# UTILISATION
+# ==================================================================================================
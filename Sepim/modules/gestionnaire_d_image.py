@@ -21,17 +21,32 @@ __status = 'dev'
 
 from Sepim.modules.objet_image import ObjetImage
 from Sepim.modules.gestionnaire_rotation_des_images import RotationDesImages
+from Sepim.modules.gestionnaire_extraction_des_sous_images import MOTEURS_D_EXTRACTION, ExtractionParBandes, calcul_masque_du_contenu
+from Sepim.modules.gestionnaire_d_ecriture_des_images import EcrivainDesImages
+from Sepim.modules.gestionnaire_des_destinations_de_sauvegarde import DESTINATIONS_DE_SAUVEGARDE
+from Sepim.modules.gestionnaire_d_instrumentation import etape_instrumentee
+from Sepim.modules.gestionnaire_du_masque_de_separation import MasqueDeSeparationCompact, TableDesSommesCumulees
 
 import os
-import sys
-from numpy import float32, uint8, array_equal
-from cv2 import imread, cvtColor, COLOR_BGR2RGB, imwrite, COLOR_RGB2BGR
+import time
+import tempfile
+from numpy import float32, uint8, flatnonzero, memmap, arange, zeros, asarray
+
+# OpenCV (cv2) est importé à sa première utilisation, lors du chargement de l'image
+# Pillow (PIL), optionnel, n'est importé que pour le décodage des images à palette (cf. decodage_d_une_image_a_palette)
 
 # ==================================================================================================
 # INITIALISATIONS
 # ==================================================================================================
 
-sys.setrecursionlimit(2000)
+# Conversion (constante de cv2) appliquée après le décodage selon l'ordre des canaux retenu (None : données conservées dans l'ordre BGR d'OpenCV)
+CONVERSIONS_APRES_LE_CHARGEMENT = {"RGB": "COLOR_BGR2RGB", "BGR": None}
+
+# Ordres des canaux disponibles
+ORDRES_DES_CANAUX = tuple(CONVERSIONS_APRES_LE_CHARGEMENT)
+
+# Nombre d'entrées d'une palette (indices codés sur un octet)
+TAILLE_DES_PALETTES = 256
 
 # ==================================================================================================
 # CLASSES
@@ -46,12 +61,30 @@ class GestionnaireDImage(object):
         :ivar __nom_de_l_image_a_traiter: nom de l'image à traiter
         :type __nom_de_l_image_a_traiter: str
 
-        :ivar __dossier_contenant_les_images_a_traiter: nom du dossier contenant les images à traiter
+        :ivar __dossier_contenant_les_images_a_traiter: chemin absolu du dossier contenant les images à traiter
         :type __dossier_contenant_les_images_a_traiter: str
 
-        :ivar __couleur_de_separation: couleur de séparation entre les sous-images d'une image
+        :ivar __couleur_de_separation: couleur de séparation entre les sous-images d'une image, dans l'ordre des canaux retenu
         :type __couleur_de_separation: numpy.ndarray
 
+        :ivar __ordre_des_canaux: ordre des canaux des données de l'image chargée et des sous-images (cf. ORDRES_DES_CANAUX)
+        :type __ordre_des_canaux: str
+
+        :ivar __decodage_des_palettes: si True, une image à palette est chargée sous la forme de son plan d'indices (un octet par pixel)
+        :type __decodage_des_palettes: bool
+
+        :ivar __palette: couleur de chaque indice de la palette de l'image chargée, dans l'ordre des canaux retenu (None : image chargée en couleurs)
+        :type __palette: None | numpy.ndarray
+
+        :ivar __separation_de_l_image_chargee: séparation dans les données de l'image chargée : la couleur de séparation, ou son indice dans la palette
+        :type __separation_de_l_image_chargee: numpy.ndarray | int
+
+        :ivar __destination_de_sauvegarde: nom de la destination des sous-images (l'une des clés de DESTINATIONS_DE_SAUVEGARDE)
+        :type __destination_de_sauvegarde: str
+
+        :ivar __niveaux_d_encodage: niveau d'encodage de chaque extension (compression PNG, qualité JPEG ou WebP)
+        :type __niveaux_d_encodage: None | dict[str, int]
+
         :ivar __dossier_de_sauvegarde_des_sous_images: dossier de sauvegarde des sous-images générées
         :type __dossier_de_sauvegarde_des_sous_images: str
 
@@ -66,10 +99,49 @@ class GestionnaireDImage(object):
 
         :ivar __largeur_image_chargee: largeur de l'image chargée
         :type __largeur_image_chargee: long
+
+        :ivar __masque_de_separation: masque compact des pixels de l'image chargée situés sur la séparation ou déjà extraits (moteur historique)
+        :type __masque_de_separation: None | MasqueDeSeparationCompact
+
+        :ivar __table_des_sommes_cumulees: table des sommes cumulées des pixels hors séparation restant à extraire (moteur historique)
+        :type __table_des_sommes_cumulees: None | TableDesSommesCumulees
+
+        :ivar __ligne_de_reprise: première ligne de l'image chargée qui contient encore des pixels hors séparation
+        :type __ligne_de_reprise: long
+
+        :ivar __moteur_d_extraction: nom du moteur d'extraction des sous-images ("historique" ou l'une des clés de MOTEURS_D_EXTRACTION)
+        :type __moteur_d_extraction: str
+
+        :ivar __mode_d_estimation_de_l_angle: mode d'estimation de l'angle de rotation des sous-images
+        :type __mode_d_estimation_de_l_angle: str
+
+        :ivar __preset_de_rotation: préréglage de rotation des sous-images
+        :type __preset_de_rotation: str
+
+        :ivar __hauteur_des_bandes: hauteur des bandes du mode grande image (None : image chargée entièrement en mémoire)
+        :type __hauteur_des_bandes: None | int
+
+        :ivar __format_de_sauvegarde: extension des fichiers des sous-images (None : extension de l'image à traiter)
+        :type __format_de_sauvegarde: None | str
+
+        :ivar __instrumentation: si True, chaque étape du traitement est mesurée (cf. etape_instrumentee)
+        :type __instrumentation: bool
+
+        :ivar __mesures_des_etapes: mesure de chaque étape exécutée (vide si l'instrumentation est désactivée)
+        :type __mesures_des_etapes: list[dict]
+
+        :ivar __limites_des_sous_images_extraites: limites (haute, gauche, basse, droite) de chaque sous-image, à la fin de l'extraction
+        :type __limites_des_sous_images_extraites: list[list[int]]
+
+        :ivar __fichiers_sauvegardes: nom absolu, taille (en octets) et date de modification (en nanosecondes) de chaque fichier de sous-image sauvegardé
+        :type __fichiers_sauvegardes: list[list]
     """
 
-    # ==========================================================================================================
-    def __init__(self, nom_de_l_image_a_traiter, dossier_contenant_les_images_a_traiter, couleur_de_separation):
+    # =============================================================================================================================================
+    def __init__(self, nom_de_l_image_a_traiter, dossier_contenant_les_images_a_traiter, couleur_de_separation, moteur_d_extraction = "historique",
+                 mode_d_estimation_de_l_angle = "rectangle_minimal", preset_de_rotation = "bilineaire", hauteur_des_bandes = None,
+                 dossier_de_sauvegarde_des_sous_images = None, format_de_sauvegarde = None, instrumentation = False, ordre_des_canaux = "RGB",
+                 destination_de_sauvegarde = "fichiers", niveaux_d_encodage = None, decodage_des_palettes = False):
         """
             Constructeur de la classe
 
@@ -79,22 +151,80 @@ class GestionnaireDImage(object):
             :param dossier_contenant_les_images_a_traiter: nom du dossier contenant les images à traiter
             :type dossier_contenant_les_images_a_traiter: str
 
-            :param couleur_de_separation: couleur de séparation entre les sous-images d'une image
+            :param couleur_de_separation: couleur (RGB) de séparation entre les sous-images d'une image
             :type couleur_de_separation: numpy.ndarray
+
+            :param moteur_d_extraction: nom du moteur d'extraction des sous-images ("historique" ou l'une des clés de MOTEURS_D_EXTRACTION)
+            :type moteur_d_extraction: str
+
+            :param mode_d_estimation_de_l_angle: mode d'estimation de l'angle de rotation des sous-images ("rectangle_minimal", "bords" ou "hough")
+            :type mode_d_estimation_de_l_angle: str
+
+            :param preset_de_rotation: préréglage de rotation des sous-images ("plus_proche_voisin", "bilineaire", "bicubique" ou "qualite")
+            :type preset_de_rotation: str
+
+            :param hauteur_des_bandes: si ce paramètre est renseigné (mode grande image), l'image est convertie dans une mémoire projetée
+            et ses sous-images sont extraites par bandes horizontales de cette hauteur (en pixels), quel que soit le moteur d'extraction
+            :type hauteur_des_bandes: None | int
+
+            :param dossier_de_sauvegarde_des_sous_images: dossier de sauvegarde des sous-images (None : sous-dossier "Sauvegarde" du dossier des images)
+            :type dossier_de_sauvegarde_des_sous_images: None | str
+
+            :param format_de_sauvegarde: extension des fichiers des sous-images, par exemple "png" ou "jpg" (None : extension de l'image à traiter)
+            :type format_de_sauvegarde: None | str
+
+            :param instrumentation: si True, chaque étape du traitement est mesurée (durée, sous-images, pixels, rotations, pic de mémoire tracée)
+            :type instrumentation: bool
+
+            :param ordre_des_canaux: ordre des canaux des données de l'image ("RGB" ou "BGR" : ordre natif d'OpenCV, sans conversion au chargement
+            ni à la sauvegarde ; la couleur de séparation est alors convertie une fois pour toutes)
+            :type ordre_des_canaux: str
+
+            :param destination_de_sauvegarde: destination des sous-images : "fichiers" (un fichier par sous-image), "tar" ou "zip"
+            (une archive par image) ou "npz" (un tableau non encodé par sous-image, dans un fichier par image)
+            :type destination_de_sauvegarde: str
+
+            :param niveaux_d_encodage: niveau d'encodage de chaque extension, par exemple {"png": 1, "jpg": 90, "webp": 80}
+            (None : réglages par défaut d'OpenCV)
+            :type niveaux_d_encodage: None | dict[str, int]
+
+            :param decodage_des_palettes: si True, une image à palette (PNG indexé) est chargée sous la forme de son plan d'indices :
+            l'extraction compare un octet par pixel à l'indice de la couleur de séparation, et seules les sous-images sont converties en couleurs
+            (nécessite Pillow ; à défaut, ou pour une image sans palette, l'image est chargée en couleurs)
+            :type decodage_des_palettes: bool
         """
 
         # Attributs d'instance initialisés via les paramètres du constructeur
         self.__nom_de_l_image_a_traiter = nom_de_l_image_a_traiter
-        self.__dossier_contenant_les_images_a_traiter = dossier_contenant_les_images_a_traiter
-        self.__couleur_de_separation = couleur_de_separation
+        self.__dossier_contenant_les_images_a_traiter = os.path.abspath(dossier_contenant_les_images_a_traiter)
+        self.__couleur_de_separation = couleur_de_separation[::-1].copy() if ordre_des_canaux == "BGR" else couleur_de_separation
+        self.__moteur_d_extraction = moteur_d_extraction
+        self.__mode_d_estimation_de_l_angle = mode_d_estimation_de_l_angle
+        self.__preset_de_rotation = preset_de_rotation
+        self.__hauteur_des_bandes = hauteur_des_bandes
+        self.__format_de_sauvegarde = format_de_sauvegarde
+        self.__instrumentation = instrumentation
+        self.__ordre_des_canaux = ordre_des_canaux
+        self.__destination_de_sauvegarde = destination_de_sauvegarde
+        self.__niveaux_d_encodage = niveaux_d_encodage
+        self.__decodage_des_palettes = decodage_des_palettes
 
         # Autres attributs d'instance
-        self.__dossier_de_sauvegarde_des_sous_images = os.path.join(os.path.abspath(dossier_contenant_les_images_a_traiter), "Sauvegarde")
+        self.__dossier_de_sauvegarde_des_sous_images = os.path.abspath(dossier_de_sauvegarde_des_sous_images or
+                                                                       os.path.join(dossier_contenant_les_images_a_traiter, "Sauvegarde"))
         self.__liste_des_sous_images = []
         self.__image_chargee = None
+        self.__palette = None
+        self.__separation_de_l_image_chargee = self.__couleur_de_separation
         self.__hauteur_image_chargee = 0
         self.__largeur_image_chargee = 0
         self.__sous_image_actuelle = None
+        self.__masque_de_separation = None
+        self.__table_des_sommes_cumulees = None
+        self.__ligne_de_reprise = 0
+        self.__mesures_des_etapes = []
+        self.__limites_des_sous_images_extraites = []
+        self.__fichiers_sauvegardes = []
 
     # =================================================================================================
     def ajouter_une_sous_image(self, limite_haute, limite_gauche, limite_basse = 0, limite_droite = 0):
@@ -135,42 +265,69 @@ class GestionnaireDImage(object):
             # message
 
     # ========================================
+    @etape_instrumentee("chargement")
     def chargement_de_l_image_a_traiter(self):
         """
             Méthode qui permet de charger l'image à traiter et de la convertir si nécessaire
+            En mode grande image, l'image décodée est convertie bande par bande dans une mémoire projetée, puis libérée
+            Si le décodage des palettes est activé, une image à palette est chargée sous la forme de son plan d'indices (sans mémoire projetée)
+            L'image est lue via son chemin absolu, sans changer le dossier courant du processus : plusieurs images peuvent être chargées
+            simultanément par des fils d'exécution différents
+
+            :raise IOError: si l'image ne peut pas être lue
+            :raise ValueError: si l'ordre des canaux est inconnu
         """
 
-        # Récupération du dossier courant
-        dossier_avant_deplacement = os.getcwd()
+        import cv2
 
-        # Déplacement dans le dossier qui contient les images à traiter
-        try:
+        if self.__ordre_des_canaux not in CONVERSIONS_APRES_LE_CHARGEMENT:
 
-            os.chdir(self.__dossier_contenant_les_images_a_traiter)
+            raise ValueError("Ordre des canaux inconnu : {}".format(self.__ordre_des_canaux))
 
-        except Exception:
+        nom_absolu_de_l_image = os.path.join(self.__dossier_contenant_les_images_a_traiter, self.__nom_de_l_image_a_traiter)
+        image_a_palette = decodage_d_une_image_a_palette(nom_absolu_de_l_image) if self.__decodage_des_palettes else None
 
-            pass
-            # gérer l'exception si le dossier n'existe pas
+        # Image à palette : plan d'indices, la séparation est l'indice de la couleur de séparation (résolu une seule fois)
+        if image_a_palette is not None:
 
-        # Chargement de l'image
-        try:
+            indices, palette = image_a_palette
+            self.__palette = palette[:, ::-1].copy() if self.__ordre_des_canaux == "BGR" else palette
+            self.__image_chargee, self.__separation_de_l_image_chargee = resolution_de_l_indice_de_separation(indices, self.__palette,
+                                                                                                             self.__couleur_de_separation)
 
-            image = imread(self.__nom_de_l_image_a_traiter)
-            self.__image_chargee = cvtColor(image, COLOR_BGR2RGB)
+        else:
 
-        except Exception:
+            # Chargement de l'image
+            image = cv2.imread(nom_absolu_de_l_image)
 
-            self.__image_chargee = None
-            # message
+            if image is None:
+
+                raise IOError("Lecture impossible : {}".format(nom_absolu_de_l_image))
+
+            conversion = CONVERSIONS_APRES_LE_CHARGEMENT[self.__ordre_des_canaux]
+
+            if self.__hauteur_des_bandes is not None:
 
-        # Retour dans le dossier courant
-        os.chdir(dossier_avant_deplacement)
+                self.__image_chargee = conversion_dans_une_memoire_projetee(image, self.__hauteur_des_bandes, conversion)
 
-        # Conversion, si nécessaire, des données de l'image : on transforme les float (allant de 0 à 1) en entiers (allant de 0 à 255)
-        if self.__image_chargee.dtype == float32:
+            # ordre natif : l'image décodée est conservée telle quelle, sans copie
+            elif conversion is None:
 
-            self.__image_chargee = (self.__image_chargee * 255).astype(uint8)
+                self.__image_chargee = image
+
+            else:
+
+                self.__image_chargee = cv2.cvtColor(image, getattr(cv2, conversion))
+
+            del image
+
+            # Conversion, si nécessaire, des données de l'image : on transforme les float (allant de 0 à 1) en entiers (allant de 0 à 255)
+            if self.__image_chargee.dtype == float32:
+
+                self.__image_chargee = (self.__image_chargee * 255).astype(uint8)
+
+        # Calcul des dimensions de l'image chargée
+        self.calcul_dimensions_image_chargee()
 
     # ========================================
     def calcul_dimensions_image_chargee(self):
@@ -194,70 +351,280 @@ class GestionnaireDImage(object):
 
             self.__largeur_image_chargee = None
 
+    # =====================================
+    def get_nom_de_l_image_a_traiter(self):
+        """
+            Accesseur de l'attribut __nom_de_l_image_a_traiter
+
+            :return: __nom_de_l_image_a_traiter
+            :rtype: str
+        """
+
+        return self.__nom_de_l_image_a_traiter
+
+    # ==================================
+    def get_liste_des_sous_images(self):
+        """
+            Accesseur de l'attribut __liste_des_sous_images
+
+            :return: __liste_des_sous_images
+            :rtype: list[ObjetImage]
+        """
+
+        return self.__liste_des_sous_images
+
+    # ==================================
+    def get_hauteur_image_chargee(self):
+        """
+            Accesseur de l'attribut __hauteur_image_chargee
+
+            :return: __hauteur_image_chargee
+            :rtype: long
+        """
+
+        return self.__hauteur_image_chargee
+
+    # ==================================
+    def get_largeur_image_chargee(self):
+        """
+            Accesseur de l'attribut __largeur_image_chargee
+
+            :return: __largeur_image_chargee
+            :rtype: long
+        """
+
+        return self.__largeur_image_chargee
+
+    # ============================
+    def get_instrumentation(self):
+        """
+            Accesseur de l'attribut __instrumentation
+
+            :return: __instrumentation
+            :rtype: bool
+        """
+
+        return self.__instrumentation
+
+    # ===============================
+    def get_mesures_des_etapes(self):
+        """
+            Accesseur de l'attribut __mesures_des_etapes
+
+            :return: __mesures_des_etapes
+            :rtype: list[dict]
+        """
+
+        return self.__mesures_des_etapes
+
+    # ==============================================
+    def get_limites_des_sous_images_extraites(self):
+        """
+            Accesseur de l'attribut __limites_des_sous_images_extraites
+
+            :return: __limites_des_sous_images_extraites
+            :rtype: list[list[int]]
+        """
+
+        return self.__limites_des_sous_images_extraites
+
+    # =================================
+    def get_fichiers_sauvegardes(self):
+        """
+            Accesseur de l'attribut __fichiers_sauvegardes
+
+            :return: __fichiers_sauvegardes
+            :rtype: list[list]
+        """
+
+        return self.__fichiers_sauvegardes
+
+    # ============================================
+    def get_nom_absolu_de_l_image_a_traiter(self):
+        """
+            Méthode qui permet de récupérer le nom absolu du fichier de l'image à traiter
+
+            :return: le nom absolu du fichier de l'image à traiter
+            :rtype: str
+        """
+
+        return os.path.join(self.__dossier_contenant_les_images_a_traiter, self.__nom_de_l_image_a_traiter)
+
+    # =====================================
+    def get_parametres_du_traitement(self):
+        """
+            Méthode qui permet de récupérer les paramètres qui déterminent le résultat du traitement de l'image (cf. CacheDesResultats)
+
+            :return: les paramètres du traitement
+            :rtype: dict
+        """
+
+        return {"couleur_de_separation": [int(composante) for composante in self.__couleur_de_separation],
+                "moteur_d_extraction": self.__moteur_d_extraction,
+                "hauteur_des_bandes": self.__hauteur_des_bandes,
+                "mode_d_estimation_de_l_angle": self.__mode_d_estimation_de_l_angle,
+                "preset_de_rotation": self.__preset_de_rotation,
+                "format_de_sauvegarde": self.__format_de_sauvegarde,
+                "ordre_des_canaux": self.__ordre_des_canaux,
+                "destination_de_sauvegarde": self.__destination_de_sauvegarde,
+                "niveaux_d_encodage": self.__niveaux_d_encodage,
+                "decodage_des_palettes": self.__decodage_des_palettes,
+                "dossier_de_sauvegarde_des_sous_images": self.__dossier_de_sauvegarde_des_sous_images}
+
+    # ===========================================
+    def ajout_d_une_mesure_d_etape(self, mesure):
+        """
+            Méthode qui permet d'ajouter la mesure d'une étape aux mesures des étapes (cf. etape_instrumentee)
+
+            :param mesure: mesure de l'étape
+            :type mesure: dict
+        """
+
+        self.__mesures_des_etapes.append(mesure)
+
     # ===================================
+    @etape_instrumentee("extraction")
     def extraction_des_sous_images(self):
         """
-            Méthode qui permet d'extraire, d'une image chargée, ses sous-images
+            Méthode qui permet d'extraire, d'une image chargée, ses sous-images, à l'aide du moteur d'extraction sélectionné
+            Pour une image chargée sous la forme d'un plan d'indices, les sous-images extraites sont ensuite converties en couleurs
         """
 
-        # initialisation de la condition d'arrêt de l'extraction
-        extraction_terminee = False
+        # mode grande image : extraction par bandes horizontales
+        if self.__hauteur_des_bandes is not None:
 
-        # boucle d'extraction
-        while not extraction_terminee:
+            moteur = ExtractionParBandes(self.__image_chargee, self.__separation_de_l_image_chargee, self.__hauteur_des_bandes)
+            self.__liste_des_sous_images.extend(moteur.extraction_des_sous_images())
 
-            # initialisation de la condition de sortie sur la hauteur
-            condition_de_sortie_sur_la_hauteur = False
+        # moteur historique : parcours pixel par pixel
+        elif self.__moteur_d_extraction == "historique":
 
-            # itération sur la hauteur de l'image
-            for hauteur_actuelle in range(self.__hauteur_image_chargee):
+            self.extraction_des_sous_images_historique()
 
-                # vérification de la condition de sortie sur la hauteur
-                if condition_de_sortie_sur_la_hauteur:
+        # moteurs vectorisés : extraction en une seule passe
+        elif self.__moteur_d_extraction in MOTEURS_D_EXTRACTION:
 
-                    break
+            moteur = MOTEURS_D_EXTRACTION[self.__moteur_d_extraction](self.__image_chargee, self.__separation_de_l_image_chargee)
+            self.__liste_des_sous_images.extend(moteur.extraction_des_sous_images())
 
-                # itération sur la largeur de l'image
-                for largeur_actuelle in range(self.__largeur_image_chargee):
+        else:
 
-                    # le pixel courant ne se situe pas sur le séparateur
-                    if not array_equal(self.__image_chargee[hauteur_actuelle, largeur_actuelle], self.__couleur_de_separation):
+            raise ValueError("Moteur d'extraction inconnu : {}".format(self.__moteur_d_extraction))
 
-                        # ajout d'une nouvelle sous-image
-                        self.ajouter_une_sous_image(hauteur_actuelle, largeur_actuelle)
+        # image à palette : seules les sous-images sont converties en couleurs
+        if self.__palette is not None:
 
-                        # récupération de la dernière sous-image ajoutée
-                        self.__sous_image_actuelle = self.__liste_des_sous_images[-1]
+            for sous_image in self.__liste_des_sous_images:
 
-                        # calcul des limites basse et droite de la sous-image actuelle
-                        largeur_finale, hauteur_finale, _ = self.calcul_limites_basse_et_droite(hauteur_actuelle, largeur_actuelle, True)
+                sous_image.expansion_de_la_palette(self.__palette)
 
-                        # affectation des valeurs des limites basses et droites à la sous-image actuelle
-                        self.affectation_des_limites_basse_et_droite(hauteur_finale, largeur_finale)
+        # conservation des limites extraites (la rotation modifie les limites des sous-images)
+        self.__limites_des_sous_images_extraites = [[int(sous_image.get_limite_haute()), int(sous_image.get_limite_gauche()),
+                                                     int(sous_image.get_limite_basse()), int(sous_image.get_limite_droite())]
+                                                    for sous_image in self.__liste_des_sous_images]
 
-                        # défini les données de la sous-image actuelle
-                        self.__sous_image_actuelle.set_donnees_image(self.__image_chargee)
+    # ==============================================
+    def extraction_des_sous_images_historique(self):
+        """
+            Méthode qui permet d'extraire, d'une image chargée, ses sous-images en suivant leurs bordures
 
-                        # récupération des limites de la sous-image actuelle
-                        lim_h = self.__sous_image_actuelle.get_limite_haute()
-                        lim_g = self.__sous_image_actuelle.get_limite_gauche()
+            Le masque de séparation et la table des sommes cumulées des pixels restants (i.e. hors séparation) sont tenus à jour
+            à chaque sous-image extraite : la recherche de la sous-image suivante reprend à la première ligne qui contient encore des pixels
+            (lecture de l'index des plages de la ligne), et l'extraction se termine lorsqu'il ne reste plus aucun pixel (lecture de la table).
+        """
 
-                        lim_b = self.__sous_image_actuelle.get_limite_basse()
-                        lim_d = self.__sous_image_actuelle.get_limite_droite()
+        # initialisation du suivi des pixels restants
+        self.initialisation_du_suivi_des_pixels_restants()
 
-                        # modification de l'image chargée :
-                        # remplacement des données de la sous-image par la couleur de séparation
-                        self.__image_chargee[lim_h:lim_b + 1, lim_g:lim_d + 1] = self.__couleur_de_separation
+        # boucle d'extraction : tant qu'il reste des pixels hors séparation
+        while self.__table_des_sommes_cumulees.get_nombre_total_de_pixels_hors_separation() > 0:
 
-                        # ré-initilisation de la condition de sortie sur la hauteur
-                        condition_de_sortie_sur_la_hauteur = True
-                        break
+            # recherche de la ligne de reprise : première ligne qui contient encore des pixels hors séparation
+            while self.__masque_de_separation.premier_pixel_hors_separation(self.__ligne_de_reprise) < 0:
+
+                self.__ligne_de_reprise += 1
+
+            hauteur_actuelle = self.__ligne_de_reprise
+
+            # premier pixel de la ligne de reprise qui ne se situe pas sur le séparateur
+            largeur_actuelle = self.__masque_de_separation.premier_pixel_hors_separation(hauteur_actuelle)
+
+            # ajout d'une nouvelle sous-image
+            self.ajouter_une_sous_image(hauteur_actuelle, largeur_actuelle)
+
+            # récupération de la dernière sous-image ajoutée
+            self.__sous_image_actuelle = self.__liste_des_sous_images[-1]
+
+            # calcul des limites basse et droite de la sous-image actuelle
+            largeur_finale, hauteur_finale, _ = self.calcul_limites_basse_et_droite(hauteur_actuelle, largeur_actuelle, True)
+
+            # affectation des valeurs des limites basses et droites à la sous-image actuelle
+            self.affectation_des_limites_basse_et_droite(hauteur_finale, largeur_finale)
+
+            # défini les données de la sous-image actuelle
+            self.__sous_image_actuelle.set_donnees_image(self.__image_chargee)
+
+            # statistiques du contenu de la sous-image actuelle, utilisées par la détection de la rotation
+            self.calcul_statistiques_du_contenu_de_la_sous_image_actuelle()
+
+            # effacement de la sous-image du masque de séparation (l'image chargée n'est pas modifiée)
+            self.effacement_de_la_sous_image_actuelle()
+
+    # ====================================================
+    def initialisation_du_suivi_des_pixels_restants(self):
+        """
+            Méthode qui permet d'initialiser le suivi des pixels restants (i.e. hors séparation) de l'image chargée :
+            masque de séparation, table des sommes cumulées des pixels restants et ligne de reprise de la recherche
+            Le masque de séparation est compacté (un bit par pixel et un index des plages hors séparation de chaque ligne) :
+            le masque complet de l'image n'est conservé que le temps de cette initialisation
+        """
+
+        masque_du_contenu = calcul_masque_du_contenu(self.__image_chargee, self.__separation_de_l_image_chargee)
+
+        self.__masque_de_separation = MasqueDeSeparationCompact(masque_du_contenu)
+        self.__table_des_sommes_cumulees = TableDesSommesCumulees(masque_du_contenu)
+        del masque_du_contenu
+
+        self.__ligne_de_reprise = 0
+
+    # =================================================================
+    def calcul_statistiques_du_contenu_de_la_sous_image_actuelle(self):
+        """
+            Méthode qui permet de calculer, via la table des sommes cumulées, le taux de remplissage de la sous-image actuelle
+            et le taux minimal de pixels hors séparation de ses quatre bords (cf. RotationDesImages.detection_rotation)
+            Les pixels des sous-images déjà extraites (effacés) ne sont pas comptés
+        """
+
+        lim_h = self.__sous_image_actuelle.get_limite_haute()
+        lim_g = self.__sous_image_actuelle.get_limite_gauche()
+
+        lim_b = min(self.__sous_image_actuelle.get_limite_basse(), self.__hauteur_image_chargee - 1)
+        lim_d = min(self.__sous_image_actuelle.get_limite_droite(), self.__largeur_image_chargee - 1)
+
+        table = self.__table_des_sommes_cumulees
+        taux_des_bords = min(table.taux_de_remplissage(lim_h, lim_g, lim_h, lim_d), table.taux_de_remplissage(lim_b, lim_g, lim_b, lim_d),
+                             table.taux_de_remplissage(lim_h, lim_g, lim_b, lim_g), table.taux_de_remplissage(lim_h, lim_d, lim_b, lim_d))
+
+        self.__sous_image_actuelle.set_statistiques_du_contenu(table.taux_de_remplissage(lim_h, lim_g, lim_b, lim_d), taux_des_bords)
+
+    # =============================================
+    def effacement_de_la_sous_image_actuelle(self):
+        """
+            Méthode qui permet d'effacer la sous-image actuelle du masque de séparation : ses pixels sont considérés comme situés sur la séparation
+            L'image chargée n'est pas modifiée, les données des sous-images étant des vues sur celle-ci
+            Le suivi des pixels restants est mis-à-jour à partir de la seule zone effacée
+        """
 
-            # vérification de la fin d'extraction :
-            # si tous les éléments de l'image chargée correspondent à la couleur de séparation alors l'extraction est terminée
-            if (self.__image_chargee == self.__couleur_de_separation).all():
+        # récupération des limites de la sous-image actuelle
+        lim_h = self.__sous_image_actuelle.get_limite_haute()
+        lim_g = self.__sous_image_actuelle.get_limite_gauche()
 
-                extraction_terminee = True
+        lim_b = self.__sous_image_actuelle.get_limite_basse()
+        lim_d = self.__sous_image_actuelle.get_limite_droite()
+
+        # effacement de la zone du masque compact, puis mise-à-jour incrémentale de la table des sommes cumulées des pixels restants
+        self.__masque_de_separation.effacement(lim_h, lim_g, lim_b, lim_d)
+        self.__table_des_sommes_cumulees.effacement(lim_h, lim_g, lim_b, lim_d)
 
     # ==================================================================
     def affectation_des_limites_basse_et_droite(self, hauteur, largeur):
@@ -279,6 +646,20 @@ class GestionnaireDImage(object):
 
             self.__sous_image_actuelle.set_limite_droite(largeur)
 
+    # =======================================================
+    def calcul_masque_de_separation_de_la_ligne(self, ligne):
+        """
+            Méthode qui permet de récupérer le masque des pixels d'une ligne situés sur la séparation (ou appartenant à une sous-image déjà extraite)
+
+            :param ligne: position verticale de la ligne (en pixel)
+            :type ligne: long
+
+            :return: le masque de la ligne (True si le pixel est sur la séparation)
+            :rtype: numpy.ndarray
+        """
+
+        return self.__masque_de_separation.calcul_masque_de_la_ligne(ligne)
+
     # =========================================================================================
     def analyse_existence_pixel_sur_separation(self, position_verticale, position_horizontale):
         """
@@ -296,23 +677,20 @@ class GestionnaireDImage(object):
             :rtype: bool
         """
 
-        # itération depuis la position horizontale passée en argument et le nord gauche de l'image chargée
-        for pos_hor in reversed(range(position_horizontale)):
+        # aucun pixel à gauche de la position horizontale passée en argument
+        if position_horizontale <= 0:
 
-            # on ne se situe pas sur la séparation
-            if not array_equal(self.__image_chargee[position_verticale, pos_hor], self.__couleur_de_separation):
+            return False
 
-                # la position horizontale actuelle est supérieure à la limite gauche de la sous-image actuelle : on renvoie True
-                if pos_hor >= self.__sous_image_actuelle.get_limite_gauche():
+        # recherche du pixel, hors séparation, le plus proche à gauche de la position horizontale passée en argument (recherche dans les plages de la ligne)
+        position_hors_separation = self.__masque_de_separation.dernier_pixel_hors_separation_avant(position_verticale, position_horizontale)
 
-                    return True
-
-                # sinon on renvoie False
-                else:
+        if position_hors_separation < 0:
 
-                    return False
+            return False
 
-        return False
+        # on renvoie True si sa position est supérieure à la limite gauche de la sous-image actuelle
+        return position_hors_separation >= self.__sous_image_actuelle.get_limite_gauche()
 
     # ==========================================================================================================
     def calcul_position_horizontale_demarrage(self, position_verticale_actuelle, position_horizontale_actuelle):
@@ -327,30 +705,30 @@ class GestionnaireDImage(object):
 
             :return: la position horizontale de démarrage
             :rtype: long
-        """
-
-        # initialisation de la condition de sortie
-        # ----------------------------------------
 
-        sortie = False
+            :raise IndexError: si la position est négative et qu'aucun pixel de la ligne n'est sur la séparation
+        """
 
-        # itération tant que la condition de sortie n'est pas vraie
-        # ---------------------------------------------------------
+        # recherche, vers la gauche, du premier pixel situé sur la séparation
+        # ---------------------------------------------------------------------
 
-        while not sortie:
+        # le pixel de la première colonne n'est jamais testé : s'il est atteint, la position devient -1
+        if position_horizontale_actuelle >= 0:
 
-            if position_horizontale_actuelle == 0:
+            position_horizontale_actuelle = self.__masque_de_separation.dernier_pixel_sur_la_separation(position_verticale_actuelle, 1,
+                                                                                                        position_horizontale_actuelle)
 
-                position_horizontale_actuelle -= 1
-                sortie = True
+        # position négative : le parcours se fait depuis la fin de la ligne (indexation négative)
+        else:
 
-            elif array_equal(self.__image_chargee[position_verticale_actuelle, position_horizontale_actuelle], self.__couleur_de_separation):
+            position_sur_separation = self.__masque_de_separation.dernier_pixel_sur_la_separation(
+                position_verticale_actuelle, 0, self.__largeur_image_chargee + position_horizontale_actuelle)
 
-                sortie = True
+            if position_sur_separation < 0:
 
-            else:
+                raise IndexError("Aucun pixel de la ligne {} n'est sur la séparation".format(position_verticale_actuelle))
 
-                position_horizontale_actuelle -= 1
+            position_horizontale_actuelle = position_sur_separation - self.__largeur_image_chargee
 
         # mise-à-jour, si nécessaire, de la limite gauche de la sous-image actuelle
         # -------------------------------------------------------------------------
@@ -369,7 +747,8 @@ class GestionnaireDImage(object):
     def calcul_limites_basse_et_droite(self, position_verticale_actuelle, position_horizontale_actuelle, initialisation_position_horizontale_de_demarrage):
         """
             Méthode qui permet de calculer les valeurs des limites basses et droites de la sous-image actuelle.
-            Ce calcul sera itératif.
+            Ce calcul est itératif : la sous-image est parcourue ligne par ligne, sans appel récursif,
+            et le traitement de chaque ligne s'appuie sur le masque de séparation compact (test d'un bit par pixel, recherche dans les plages de la ligne).
 
             :param position_verticale_actuelle: position verticale actuelle (en pixel)
             :type position_verticale_actuelle: long
@@ -378,8 +757,8 @@ class GestionnaireDImage(object):
             :type position_horizontale_actuelle: long
 
             :param initialisation_position_horizontale_de_demarrage: si ce paramètre est à :
-            - True : il faut utiliser la méthode "calcul_position_horizontale_demarrage" afin de déterminer la position horizontale à partir de laquelle le calcul démarre
-            - False: la position horizontale à partir de laquelle le calcul débute est celle passée en argument de cette méthode
+            - True : la position horizontale à partir de laquelle le calcul débute, sur la première ligne, est celle passée en argument de cette méthode
+            - False: il faut utiliser la méthode "calcul_position_horizontale_demarrage" afin de déterminer la position horizontale à partir de laquelle le calcul démarre
             :type initialisation_position_horizontale_de_demarrage: bool
 
             :return: les valeurs des limites droite et basse ainsi que de l'indicateur de fin de calcul
@@ -389,211 +768,372 @@ class GestionnaireDImage(object):
         # initialisations
         # ---------------
 
-        largeur_maximale = False
-        fin_du_calcul = False       # indicateur de fin de calcul : cette variable permet de savoir si le calcul des limites est terminé ou non
-
         pos_hor_actuelle = position_horizontale_actuelle
         pos_vert_actuelle = position_verticale_actuelle
 
+        derniere_ligne = self.__hauteur_image_chargee - 1
+        derniere_colonne = self.__largeur_image_chargee - 1
 
-        # calcul de la position horizontale de démarrage
-        # ----------------------------------------------
-
-        # si le paramètre d'initialisation de la position horizontale de démarrage est à True on le passe à False
-        if initialisation_position_horizontale_de_demarrage:
+        sur_la_separation = self.__masque_de_separation.est_sur_la_separation
 
-            initialisation_position_horizontale_de_demarrage = False
-
-        # sinon on calcule la position horizontale de démarrage du calcul
-        else:
 
-            pos_hor_actuelle = self.calcul_position_horizontale_demarrage(pos_vert_actuelle, pos_hor_actuelle)
-
-
-        # itération sur la largeur
+        # itération sur les lignes
         # ------------------------
 
-        while not largeur_maximale:
-
-            # on se trouve sur le bord droit de l'image chargée
-            if pos_hor_actuelle == (self.__largeur_image_chargee - 1):
-
-                # on ne se trouve pas sur le bord bas de l'image chargée
-                if pos_vert_actuelle != (self.__hauteur_image_chargee - 1):
-
-                    # Les pixels :
-                    # - situé à la même position horizontale mais sur la la ligne suivante
-                    # - situé un pixel plus à gauche sur la ligne suivante
-                    # sont situés sur la séparation
-                    if (array_equal(self.__image_chargee[pos_vert_actuelle + 1, pos_hor_actuelle], self.__couleur_de_separation)) and \
-                       (array_equal(self.__image_chargee[pos_vert_actuelle + 1, pos_hor_actuelle - 1], self.__couleur_de_separation)):
+        while True:
 
-                        largeur_finale = pos_hor_actuelle
-                        hauteur_finale = pos_vert_actuelle
+            # calcul de la position horizontale de démarrage (sauf pour la première ligne si elle est fournie)
+            if initialisation_position_horizontale_de_demarrage:
 
-                        largeur_maximale = True
-                        fin_du_calcul = True
+                initialisation_position_horizontale_de_demarrage = False
 
-                    # s'ils ne sont pas sur la séparation
-                    else:
+            else:
 
-                        # on commence par mettre-à-jour les valeurs des limites basse et droite de la sous-image actuelle
-                        self.affectation_des_limites_basse_et_droite(pos_vert_actuelle, pos_hor_actuelle - 1)
+                pos_hor_actuelle = self.calcul_position_horizontale_demarrage(pos_vert_actuelle, pos_hor_actuelle)
 
-                        # on fait appel une nouvelle fois à la méthode de calcul des limites basse et droite en mettant à jour les positions horizontale et et verticale :
-                        # on se place sur la ligne suivante et un pixel plus à gauche que la position actuelle
-                        largeur_finale, hauteur_finale, fin_du_calcul = self.calcul_limites_basse_et_droite(pos_vert_actuelle + 1, pos_hor_actuelle - 1, initialisation_position_horizontale_de_demarrage)
+            # itération sur la largeur : on sort de cette boucle pour passer à la ligne suivante
+            while True:
 
-                # on se trouve sur le bord bas de l'image chargée
-                else:
+                # on se trouve sur le bord droit de l'image chargée
+                if pos_hor_actuelle == derniere_colonne:
 
-                    largeur_finale = pos_hor_actuelle
-                    hauteur_finale = pos_vert_actuelle
+                    # on se trouve sur le bord bas de l'image chargée, ou les pixels de la ligne suivante (même position et un pixel plus à gauche) sont sur la séparation
+                    if pos_vert_actuelle == derniere_ligne or (sur_la_separation(pos_vert_actuelle + 1, pos_hor_actuelle) and
+                                                               sur_la_separation(pos_vert_actuelle + 1, pos_hor_actuelle - 1)):
 
-                    largeur_maximale = True
-                    fin_du_calcul = True
+                        return pos_hor_actuelle, pos_vert_actuelle, True
 
-            # on se trouve sur le bord bas de l'image chargée
-            elif pos_vert_actuelle == (self.__hauteur_image_chargee - 1):
-
-                # on ne se trouve pas sur le bord droit de l'image chargée
-                if pos_hor_actuelle != (self.__largeur_image_chargee - 1):
-
-                    # Les pixels :
-                    # - situé à la même position horizontale mais sur la ligne précédente
-                    # - courant
-                    # sont situés sur la séparation
-                    if (array_equal(self.__image_chargee[pos_vert_actuelle - 1, pos_hor_actuelle], self.__couleur_de_separation)) and \
-                       (array_equal(self.__image_chargee[pos_vert_actuelle, pos_hor_actuelle], self.__couleur_de_separation)):
+                    # sinon on passe à la ligne suivante, un pixel plus à gauche que la position actuelle
+                    self.affectation_des_limites_basse_et_droite(pos_vert_actuelle, pos_hor_actuelle - 1)
+                    pos_hor_actuelle -= 1
+                    break
 
-                        largeur_finale = pos_hor_actuelle - 1
-                        hauteur_finale = pos_vert_actuelle
+                # on se trouve sur le bord bas de l'image chargée
+                elif pos_vert_actuelle == derniere_ligne:
 
-                        largeur_maximale = True
-                        fin_du_calcul = True
+                    # les pixels courant et de la ligne précédente sont sur la séparation
+                    if sur_la_separation(pos_vert_actuelle - 1, pos_hor_actuelle) and sur_la_separation(pos_vert_actuelle, pos_hor_actuelle):
 
-                # s'ils ne sont pas sur la séparation
-                else:
+                        return pos_hor_actuelle - 1, pos_vert_actuelle, True
 
-                    largeur_finale = pos_hor_actuelle
-                    hauteur_finale = pos_vert_actuelle
+                    pos_hor_actuelle = self.calcul_position_suivante((pos_vert_actuelle - 1, pos_vert_actuelle), pos_hor_actuelle)
 
-                    largeur_maximale = True
-                    fin_du_calcul = True
+                # le pixel courant est sur la séparation
+                elif sur_la_separation(pos_vert_actuelle, pos_hor_actuelle):
 
-            # on ne se trouve ni sur le bord droit ni sur le bord bas de l'image chargée
-            elif array_equal(self.__image_chargee[pos_vert_actuelle, pos_hor_actuelle], self.__couleur_de_separation):
+                    # on ne se situe pas sur le bord gauche de l'image chargée et les pixels de la ligne suivante (même position et un pixel plus à gauche) sont sur la séparation
+                    if pos_hor_actuelle != 0 and sur_la_separation(pos_vert_actuelle + 1, pos_hor_actuelle) and \
+                            sur_la_separation(pos_vert_actuelle + 1, pos_hor_actuelle - 1):
 
-                # si :
-                # - on ne se situe pas sur le bord bas de l'image chargée
-                # - on ne se situe pas sur le bord gauche de l'image chargée
-                # - les pixels :
-                #   + situé à la même position horizontale mais sur la la ligne suivante
-                #   + situé un pixel plus à gauche sur la ligne suivante
-                #   sont situés sur la séparation
-                if (pos_vert_actuelle != (self.__hauteur_image_chargee - 1)) and \
-                   (pos_hor_actuelle != 0) and \
-                   (array_equal(self.__image_chargee[pos_vert_actuelle + 1, pos_hor_actuelle], self.__couleur_de_separation)) and \
-                   (array_equal(self.__image_chargee[pos_vert_actuelle + 1, pos_hor_actuelle - 1], self.__couleur_de_separation)):
+                        # il n'existe pas, sur la ligne suivante, de pixel de la sous-image actuelle qui ne soit pas sur la séparation : le calcul est terminé
+                        if not self.analyse_existence_pixel_sur_separation(pos_vert_actuelle + 1, pos_hor_actuelle - 2):
 
-                    # il existe, sur la ligne suivante, un pixel qui n'est pas sur la séparation
-                    if self.analyse_existence_pixel_sur_separation(pos_vert_actuelle + 1, pos_hor_actuelle - 2):
+                            return pos_hor_actuelle - 1, pos_vert_actuelle, True
 
-                        # on commence par mettre-à-jour les valeurs des limites basse et droite de la sous-image actuelle
+                        # sinon on passe à la ligne suivante, deux pixels plus à gauche que la position actuelle
                         self.affectation_des_limites_basse_et_droite(pos_vert_actuelle, pos_hor_actuelle - 1)
+                        pos_hor_actuelle -= 2
+                        break
 
-                        # on fait appel une nouvelle fois à la méthode de calcul des limites basse et droite en mettant à jour les positions horizontale et et verticale :
-                        # on se place sur la ligne suivante et deux pixels plus à gauche que la position actuelle
-                        largeur_finale, hauteur_finale, fin_du_calcul = self.calcul_limites_basse_et_droite(pos_vert_actuelle + 1, pos_hor_actuelle - 2, initialisation_position_horizontale_de_demarrage)
-
-                    # sinon
-                    else:
-
-                        largeur_finale = pos_hor_actuelle - 1
-                        hauteur_finale = pos_vert_actuelle
-
-                        largeur_maximale = True
-                        fin_du_calcul = True
+                    # sinon on passe à la ligne suivante, un pixel plus à gauche que la position actuelle
+                    self.affectation_des_limites_basse_et_droite(pos_vert_actuelle, pos_hor_actuelle - 1)
+                    pos_hor_actuelle -= 1
+                    break
 
-                # sinon
+                # le pixel courant n'est pas sur la séparation : on avance jusqu'au prochain pixel situé sur la séparation
                 else:
 
-                    # on ne se situe pas sur le bord bas de l'image chargée
-                    if pos_vert_actuelle != (self.__hauteur_image_chargee - 1):
-
-                        # on commence par mettre-à-jour les valeurs des limites basse et droite de la sous-image actuelle
-                        self.affectation_des_limites_basse_et_droite(pos_vert_actuelle, pos_hor_actuelle - 1)
-
-                        # on fait appel une nouvelle fois à la méthode de calcul des limites basse et droite en mettant à jour les positions horizontale et et verticale :
-                        # on se place sur la ligne suivante et un pixel plus à gauche que la position actuelle
-                        largeur_finale, hauteur_finale, fin_du_calcul = self.calcul_limites_basse_et_droite(pos_vert_actuelle + 1, pos_hor_actuelle - 1, initialisation_position_horizontale_de_demarrage)
+                    pos_hor_actuelle = self.calcul_position_suivante((pos_vert_actuelle, ), pos_hor_actuelle)
 
+            # passage à la ligne suivante
+            pos_vert_actuelle += 1
 
-            # vérification de la fin du calcul
-            # --------------------------------
-
-            # le calcul des limites est terminé : on passe le paramètre "largeur_maximale" à True pour sortir de la boucle d'itération sur la largeur
-            if fin_du_calcul:
+    # ===============================================================
+    def calcul_position_suivante(self, lignes, position_horizontale):
+        """
+            Méthode qui permet de calculer la prochaine position horizontale à examiner sur une ligne :
+            la première position, strictement après la position passée en argument, dont le pixel est sur la séparation dans chacune des lignes indiquées,
+            ou le bord droit de l'image chargée si aucune position ne convient
 
-                largeur_maximale = True
+            :param lignes: positions verticales des lignes dont les pixels doivent être sur la séparation
+            :type lignes: tuple[long]
 
-            # sinon on continue d'itérer sur la largeur
-            else:
+            :param position_horizontale: position horizontale actuelle (en pixel)
+            :type position_horizontale: long
 
-                pos_hor_actuelle += 1
+            :return: la prochaine position horizontale à examiner
+            :rtype: long
+        """
 
+        # position négative (indexation depuis la fin de la ligne) : on avance d'un seul pixel
+        if position_horizontale < 0:
 
-        # retour de la méthode
-        # --------------------
+            return position_horizontale + 1
 
-        return largeur_finale, hauteur_finale, fin_du_calcul
+        return min(self.__masque_de_separation.prochain_pixel_sur_la_separation(lignes, position_horizontale + 1), self.__largeur_image_chargee - 1)
 
     # =================================
+    @etape_instrumentee("rotation")
     def rotation_des_sous_images(self):
         """
             Méthode qui permet de gérer la rotation des sous-images
+
+            :return: l'angle de la rotation appliquée à chaque sous-image (0 si la sous-image est droite)
+            :rtype: list[float]
         """
 
+        angles_de_rotation = []
+
         # itération sur les sous-image de l'image chargée
         for indice, image in enumerate(self.__liste_des_sous_images):
 
             # création d'ine instance de rotation des images
-            instance_rot_img = RotationDesImages(image, self.__couleur_de_separation)
+            instance_rot_img = RotationDesImages(image, self.__couleur_de_separation, self.__mode_d_estimation_de_l_angle, self.__preset_de_rotation,
+                                                 self.__ordre_des_canaux)
 
             # lancement de la détection de la rotation d'une image
-            instance_rot_img.detection_rotation()
+            angles_de_rotation.append(instance_rot_img.detection_rotation())
 
-    # ===================================
-    def sauvegarde_des_sous_images(self):
+        return angles_de_rotation
+
+    # ====================================================
+    @etape_instrumentee("sauvegarde")
+    def sauvegarde_des_sous_images(self, ecrivain = None):
         """
             Méthode qui permet de sauvegarder les sous-images générées à partir de l'image
+            Les écritures sont soumises à un écrivain asynchrone ; la méthode se termine lorsque toutes les sous-images de l'image sont écrites
+
+            :param ecrivain: écrivain partagé entre les images (un écrivain temporaire est créé s'il n'est pas renseigné)
+            :type ecrivain: None | EcrivainDesImages
+
+            :raise ValueError: si la destination de sauvegarde est inconnue
         """
 
+        if self.__destination_de_sauvegarde not in DESTINATIONS_DE_SAUVEGARDE:
+
+            raise ValueError("Destination de sauvegarde inconnue : {}".format(self.__destination_de_sauvegarde))
+
+        ecrivain_temporaire = ecrivain is None
+
+        if ecrivain_temporaire:
+
+            ecrivain = EcrivainDesImages()
+
+        # création de la destination des sous-images de l'image (le dossier de sauvegarde est créé s'il n'existe pas déjà)
+        nom_de_l_image = self.__nom_de_l_image_a_traiter.split(".")[0]
+        destination = DESTINATIONS_DE_SAUVEGARDE[self.__destination_de_sauvegarde](self.__dossier_de_sauvegarde_des_sous_images, nom_de_l_image,
+                                                                                    self.__ordre_des_canaux, self.__niveaux_d_encodage)
+
         # itération sur les sous-image de l'image chargée
+        taches = []
+
         for indice, image in enumerate(self.__liste_des_sous_images):
 
             # définition du nom du fichier de la sous-image courante
-            nom_de_l_image = self.__nom_de_l_image_a_traiter.split(".")[0]
-            extension_de_l_image = self.__nom_de_l_image_a_traiter.split(".")[1]
+            extension_de_l_image = self.__format_de_sauvegarde or self.__nom_de_l_image_a_traiter.split(".")[1]
             nom_du_fichier_a_enregistrer = "{}_{}{}.{}".format(nom_de_l_image, 0 if indice < 10 else "", indice, extension_de_l_image)
-            nom_absolu_du_fichier_a_enregistrer = os.path.join(self.__dossier_de_sauvegarde_des_sous_images, nom_du_fichier_a_enregistrer)
 
-            # création du dossier de sauvegarde s'il n'existe pas déjà
-            try:
+            # soumission de la sauvegarde de l'image
+            taches.append(ecrivain.soumission(nom_du_fichier_a_enregistrer, image.get_donnees_image(), self.__ordre_des_canaux, destination))
 
-                os.makedirs(self.__dossier_de_sauvegarde_des_sous_images)
+        # attente de la fin des écritures de l'image, puis fermeture de la destination (abandonnée en cas d'échec)
+        reussite = False
 
-            except FileExistsError:
+        try:
 
-                pass
+            ecrivain.attente(taches)
+            reussite = True
+
+        finally:
+
+            noms_absolus_des_fichiers = destination.fermeture(reussite)
+
+            if ecrivain_temporaire:
+
+                ecrivain.fermeture()
+
+        etats_des_fichiers = [os.stat(nom) for nom in noms_absolus_des_fichiers]
+        self.__fichiers_sauvegardes = [[nom, etat.st_size, etat.st_mtime_ns] for nom, etat in zip(noms_absolus_des_fichiers, etats_des_fichiers)]
+
+    # ===============================
+    def liberation_des_donnees(self):
+        """
+            Méthode qui permet de libérer les données de l'image une fois son traitement terminé (ou en échec) :
+            image chargée, palette, sous-images et masques de séparation
+            Les paramètres, les mesures des étapes, les limites des sous-images extraites et les fichiers sauvegardés sont conservés
+        """
 
-            # sauvegarde de l'image
-            imwrite(nom_absolu_du_fichier_a_enregistrer, cvtColor(image.get_donnees_image(), COLOR_RGB2BGR))
+        self.__image_chargee = None
+        self.__palette = None
+        self.__separation_de_l_image_chargee = self.__couleur_de_separation
+        self.__liste_des_sous_images = []
+        self.__sous_image_actuelle = None
+        self.__masque_de_separation = None
+        self.__table_des_sommes_cumulees = None
 
 # ==================================================================================================
 # FONCTIONS
 # ==================================================================================================
 
+
+# ================================================================================================
+def conversion_dans_une_memoire_projetee(image, hauteur_des_bandes, conversion = "COLOR_BGR2RGB"):
+    """
+        Fonction qui permet de convertir une image décodée (BGR), bande par bande, dans une mémoire projetée sur un fichier temporaire
+        Les entiers sont écrits directement ; les float (allant de 0 à 1) sont convertis en entiers (allant de 0 à 255) bande par bande
+
+        :param image: données de l'image décodée (BGR)
+        :type image: numpy.ndarray
+
+        :param hauteur_des_bandes: hauteur (en pixels) des bandes converties
+        :type hauteur_des_bandes: int
+
+        :param conversion: conversion des couleurs (constante de cv2) appliquée à chaque bande (None : bandes copiées dans l'ordre BGR)
+        :type conversion: None | str
+
+        :return: les données de l'image (entiers non signés sur 8 bits) dans une mémoire projetée
+        :rtype: numpy.memmap
+    """
+
+    import cv2
+
+    # le fichier temporaire est supprimé dès sa création : il disparaît avec la dernière vue sur la mémoire projetée
+    image_projetee = memmap(tempfile.TemporaryFile(), dtype = uint8, mode = "w+", shape = image.shape[:2] + (3, ))
+
+    for debut in range(0, image.shape[0], max(1, int(hauteur_des_bandes))):
+
+        bande = image[debut:debut + hauteur_des_bandes]
+
+        if conversion is not None:
+
+            bande = cv2.cvtColor(bande, getattr(cv2, conversion))
+
+        if bande.dtype == float32:
+
+            bande = bande * 255
+
+        image_projetee[debut:debut + len(bande)] = bande
+
+    return image_projetee
+
+
+# ========================================================
+def decodage_d_une_image_a_palette(nom_absolu_de_l_image):
+    """
+        Fonction qui permet de décoder une image à palette (PNG indexé notamment) en son plan d'indices, sans la convertir en couleurs
+        La palette est complétée (en noir) jusqu'à TAILLE_DES_PALETTES entrées : tout indice du plan a une couleur
+
+        :param nom_absolu_de_l_image: nom absolu du fichier de l'image
+        :type nom_absolu_de_l_image: str
+
+        :return: le plan d'indices (un octet par pixel) et la palette (RGB), ou None si l'image n'a pas de palette,
+        ne peut pas être lue par Pillow ou si Pillow n'est pas installé (l'image est alors chargée en couleurs par OpenCV)
+        :rtype: None | (numpy.ndarray, numpy.ndarray)
+    """
+
+    try:
+
+        from PIL import Image
+
+    except ImportError:
+
+        return None
+
+    try:
+
+        with Image.open(nom_absolu_de_l_image) as image:
+
+            if image.mode != "P":
+
+                return None
+
+            indices = asarray(image)
+            couleurs = asarray(image.getpalette("RGB") or [], dtype = uint8).reshape(-1, 3)[:TAILLE_DES_PALETTES]
+
+    except (OSError, ValueError):
+
+        return None
+
+    palette = zeros((TAILLE_DES_PALETTES, 3), dtype = uint8)
+    palette[:len(couleurs)] = couleurs
+
+    return indices, palette
+
+
+# ================================================================================
+def resolution_de_l_indice_de_separation(indices, palette, couleur_de_separation):
+    """
+        Fonction qui permet de résoudre la couleur de séparation en un indice unique de la palette
+        Si plusieurs entrées de la palette ont la couleur de séparation, leurs indices sont remplacés dans le plan par le premier d'entre eux
+
+        :param indices: plan d'indices de l'image
+        :type indices: numpy.ndarray
+
+        :param palette: couleur de chaque indice de la palette, dans l'ordre des canaux de la couleur de séparation
+        :type palette: numpy.ndarray
+
+        :param couleur_de_separation: couleur de séparation entre les sous-images d'une image
+        :type couleur_de_separation: numpy.ndarray
+
+        :return: le plan d'indices et l'indice de la couleur de séparation (-1 si elle est absente de la palette : aucun pixel n'est sur la séparation)
+        :rtype: (numpy.ndarray, int)
+    """
+
+    indices_de_separation = flatnonzero((palette == couleur_de_separation).all(axis = 1))
+
+    if len(indices_de_separation) == 0:
+
+        return indices, -1
+
+    if len(indices_de_separation) > 1:
+
+        correspondance = arange(TAILLE_DES_PALETTES, dtype = uint8)
+        correspondance[indices_de_separation] = indices_de_separation[0]
+        indices = correspondance[indices]
+
+    return indices, int(indices_de_separation[0])
+
+
+# ===========================================================================================================================================
+def mesure_des_moteurs_d_extraction(nom_de_l_image_a_traiter, dossier_contenant_les_images_a_traiter, couleur_de_separation, moteurs = None):
+    """
+        Fonction qui permet de comparer les moteurs d'extraction sur une même image
+        L'image est rechargée pour chaque moteur, seule l'extraction des sous-images est chronométrée
+
+        :param nom_de_l_image_a_traiter: nom de l'image à traiter
+        :type nom_de_l_image_a_traiter: str
+
+        :param dossier_contenant_les_images_a_traiter: nom du dossier contenant les images à traiter
+        :type dossier_contenant_les_images_a_traiter: str
+
+        :param couleur_de_separation: couleur de séparation entre les sous-images d'une image
+        :type couleur_de_separation: numpy.ndarray
+
+        :param moteurs: noms des moteurs à comparer (par défaut, le moteur historique et tous les moteurs de MOTEURS_D_EXTRACTION)
+        :type moteurs: None | list[str]
+
+        :return: pour chaque moteur, la durée de l'extraction (en secondes) et le nombre de sous-images extraites
+        :rtype: dict[str, tuple(float, int)]
+    """
+
+    if moteurs is None:
+
+        moteurs = ["historique"] + sorted(MOTEURS_D_EXTRACTION)
+
+    resultats = {}
+
+    for moteur in moteurs:
+
+        gestionnaire = GestionnaireDImage(nom_de_l_image_a_traiter, dossier_contenant_les_images_a_traiter, couleur_de_separation, moteur)
+        gestionnaire.chargement_de_l_image_a_traiter()
+        gestionnaire.calcul_dimensions_image_chargee()
+
+        debut = time.perf_counter()
+        gestionnaire.extraction_des_sous_images()
+        resultats[moteur] = (time.perf_counter() - debut, len(gestionnaire.get_liste_des_sous_images()))
+
+    return resultats
+
 # ==================================================================================================
 # UTILISATION
 # ==================================================================================================
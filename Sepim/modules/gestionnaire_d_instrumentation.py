@@ -0,0 +1,397 @@
+# coding=utf-8
+
+"""
+    Module qui permet d'instrumenter les étapes du traitement des images et de produire les rapports de traitement (JSON, OpenMetrics)
+"""
+
+# =================================================================================================
+# PARAMETRES GLOBAUX
+# =================================================================================================
+
+__author__ = 'Julien LEPAIN'
+__email__ = 'julien.lepain.31@gmail.com'
+__version__ = '1.0'
+__maintainer__ = 'Julien LEPAIN'
+__date__ = '16/05/2019'
+__status = 'dev'
+
+# ==================================================================================================
+# IMPORTS
+# ==================================================================================================
+
+import json
+import time
+import functools
+import threading
+import tracemalloc
+
+# ==================================================================================================
+# INITIALISATIONS
+# ==================================================================================================
+
+# Étapes instrumentées du traitement d'une image, dans l'ordre d'exécution
+ETAPES_INSTRUMENTEES = ("chargement", "extraction", "rotation", "sauvegarde")
+
+# Métriques OpenMetrics produites pour l'ensemble du traitement : (nom de la métrique, clé du rapport, type, unité, description)
+# Les valeurs sont cumulées d'un lot à l'autre en mode démon : ce sont des compteurs (échantillon suffixé par "_total")
+METRIQUES_DES_IMAGES = (("sepim_images_traitees", "images_traitees", "counter", None, "Nombre d'images traitées"),
+                        ("sepim_images_en_echec", "images_en_echec", "counter", None, "Nombre d'images dont le traitement a échoué"),
+                        ("sepim_images_depuis_le_cache", "images_depuis_le_cache", "counter", None,
+                         "Nombre d'images dont le résultat provient du cache des résultats"))
+
+# Métriques OpenMetrics produites pour chaque étape : (nom de la métrique, clé de la mesure, type, unité, description)
+# Seul le pic de mémoire, maximum et non cumul, est une jauge
+METRIQUES_DES_ETAPES = (("sepim_etape_duree_seconds", "duree", "counter", "seconds", "Durée cumulée de l'étape (en secondes)"),
+                        ("sepim_etape_sous_images", "sous_images", "counter", None, "Nombre de sous-images traitées par l'étape"),
+                        ("sepim_etape_pixels", "pixels", "counter", None, "Nombre de pixels parcourus par l'étape"),
+                        ("sepim_etape_rotations", "rotations", "counter", None, "Nombre de rotations effectuées par l'étape"),
+                        ("sepim_etape_pic_de_memoire_bytes", "pic_de_memoire", "gauge", "bytes", "Pic de mémoire tracée pendant l'étape (en octets)"),
+                        ("sepim_etape_erreurs", "erreurs", "counter", None, "Nombre d'échecs de l'étape"))
+
+# Nombre maximal de résumés d'images conservés dans un rapport (les plus récents) : en mode démon, le rapport ne croît pas avec la durée de fonctionnement
+TAILLE_DE_L_HISTORIQUE_DES_RAPPORTS = 1000
+
+# Suivi de la mémoire (tracemalloc) : nombre d'étapes instrumentées en cours, suivi démarré par ce module (et non par l'appelant)
+# et verrou protégeant ces valeurs (le suivi, coûteux, est démarré par la première étape instrumentée et arrêté à la fin de la dernière,
+# sauf s'il était déjà démarré par l'appelant)
+_etapes_suivies = [0]
+_suivi_demarre_par_le_module = [False]
+_verrou_du_suivi_de_la_memoire = threading.Lock()
+
+# ==================================================================================================
+# CLASSES
+# ==================================================================================================
+
+# ==================================================================================================
+# FONCTIONS
+# ==================================================================================================
+
+
+# =====================================
+def etape_instrumentee(nom_de_l_etape):
+    """
+        Fonction qui permet de créer un décorateur instrumentant une étape de Sepim.modules.gestionnaire_d_image.GestionnaireDImage
+        Lorsque l'instrumentation du gestionnaire est désactivée, la méthode décorée est appelée directement (un seul test supplémentaire)
+
+        Pour chaque appel, la mesure enregistrée contient : la durée, le nombre de sous-images, le nombre de pixels parcourus,
+        le nombre de rotations effectuées, le pic de mémoire tracée (cf. tracemalloc) et l'erreur éventuelle.
+        Le pic de mémoire tracée est global au processus : lors d'un traitement en flux, il inclut les étapes exécutées simultanément.
+
+        :param nom_de_l_etape: nom de l'étape (cf. ETAPES_INSTRUMENTEES)
+        :type nom_de_l_etape: str
+
+        :return: le décorateur
+        :rtype: function
+    """
+
+    # ======================
+    def decorateur(methode):
+        """
+            Décorateur de la méthode d'une étape
+
+            :param methode: méthode de l'étape
+            :type methode: function
+
+            :return: la méthode instrumentée
+            :rtype: function
+        """
+
+        # ======================================================
+        @functools.wraps(methode)
+        def methode_instrumentee(gestionnaire, *args, **kwargs):
+            """
+                Méthode instrumentée : la mesure de l'appel est ajoutée aux mesures des étapes du gestionnaire, y compris en cas d'échec
+            """
+
+            if not gestionnaire.get_instrumentation():
+
+                return methode(gestionnaire, *args, **kwargs)
+
+            debut_du_suivi_de_la_memoire()
+
+            mesure = {"etape": nom_de_l_etape, "erreur": None}
+            debut = time.perf_counter()
+
+            try:
+
+                resultat = methode(gestionnaire, *args, **kwargs)
+
+            except Exception as exception:
+
+                mesure["erreur"] = "{}: {}".format(type(exception).__name__, exception)
+                raise
+
+            else:
+
+                # seule l'étape de rotation renvoie un résultat : l'angle de chaque rotation
+                mesure["rotations"] = sum(1 for angle in resultat if angle != 0.0) if nom_de_l_etape == "rotation" else 0
+
+                return resultat
+
+            finally:
+
+                mesure["duree"] = time.perf_counter() - debut
+                mesure["pic_de_memoire"] = fin_du_suivi_de_la_memoire()
+                mesure.setdefault("rotations", 0)
+                mesure["sous_images"] = len(gestionnaire.get_liste_des_sous_images())
+                mesure["pixels"] = calcul_des_pixels_parcourus(gestionnaire, nom_de_l_etape)
+                gestionnaire.ajout_d_une_mesure_d_etape(mesure)
+
+        return methode_instrumentee
+
+    return decorateur
+
+
+# =================================
+def debut_du_suivi_de_la_memoire():
+    """
+        Fonction qui permet de démarrer, si nécessaire, le suivi de la mémoire et de réinitialiser son pic
+    """
+
+    with _verrou_du_suivi_de_la_memoire:
+
+        if _etapes_suivies[0] == 0 and not tracemalloc.is_tracing():
+
+            tracemalloc.start()
+            _suivi_demarre_par_le_module[0] = True
+
+        _etapes_suivies[0] += 1
+        tracemalloc.reset_peak()
+
+
+# ===============================
+def fin_du_suivi_de_la_memoire():
+    """
+        Fonction qui permet de récupérer le pic de mémoire tracée depuis le début du suivi, et d'arrêter le suivi si plus aucune étape n'est suivie
+        (un suivi démarré par l'appelant avant la première étape n'est pas arrêté)
+
+        :return: le pic de mémoire tracée (en octets)
+        :rtype: int
+    """
+
+    with _verrou_du_suivi_de_la_memoire:
+
+        pic_de_memoire = tracemalloc.get_traced_memory()[1]
+        _etapes_suivies[0] -= 1
+
+        if _etapes_suivies[0] == 0 and _suivi_demarre_par_le_module[0]:
+
+            tracemalloc.stop()
+            _suivi_demarre_par_le_module[0] = False
+
+        return pic_de_memoire
+
+
+# ============================================================
+def calcul_des_pixels_parcourus(gestionnaire, nom_de_l_etape):
+    """
+        Fonction qui permet de calculer le nombre de pixels parcourus par une étape :
+        l'image entière pour le chargement et l'extraction, les sous-images pour la rotation et la sauvegarde
+
+        :param gestionnaire: gestionnaire de l'image traitée
+        :type gestionnaire: Sepim.modules.gestionnaire_d_image.GestionnaireDImage
+
+        :param nom_de_l_etape: nom de l'étape (cf. ETAPES_INSTRUMENTEES)
+        :type nom_de_l_etape: str
+
+        :return: le nombre de pixels parcourus
+        :rtype: int
+    """
+
+    if nom_de_l_etape in ("chargement", "extraction"):
+
+        return int(gestionnaire.get_hauteur_image_chargee() or 0) * int(gestionnaire.get_largeur_image_chargee() or 0)
+
+    return sum(int(sous_image.get_donnees_image().shape[0]) * int(sous_image.get_donnees_image().shape[1])
+               for sous_image in gestionnaire.get_liste_des_sous_images() if sous_image.get_donnees_image() is not None)
+
+
+# ===============================================================================================
+def creation_du_rapport(resultats, taille_de_l_historique = TAILLE_DE_L_HISTORIQUE_DES_RAPPORTS):
+    """
+        Fonction qui permet de créer le rapport d'un traitement à partir du résumé de chaque image
+        Les mesures des étapes de toutes les images sont cumulées par étape (le pic de mémoire retenu est le maximum)
+
+        :param resultats: résumé du traitement de chaque image (cf. Sepim.modules.gestionnaire_pipeline_de_traitement.creation_du_resume)
+        :type resultats: list[dict]
+
+        :param taille_de_l_historique: nombre maximal de résumés d'images conservés dans le rapport (les plus récents)
+        :type taille_de_l_historique: int
+
+        :return: le rapport : nombre d'images traitées, en échec et issues du cache, mesures cumulées par étape et résumé des dernières images
+        :rtype: dict
+    """
+
+    rapport = {"images_traitees": 0,
+               "images_en_echec": 0,
+               "images_depuis_le_cache": 0,
+               "etapes": {etape: {"duree": 0.0, "sous_images": 0, "pixels": 0, "rotations": 0, "pic_de_memoire": 0, "erreurs": 0}
+                          for etape in ETAPES_INSTRUMENTEES},
+               "images": []}
+
+    return cumul_des_resultats(rapport, resultats, taille_de_l_historique)
+
+
+# ========================================================================================================
+def cumul_des_resultats(rapport, resultats, taille_de_l_historique = TAILLE_DE_L_HISTORIQUE_DES_RAPPORTS):
+    """
+        Fonction qui permet d'ajouter à un rapport (modifié sur place) le résumé du traitement de nouvelles images (par exemple, un lot du mode démon) :
+        les compteurs et les mesures par étape sont cumulés, seuls les résumés des dernières images sont conservés
+
+        :param rapport: rapport du traitement (cf. creation_du_rapport)
+        :type rapport: dict
+
+        :param resultats: résumé du traitement de chaque nouvelle image
+        :type resultats: list[dict]
+
+        :param taille_de_l_historique: nombre maximal de résumés d'images conservés dans le rapport (les plus récents)
+        :type taille_de_l_historique: int
+
+        :return: le rapport
+        :rtype: dict
+    """
+
+    for resume in resultats:
+
+        for mesure in resume.get("etapes", ()):
+
+            cumul = rapport["etapes"][mesure["etape"]]
+            cumul["duree"] += mesure["duree"]
+            cumul["sous_images"] += mesure["sous_images"]
+            cumul["pixels"] += mesure["pixels"]
+            cumul["rotations"] += mesure["rotations"]
+            cumul["pic_de_memoire"] = max(cumul["pic_de_memoire"], mesure["pic_de_memoire"])
+            cumul["erreurs"] += mesure["erreur"] is not None
+
+    rapport["images_traitees"] += len(resultats)
+    rapport["images_en_echec"] += sum(1 for resume in resultats if resume["erreur"] is not None)
+    rapport["images_depuis_le_cache"] += sum(1 for resume in resultats if resume.get("depuis_le_cache"))
+
+    rapport["images"].extend(resultats)
+
+    if len(rapport["images"]) > taille_de_l_historique:
+
+        del rapport["images"][:len(rapport["images"]) - taille_de_l_historique]
+
+    return rapport
+
+
+# =====================================
+def conversion_en_openmetrics(rapport):
+    """
+        Fonction qui permet de convertir un rapport de traitement au format texte OpenMetrics
+
+        :param rapport: rapport du traitement (cf. creation_du_rapport)
+        :type rapport: dict
+
+        :return: le rapport au format OpenMetrics (terminé par "# EOF")
+        :rtype: str
+    """
+
+    lignes = []
+
+    for nom_de_la_metrique, cle, type_de_la_metrique, unite, description in METRIQUES_DES_IMAGES:
+
+        lignes.extend(declaration_d_une_metrique(nom_de_la_metrique, type_de_la_metrique, unite, description))
+        lignes.append("{} {}".format(nom_de_l_echantillon(nom_de_la_metrique, type_de_la_metrique), rapport[cle]))
+
+    for nom_de_la_metrique, cle, type_de_la_metrique, unite, description in METRIQUES_DES_ETAPES:
+
+        lignes.extend(declaration_d_une_metrique(nom_de_la_metrique, type_de_la_metrique, unite, description))
+
+        for etape in ETAPES_INSTRUMENTEES:
+
+            lignes.append('{}{{etape="{}"}} {}'.format(nom_de_l_echantillon(nom_de_la_metrique, type_de_la_metrique), etape,
+                                                       rapport["etapes"][etape][cle]))
+
+    lignes.append("# EOF")
+
+    return "\n".join(lignes) + "\n"
+
+
+# ==========================================================================================
+def declaration_d_une_metrique(nom_de_la_metrique, type_de_la_metrique, unite, description):
+    """
+        Fonction qui permet de créer les lignes de déclaration (description, type, unité) d'une métrique OpenMetrics
+
+        :param nom_de_la_metrique: nom de la métrique (suffixé par son unité, le cas échéant)
+        :type nom_de_la_metrique: str
+
+        :param type_de_la_metrique: type de la métrique ("counter" ou "gauge")
+        :type type_de_la_metrique: str
+
+        :param unite: unité de la métrique (None : sans unité)
+        :type unite: None | str
+
+        :param description: description de la métrique
+        :type description: str
+
+        :return: les lignes de déclaration de la métrique
+        :rtype: list[str]
+    """
+
+    lignes = ["# HELP {} {}".format(nom_de_la_metrique, description),
+              "# TYPE {} {}".format(nom_de_la_metrique, type_de_la_metrique)]
+
+    if unite is not None:
+
+        lignes.append("# UNIT {} {}".format(nom_de_la_metrique, unite))
+
+    return lignes
+
+
+# ================================================================
+def nom_de_l_echantillon(nom_de_la_metrique, type_de_la_metrique):
+    """
+        Fonction qui permet de nommer l'échantillon d'une métrique OpenMetrics : un compteur est suffixé par "_total"
+
+        :param nom_de_la_metrique: nom de la métrique
+        :type nom_de_la_metrique: str
+
+        :param type_de_la_metrique: type de la métrique ("counter" ou "gauge")
+        :type type_de_la_metrique: str
+
+        :return: le nom de l'échantillon
+        :rtype: str
+    """
+
+    return nom_de_la_metrique + "_total" if type_de_la_metrique == "counter" else nom_de_la_metrique
+
+
+# ====================================================================================
+def ecriture_des_rapports(resultats, rapport_json = None, rapport_openmetrics = None):
+    """
+        Fonction qui permet d'écrire le rapport d'un traitement au format JSON et/ou au format OpenMetrics
+
+        :param resultats: résumé du traitement de chaque image, ou rapport déjà créé (cf. creation_du_rapport)
+        :type resultats: list[dict] | dict
+
+        :param rapport_json: nom du fichier du rapport JSON (None : pas de rapport JSON)
+        :type rapport_json: None | str
+
+        :param rapport_openmetrics: nom du fichier du rapport OpenMetrics (None : pas de rapport OpenMetrics)
+        :type rapport_openmetrics: None | str
+
+        :return: le rapport du traitement
+        :rtype: dict
+    """
+
+    rapport = resultats if isinstance(resultats, dict) else creation_du_rapport(resultats)
+
+    if rapport_json is not None:
+
+        with open(rapport_json, "w", encoding = "utf-8") as fichier:
+
+            json.dump(rapport, fichier, indent = 2, ensure_ascii = False)
+
+    if rapport_openmetrics is not None:
+
+        with open(rapport_openmetrics, "w", encoding = "utf-8") as fichier:
+
+            fichier.write(conversion_en_openmetrics(rapport))
+
+    return rapport
+
+# ==================================================================================================
+# UTILISATION
+# ==================================================================================================
@@ -0,0 +1,311 @@
+# coding=utf-8
+
+"""
+    Module qui permet de surveiller en continu le dossier des images à traiter et de traiter les images dès leur arrivée
+"""
+
+# =================================================================================================
+# PARAMETRES GLOBAUX
+# =================================================================================================
+
+__author__ = 'Julien LEPAIN'
+__email__ = 'julien.lepain.31@gmail.com'
+__version__ = '1.0'
+__maintainer__ = 'Julien LEPAIN'
+__date__ = '16/05/2019'
+__status = 'dev'
+
+# ==================================================================================================
+# IMPORTS
+# ==================================================================================================
+
+import os
+import time
+import fnmatch
+import importlib
+import threading
+
+# ==================================================================================================
+# INITIALISATIONS
+# ==================================================================================================
+
+# Intervalle par défaut (en secondes) entre deux scrutations du dossier
+INTERVALLE_DE_SCRUTATION_PAR_DEFAUT = 1.0
+
+# Délai par défaut (en secondes) pendant lequel la taille et la date de modification d'un fichier doivent rester inchangées avant son traitement
+DELAI_DE_STABILITE_PAR_DEFAUT = 1.0
+
+# Modules dont l'import est différé, préchargés au lancement de la surveillance
+MODULES_PRECHARGES = ("cv2", "scipy.ndimage")
+
+# ==================================================================================================
+# CLASSES
+# ==================================================================================================
+
+
+# ==================================
+class SurveillanceDuDossier(object):
+    """
+        Classe de surveillance du dossier des images à traiter (mode démon)
+
+        Le dossier est scruté à intervalle régulier. L'état (taille, date de modification) de chaque fichier est comparé à un index des fichiers déjà traités :
+        seules les images nouvelles ou modifiées sont traitées, une fois leur état stable pendant le délai de stabilité (fichier entièrement copié).
+        Les modules et les ressources du traitement (écrivain des sous-images, ensemble de processus) restent chargés d'un lot d'images à l'autre.
+        Seul le dossier lui-même est scruté (et non ses sous-dossiers) : les sous-images ne peuvent pas être sauvegardées dans le dossier surveillé,
+        où elles seraient traitées à leur tour.
+
+        :ivar __gestionnaire_des_images_a_traiter: gestionnaire portant les paramètres et les ressources du traitement
+        :type __gestionnaire_des_images_a_traiter: Sepim.modules.gestionnaire_des_images_a_traiter.GestionnaireDesImagesATraiter
+
+        :ivar __intervalle_de_scrutation: intervalle (en secondes) entre deux scrutations du dossier
+        :type __intervalle_de_scrutation: float
+
+        :ivar __delai_de_stabilite: délai (en secondes) pendant lequel l'état d'un fichier doit rester inchangé avant son traitement
+        :type __delai_de_stabilite: float
+
+        :ivar __traitement_des_resultats: fonction appelée avec le résumé du traitement de chaque lot d'images (None : aucune)
+        :type __traitement_des_resultats: None | function
+
+        :ivar __index_des_fichiers_traites: état (taille, date de modification) de chaque fichier traité, lors de son traitement
+        :type __index_des_fichiers_traites: dict[str, (int, int)]
+
+        :ivar __fichiers_en_attente: état de chaque fichier en attente de stabilité et instant (monotone) de sa dernière modification observée
+        :type __fichiers_en_attente: dict[str, ((int, int), float)]
+
+        :ivar __evenement_d_arret: événement qui interrompt la surveillance
+        :type __evenement_d_arret: threading.Event
+    """
+
+    # ===================================================================================================================
+    def __init__(self, gestionnaire_des_images_a_traiter, intervalle_de_scrutation = INTERVALLE_DE_SCRUTATION_PAR_DEFAUT,
+                 delai_de_stabilite = DELAI_DE_STABILITE_PAR_DEFAUT, traitement_des_resultats = None):
+        """
+            Constructeur de la classe
+
+            :param gestionnaire_des_images_a_traiter: gestionnaire portant les paramètres et les ressources du traitement
+            :type gestionnaire_des_images_a_traiter: Sepim.modules.gestionnaire_des_images_a_traiter.GestionnaireDesImagesATraiter
+
+            :param intervalle_de_scrutation: intervalle (en secondes) entre deux scrutations du dossier
+            :type intervalle_de_scrutation: float
+
+            :param delai_de_stabilite: délai (en secondes) pendant lequel la taille et la date de modification d'un fichier doivent rester inchangées
+            :type delai_de_stabilite: float
+
+            :param traitement_des_resultats: fonction appelée avec le résumé du traitement de chaque lot d'images (None : aucune)
+            :type traitement_des_resultats: None | function
+        """
+
+        # Attributs d'instance initialisés via les paramètres du constructeur
+        self.__gestionnaire_des_images_a_traiter = gestionnaire_des_images_a_traiter
+        self.__intervalle_de_scrutation = intervalle_de_scrutation
+        self.__delai_de_stabilite = delai_de_stabilite
+        self.__traitement_des_resultats = traitement_des_resultats
+
+        # Autres attributs d'instance
+        self.__index_des_fichiers_traites = {}
+        self.__fichiers_en_attente = {}
+        self.__evenement_d_arret = threading.Event()
+
+    # =======================================
+    def get_index_des_fichiers_traites(self):
+        """
+            Accesseur de l'attribut __index_des_fichiers_traites
+
+            :return: __index_des_fichiers_traites
+            :rtype: dict[str, (int, int)]
+        """
+
+        return self.__index_des_fichiers_traites
+
+    # ==============================================
+    def surveillance(self, nombre_de_cycles = None):
+        """
+            Méthode qui permet de surveiller le dossier jusqu'à l'appel de arret (ou jusqu'au nombre de cycles indiqué)
+
+            :param nombre_de_cycles: nombre de scrutations du dossier (None : jusqu'à l'appel de arret)
+            :type nombre_de_cycles: None | int
+
+            :raise FileNotFoundError: si le dossier contenant les images n'existe pas au lancement de la surveillance
+            :raise ValueError: si le dossier de sauvegarde des sous-images est le dossier surveillé
+        """
+
+        dossier = self.__gestionnaire_des_images_a_traiter.get_dossier_contenant_les_images()
+        dossier_de_sauvegarde = self.__gestionnaire_des_images_a_traiter.get_dossier_de_sauvegarde()
+
+        if not os.path.isdir(dossier):
+
+            raise FileNotFoundError("Dossier introuvable : {}".format(dossier))
+
+        if dossier_de_sauvegarde is not None and os.path.realpath(dossier_de_sauvegarde) == os.path.realpath(dossier):
+
+            raise ValueError("Le dossier de sauvegarde ne peut pas être le dossier surveillé : {}".format(dossier))
+
+        # chargement des modules importés à leur première utilisation (hérités par les processus de traitement créés ensuite)
+        prechargement_des_modules()
+
+        self.__evenement_d_arret.clear()
+        self.__gestionnaire_des_images_a_traiter.ouverture_des_ressources()
+        cycle = 0
+
+        try:
+
+            while not self.__evenement_d_arret.is_set() and (nombre_de_cycles is None or cycle < nombre_de_cycles):
+
+                self.cycle_de_surveillance()
+                cycle += 1
+
+                if nombre_de_cycles is None or cycle < nombre_de_cycles:
+
+                    self.__evenement_d_arret.wait(self.__intervalle_de_scrutation)
+
+        finally:
+
+            self.__gestionnaire_des_images_a_traiter.fermeture_des_ressources()
+
+    # ==============
+    def arret(self):
+        """
+            Méthode qui permet d'interrompre la surveillance, à la fin du cycle en cours (peut être appelée depuis un autre fil d'exécution)
+        """
+
+        self.__evenement_d_arret.set()
+
+    # ==============================
+    def cycle_de_surveillance(self):
+        """
+            Méthode qui permet de scruter le dossier une fois et de traiter les images prêtes
+
+            :return: le résumé du traitement de chaque image traitée lors du cycle
+            :rtype: list[dict]
+        """
+
+        # un dossier momentanément inaccessible (partage réseau) ne modifie pas l'index
+        try:
+
+            etats_des_fichiers = self.scrutation_du_dossier()
+
+        except OSError:
+
+            return []
+
+        images_pretes = self.selection_des_images_pretes(etats_des_fichiers, time.monotonic())
+
+        if not images_pretes:
+
+            return []
+
+        gestionnaires = [self.__gestionnaire_des_images_a_traiter.creation_d_un_gestionnaire_d_image(nom) for nom in images_pretes]
+        resultats = self.__gestionnaire_des_images_a_traiter.traitement_des_gestionnaires(gestionnaires)
+
+        # une image en échec n'est traitée à nouveau que si elle est modifiée
+        for nom in images_pretes:
+
+            self.__index_des_fichiers_traites[nom] = etats_des_fichiers[nom]
+
+        self.__gestionnaire_des_images_a_traiter.ecriture_des_rapports()
+
+        if self.__traitement_des_resultats is not None:
+
+            self.__traitement_des_resultats(resultats)
+
+        return resultats
+
+    # ==============================
+    def scrutation_du_dossier(self):
+        """
+            Méthode qui permet de relever l'état des fichiers du dossier correspondant aux extensions prises en charge
+            Les fichiers cachés (dont le nom commence par ".") sont ignorés, comme le fait glob
+
+            :return: l'état (taille, date de modification en nanosecondes) de chaque fichier
+            :rtype: dict[str, (int, int)]
+        """
+
+        motifs = self.__gestionnaire_des_images_a_traiter.get_extensions_prises_en_charge()
+        etats_des_fichiers = {}
+
+        with os.scandir(self.__gestionnaire_des_images_a_traiter.get_dossier_contenant_les_images()) as entrees:
+
+            for entree in entrees:
+
+                if entree.name.startswith(".") or not any(fnmatch.fnmatch(entree.name, motif) for motif in motifs):
+
+                    continue
+
+                # le fichier peut avoir été supprimé entre le listage et la lecture de son état
+                try:
+
+                    if entree.is_file():
+
+                        etat = entree.stat()
+                        etats_des_fichiers[entree.name] = (etat.st_size, etat.st_mtime_ns)
+
+                except OSError:
+
+                    pass
+
+        return etats_des_fichiers
+
+    # =================================================================
+    def selection_des_images_pretes(self, etats_des_fichiers, instant):
+        """
+            Méthode qui permet de sélectionner les images nouvelles ou modifiées dont l'état est stable depuis le délai de stabilité
+            La stabilité est observée via l'horloge locale (et non via la date de modification) : un décalage d'horloge du partage est sans effet
+
+            :param etats_des_fichiers: état de chaque fichier du dossier (cf. scrutation_du_dossier)
+            :type etats_des_fichiers: dict[str, (int, int)]
+
+            :param instant: instant (monotone) de la scrutation
+            :type instant: float
+
+            :return: les noms des images prêtes à être traitées
+            :rtype: list[str]
+        """
+
+        # oubli des fichiers supprimés : un fichier déposé à nouveau sous le même nom sera traité
+        for index in (self.__index_des_fichiers_traites, self.__fichiers_en_attente):
+
+            for nom in [nom for nom in index if nom not in etats_des_fichiers]:
+
+                del index[nom]
+
+        images_pretes = []
+
+        for nom, etat in sorted(etats_des_fichiers.items()):
+
+            if self.__index_des_fichiers_traites.get(nom) == etat:
+
+                continue
+
+            en_attente = self.__fichiers_en_attente.get(nom)
+
+            # fichier nouveau ou modifié depuis la dernière scrutation : début (ou reprise) de l'attente
+            if en_attente is None or en_attente[0] != etat:
+
+                self.__fichiers_en_attente[nom] = (etat, instant)
+
+            elif etat[0] > 0 and instant - en_attente[1] >= self.__delai_de_stabilite:
+
+                del self.__fichiers_en_attente[nom]
+                images_pretes.append(nom)
+
+        return images_pretes
+
+# ==================================================================================================
+# FONCTIONS
+# ==================================================================================================
+
+
+# ==============================
+def prechargement_des_modules():
+    """
+        Fonction qui permet d'importer les modules dont l'import est différé (OpenCV, SciPy),
+        afin que le traitement de la première image déposée ne supporte pas leur temps d'import
+    """
+
+    for nom_du_module in MODULES_PRECHARGES:
+
+        importlib.import_module(nom_du_module)
+
+# ==================================================================================================
+# UTILISATION
+# ==================================================================================================
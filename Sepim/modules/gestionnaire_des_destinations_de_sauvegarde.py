@@ -0,0 +1,446 @@
+# coding=utf-8
+
+"""
+    Module qui permet de choisir la destination des sous-images sauvegardées : un fichier par sous-image, une archive (tar, zip)
+    ou un ensemble de tableaux (npz) par image traitée
+"""
+
+# =================================================================================================
+# PARAMETRES GLOBAUX
+# =================================================================================================
+
+__author__ = 'Julien LEPAIN'
+__email__ = 'julien.lepain.31@gmail.com'
+__version__ = '1.0'
+__maintainer__ = 'Julien LEPAIN'
+__date__ = '16/05/2019'
+__status = 'dev'
+
+# ==================================================================================================
+# IMPORTS
+# ==================================================================================================
+
+from Sepim.modules.gestionnaire_d_ecriture_des_images import CONVERSIONS_AVANT_L_ECRITURE
+
+import os
+import io
+import time
+import threading
+import functools
+import numpy
+
+# OpenCV (cv2) est importé à sa première utilisation, lors de l'encodage des sous-images ;
+# tarfile et zipfile le sont à la création d'une archive ou d'un fichier npz
+
+# ==================================================================================================
+# INITIALISATIONS
+# ==================================================================================================
+
+# Paramètre d'encodage (constante de cv2) réglé par le niveau d'encodage de chaque extension :
+# niveau de compression (0 à 9) pour le PNG, qualité (0 à 100) pour le JPEG et le WebP
+PARAMETRES_D_ENCODAGE = {"png": "IMWRITE_PNG_COMPRESSION",
+                         "jpg": "IMWRITE_JPEG_QUALITY",
+                         "jpeg": "IMWRITE_JPEG_QUALITY",
+                         "webp": "IMWRITE_WEBP_QUALITY"}
+
+# Suffixe des fichiers en cours d'écriture (archives et tableaux), renommés à la fermeture de la destination
+SUFFIXE_DES_FICHIERS_EN_COURS = ".partiel"
+
+# ==================================================================================================
+# CLASSES
+# ==================================================================================================
+
+
+# ================================
+class DestinationFichiers(object):
+    """
+        Classe de destination des sous-images d'une image : un fichier par sous-image dans le dossier de sauvegarde
+
+        Toutes les destinations offrent la même interface : le constructeur reçoit le dossier de sauvegarde, le nom de base de l'image,
+        l'ordre des canaux des sous-images et les niveaux d'encodage ; la méthode ajout peut être appelée simultanément par plusieurs
+        fils d'exécution ; la méthode fermeture renvoie les noms absolus des fichiers écrits (aucun si l'écriture est abandonnée).
+
+        :ivar __dossier_de_sauvegarde: dossier de sauvegarde des sous-images
+        :type __dossier_de_sauvegarde: str
+
+        :ivar __ordre_des_canaux: ordre des canaux des données des sous-images ("RGB" ou "BGR")
+        :type __ordre_des_canaux: str
+
+        :ivar __niveaux_d_encodage: niveau d'encodage de chaque extension (cf. PARAMETRES_D_ENCODAGE)
+        :type __niveaux_d_encodage: dict[str, int]
+
+        :ivar __fichiers_ecrits: noms absolus des fichiers écrits
+        :type __fichiers_ecrits: list[str]
+
+        :ivar __verrou: verrou protégeant la liste des fichiers écrits
+        :type __verrou: threading.Lock
+    """
+
+    # ==========================================================================================================
+    def __init__(self, dossier_de_sauvegarde, nom_de_base, ordre_des_canaux = "RGB", niveaux_d_encodage = None):
+        """
+            Constructeur de la classe
+
+            :param dossier_de_sauvegarde: dossier de sauvegarde des sous-images (créé s'il n'existe pas)
+            :type dossier_de_sauvegarde: str
+
+            :param nom_de_base: nom de l'image traitée, sans extension (inutilisé : chaque sous-image porte déjà son propre nom)
+            :type nom_de_base: str
+
+            :param ordre_des_canaux: ordre des canaux des données des sous-images ("RGB" ou "BGR")
+            :type ordre_des_canaux: str
+
+            :param niveaux_d_encodage: niveau d'encodage de chaque extension (None : réglages par défaut d'OpenCV)
+            :type niveaux_d_encodage: None | dict[str, int]
+        """
+
+        # Attributs d'instance initialisés via les paramètres du constructeur
+        self.__dossier_de_sauvegarde = dossier_de_sauvegarde
+        self.__ordre_des_canaux = ordre_des_canaux
+        self.__niveaux_d_encodage = niveaux_d_encodage or {}
+
+        # Autres attributs d'instance
+        self.__fichiers_ecrits = []
+        self.__verrou = threading.Lock()
+
+        os.makedirs(self.__dossier_de_sauvegarde, exist_ok = True)
+
+    # =============================================
+    def ajout(self, nom_du_fichier, donnees_image):
+        """
+            Méthode qui permet d'encoder et d'écrire une sous-image
+
+            :param nom_du_fichier: nom du fichier de la sous-image (son extension détermine le format)
+            :type nom_du_fichier: str
+
+            :param donnees_image: données de la sous-image
+            :type donnees_image: numpy.ndarray
+
+            :raise IOError: si la sous-image ne peut pas être écrite
+        """
+
+        import cv2
+
+        nom_absolu_du_fichier = os.path.join(self.__dossier_de_sauvegarde, nom_du_fichier)
+        donnees_image, parametres = preparation_de_l_encodage(nom_du_fichier, donnees_image, self.__ordre_des_canaux, self.__niveaux_d_encodage)
+
+        if not cv2.imwrite(nom_absolu_du_fichier, donnees_image, parametres):
+
+            raise IOError("Écriture impossible : {}".format(nom_absolu_du_fichier))
+
+        with self.__verrou:
+
+            self.__fichiers_ecrits.append(nom_absolu_du_fichier)
+
+    # ===================================
+    def fermeture(self, reussite = True):
+        """
+            Méthode qui permet de terminer l'écriture des sous-images de l'image
+
+            :param reussite: si False, l'écriture est abandonnée (les fichiers déjà écrits sont conservés, comme auparavant)
+            :type reussite: bool
+
+            :return: les noms absolus des fichiers écrits, triés (aucun si l'écriture est abandonnée)
+            :rtype: list[str]
+        """
+
+        return sorted(self.__fichiers_ecrits) if reussite else []
+
+
+# ===============================
+class DestinationArchive(object):
+    """
+        Classe de destination des sous-images d'une image : une archive (tar ou zip, sans compression supplémentaire) par image traitée
+
+        Chaque sous-image est encodée par le fil d'exécution qui l'ajoute, puis écrite à la suite de l'archive ouverte :
+        l'archive n'est jamais construite en mémoire et les sous-images y figurent dans l'ordre de fin de leur encodage.
+        L'archive est écrite sous un nom temporaire, renommée à la fermeture.
+
+        :ivar __ordre_des_canaux: ordre des canaux des données des sous-images ("RGB" ou "BGR")
+        :type __ordre_des_canaux: str
+
+        :ivar __niveaux_d_encodage: niveau d'encodage de chaque extension (cf. PARAMETRES_D_ENCODAGE)
+        :type __niveaux_d_encodage: dict[str, int]
+
+        :ivar __format_d_archive: format de l'archive ("tar" ou "zip")
+        :type __format_d_archive: str
+
+        :ivar __nom_absolu_de_l_archive: nom absolu de l'archive
+        :type __nom_absolu_de_l_archive: str
+
+        :ivar __archive: archive ouverte en écriture
+        :type __archive: tarfile.TarFile | zipfile.ZipFile
+
+        :ivar __verrou: verrou protégeant l'écriture dans l'archive
+        :type __verrou: threading.Lock
+    """
+
+    # ====================================================================================================================================
+    def __init__(self, dossier_de_sauvegarde, nom_de_base, ordre_des_canaux = "RGB", niveaux_d_encodage = None, format_d_archive = "tar"):
+        """
+            Constructeur de la classe
+
+            :param dossier_de_sauvegarde: dossier de sauvegarde de l'archive (créé s'il n'existe pas)
+            :type dossier_de_sauvegarde: str
+
+            :param nom_de_base: nom de l'image traitée, sans extension (nom de l'archive)
+            :type nom_de_base: str
+
+            :param ordre_des_canaux: ordre des canaux des données des sous-images ("RGB" ou "BGR")
+            :type ordre_des_canaux: str
+
+            :param niveaux_d_encodage: niveau d'encodage de chaque extension (None : réglages par défaut d'OpenCV)
+            :type niveaux_d_encodage: None | dict[str, int]
+
+            :param format_d_archive: format de l'archive ("tar" ou "zip")
+            :type format_d_archive: str
+
+            :raise ValueError: si le format d'archive est inconnu
+        """
+
+        if format_d_archive not in ("tar", "zip"):
+
+            raise ValueError("Format d'archive inconnu : {}".format(format_d_archive))
+
+        # Attributs d'instance initialisés via les paramètres du constructeur
+        self.__ordre_des_canaux = ordre_des_canaux
+        self.__niveaux_d_encodage = niveaux_d_encodage or {}
+        self.__format_d_archive = format_d_archive
+
+        # Autres attributs d'instance
+        os.makedirs(dossier_de_sauvegarde, exist_ok = True)
+        self.__nom_absolu_de_l_archive = os.path.join(dossier_de_sauvegarde, "{}.{}".format(nom_de_base, format_d_archive))
+        nom_temporaire = self.__nom_absolu_de_l_archive + SUFFIXE_DES_FICHIERS_EN_COURS
+
+        if format_d_archive == "tar":
+
+            import tarfile
+            self.__archive = tarfile.open(nom_temporaire, "w")
+
+        else:
+
+            import zipfile
+            self.__archive = zipfile.ZipFile(nom_temporaire, "w", zipfile.ZIP_STORED)
+
+        self.__verrou = threading.Lock()
+
+    # =============================================
+    def ajout(self, nom_du_fichier, donnees_image):
+        """
+            Méthode qui permet d'encoder une sous-image et de l'ajouter à l'archive
+
+            :param nom_du_fichier: nom de la sous-image dans l'archive (son extension détermine le format)
+            :type nom_du_fichier: str
+
+            :param donnees_image: données de la sous-image
+            :type donnees_image: numpy.ndarray
+
+            :raise IOError: si la sous-image ne peut pas être encodée
+        """
+
+        import cv2
+
+        donnees_image, parametres = preparation_de_l_encodage(nom_du_fichier, donnees_image, self.__ordre_des_canaux, self.__niveaux_d_encodage)
+        reussite, contenu = cv2.imencode(os.path.splitext(nom_du_fichier)[1], donnees_image, parametres)
+
+        if not reussite:
+
+            raise IOError("Encodage impossible : {}".format(nom_du_fichier))
+
+        contenu = contenu.tobytes()
+
+        with self.__verrou:
+
+            if self.__format_d_archive == "tar":
+
+                import tarfile
+                entree = tarfile.TarInfo(nom_du_fichier)
+                entree.size = len(contenu)
+                entree.mtime = int(time.time())
+                self.__archive.addfile(entree, io.BytesIO(contenu))
+
+            else:
+
+                import zipfile
+                self.__archive.writestr(zipfile.ZipInfo(nom_du_fichier, time.localtime()[:6]), contenu)
+
+    # ===================================
+    def fermeture(self, reussite = True):
+        """
+            Méthode qui permet de fermer l'archive et de lui donner son nom définitif
+
+            :param reussite: si False, l'écriture est abandonnée et l'archive incomplète est supprimée
+            :type reussite: bool
+
+            :return: le nom absolu de l'archive (aucun si l'écriture est abandonnée)
+            :rtype: list[str]
+        """
+
+        self.__archive.close()
+        nom_temporaire = self.__nom_absolu_de_l_archive + SUFFIXE_DES_FICHIERS_EN_COURS
+
+        if not reussite:
+
+            os.remove(nom_temporaire)
+
+            return []
+
+        os.replace(nom_temporaire, self.__nom_absolu_de_l_archive)
+
+        return [self.__nom_absolu_de_l_archive]
+
+
+# ================================
+class DestinationTableaux(object):
+    """
+        Classe de destination des sous-images d'une image : un fichier npz par image traitée, contenant un tableau (RGB, non encodé) par sous-image
+        Chaque tableau est nommé d'après le fichier de la sous-image, sans extension
+
+        Comme pour une archive, chaque tableau est écrit à la suite du fichier npz (archive zip sans compression) dès son ajout :
+        aucune sous-image n'est conservée en mémoire jusqu'à la fermeture. Le fichier est écrit sous un nom temporaire, renommé à la fermeture.
+
+        :ivar __nom_absolu_du_fichier: nom absolu du fichier npz
+        :type __nom_absolu_du_fichier: str
+
+        :ivar __ordre_des_canaux: ordre des canaux des données des sous-images ("RGB" ou "BGR")
+        :type __ordre_des_canaux: str
+
+        :ivar __archive: fichier npz ouvert en écriture
+        :type __archive: zipfile.ZipFile
+
+        :ivar __verrou: verrou protégeant l'écriture dans le fichier npz
+        :type __verrou: threading.Lock
+    """
+
+    # ==========================================================================================================
+    def __init__(self, dossier_de_sauvegarde, nom_de_base, ordre_des_canaux = "RGB", niveaux_d_encodage = None):
+        """
+            Constructeur de la classe
+
+            :param dossier_de_sauvegarde: dossier de sauvegarde du fichier npz (créé s'il n'existe pas)
+            :type dossier_de_sauvegarde: str
+
+            :param nom_de_base: nom de l'image traitée, sans extension (nom du fichier npz)
+            :type nom_de_base: str
+
+            :param ordre_des_canaux: ordre des canaux des données des sous-images ("RGB" ou "BGR")
+            :type ordre_des_canaux: str
+
+            :param niveaux_d_encodage: inutilisé (les sous-images ne sont pas encodées)
+            :type niveaux_d_encodage: None | dict[str, int]
+        """
+
+        import zipfile
+
+        os.makedirs(dossier_de_sauvegarde, exist_ok = True)
+
+        # Attributs d'instance initialisés via les paramètres du constructeur
+        self.__nom_absolu_du_fichier = os.path.join(dossier_de_sauvegarde, "{}.npz".format(nom_de_base))
+        self.__ordre_des_canaux = ordre_des_canaux
+
+        # Autres attributs d'instance
+        self.__archive = zipfile.ZipFile(self.__nom_absolu_du_fichier + SUFFIXE_DES_FICHIERS_EN_COURS, "w", zipfile.ZIP_STORED, allowZip64 = True)
+        self.__verrou = threading.Lock()
+
+    # =============================================
+    def ajout(self, nom_du_fichier, donnees_image):
+        """
+            Méthode qui permet d'écrire le tableau d'une sous-image à la suite du fichier npz
+
+            :param nom_du_fichier: nom du fichier de la sous-image (le tableau est nommé sans l'extension)
+            :type nom_du_fichier: str
+
+            :param donnees_image: données de la sous-image
+            :type donnees_image: numpy.ndarray
+        """
+
+        # conversion en RGB (contiguë) avant la prise du verrou, pour ne pas bloquer les autres fils d'exécution
+        if self.__ordre_des_canaux == "BGR":
+
+            donnees_image = numpy.ascontiguousarray(donnees_image[..., ::-1])
+
+        with self.__verrou:
+
+            with self.__archive.open(os.path.splitext(nom_du_fichier)[0] + ".npy", "w", force_zip64 = True) as entree:
+
+                numpy.lib.format.write_array(entree, donnees_image, allow_pickle = False)
+
+    # ===================================
+    def fermeture(self, reussite = True):
+        """
+            Méthode qui permet de fermer le fichier npz et de lui donner son nom définitif
+
+            :param reussite: si False, l'écriture est abandonnée et le fichier npz incomplet est supprimé
+            :type reussite: bool
+
+            :return: le nom absolu du fichier npz (aucun si l'écriture est abandonnée)
+            :rtype: list[str]
+        """
+
+        self.__archive.close()
+        nom_temporaire = self.__nom_absolu_du_fichier + SUFFIXE_DES_FICHIERS_EN_COURS
+
+        if not reussite:
+
+            os.remove(nom_temporaire)
+
+            return []
+
+        os.replace(nom_temporaire, self.__nom_absolu_du_fichier)
+
+        return [self.__nom_absolu_du_fichier]
+
+
+# Destinations de sauvegarde disponibles, indexées par leur nom
+DESTINATIONS_DE_SAUVEGARDE = {"fichiers": DestinationFichiers,
+                              "tar": functools.partial(DestinationArchive, format_d_archive = "tar"),
+                              "zip": functools.partial(DestinationArchive, format_d_archive = "zip"),
+                              "npz": DestinationTableaux}
+
+# ==================================================================================================
+# FONCTIONS
+# ==================================================================================================
+
+
+# =================================================================================================
+def preparation_de_l_encodage(nom_du_fichier, donnees_image, ordre_des_canaux, niveaux_d_encodage):
+    """
+        Fonction qui permet de préparer l'encodage d'une sous-image par OpenCV : conversion des données en BGR si nécessaire
+        et paramètres d'encodage correspondant à l'extension du fichier
+
+        :param nom_du_fichier: nom du fichier de la sous-image
+        :type nom_du_fichier: str
+
+        :param donnees_image: données de la sous-image
+        :type donnees_image: numpy.ndarray
+
+        :param ordre_des_canaux: ordre des canaux des données de la sous-image (cf. CONVERSIONS_AVANT_L_ECRITURE)
+        :type ordre_des_canaux: str
+
+        :param niveaux_d_encodage: niveau d'encodage de chaque extension (cf. PARAMETRES_D_ENCODAGE)
+        :type niveaux_d_encodage: dict[str, int]
+
+        :return: les données à encoder (BGR) et les paramètres d'encodage
+        :rtype: (numpy.ndarray, list[int])
+    """
+
+    import cv2
+
+    conversion = CONVERSIONS_AVANT_L_ECRITURE[ordre_des_canaux]
+
+    if conversion is not None:
+
+        donnees_image = cv2.cvtColor(donnees_image, getattr(cv2, conversion))
+
+    extension = os.path.splitext(nom_du_fichier)[1].lstrip(".").lower()
+    parametres = []
+
+    if extension in niveaux_d_encodage and extension in PARAMETRES_D_ENCODAGE:
+
+        parametres = [getattr(cv2, PARAMETRES_D_ENCODAGE[extension]), int(niveaux_d_encodage[extension])]
+
+    return donnees_image, parametres
+
+# ==================================================================================================
+# UTILISATION
+# ==================================================================================================
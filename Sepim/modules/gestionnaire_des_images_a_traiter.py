@@ -20,9 +20,15 @@ __status = 'dev'
 # ==================================================================================================
 
 from Sepim.modules.gestionnaire_d_image import GestionnaireDImage
+from Sepim.modules.gestionnaire_pipeline_de_traitement import PipelineDeTraitement, creation_du_resume
+from Sepim.modules.gestionnaire_d_ecriture_des_images import EcrivainDesImages, NOMBRE_DE_FILS_D_ECRITURE_PAR_DEFAUT, LIMITE_D_OCTETS_EN_COURS_PAR_DEFAUT
+from Sepim.modules.gestionnaire_d_instrumentation import creation_du_rapport, cumul_des_resultats, ecriture_des_rapports, TAILLE_DE_L_HISTORIQUE_DES_RAPPORTS
+from Sepim.modules.gestionnaire_du_cache_des_resultats import CacheDesResultats, TAILLE_MAXIMALE_DU_CACHE_PAR_DEFAUT
 import os
 import glob
+import time
 import numpy
+from concurrent.futures import ProcessPoolExecutor
 
 # ==================================================================================================
 # INITIALISATIONS
@@ -44,7 +50,7 @@ class GestionnaireDesImagesATraiter(object):
         :ivar __dico_des_images_a_traiter: un dictionnaire contenant les images à traiter
         :type __dico_des_images_a_traiter: dict[GestionnaireDImage]
 
-        :ivar __dossier_contenant_les_images: emplacement des images à charger
+        :ivar __dossier_contenant_les_images: chemin absolu des images à charger
         :type __dossier_contenant_les_images: str
 
         :ivar __extensions_prises_en_charge: liste des extensions prises en charge
@@ -52,20 +58,203 @@ class GestionnaireDesImagesATraiter(object):
 
         :ivar __couleur_de_separation: couleur de séparation entre les sous-images d'une image
         :type __couleur_de_separation: numpy.ndarray
+
+        :ivar __moteur_d_extraction: nom du moteur d'extraction des sous-images
+        :type __moteur_d_extraction: str
+
+        :ivar __mode_d_estimation_de_l_angle: mode d'estimation de l'angle de rotation des sous-images
+        :type __mode_d_estimation_de_l_angle: str
+
+        :ivar __preset_de_rotation: préréglage de rotation des sous-images
+        :type __preset_de_rotation: str
+
+        :ivar __nombre_de_processus: nombre de processus utilisés pour traiter les images (1 : traitement dans le processus courant)
+        :type __nombre_de_processus: int
+
+        :ivar __parallelisme_des_etapes: nombre de fils d'exécution de chaque étape du traitement en flux (None : pas de traitement en flux)
+        :type __parallelisme_des_etapes: None | dict[str, int]
+
+        :ivar __taille_des_files: taille maximale des files reliant les étapes du traitement en flux
+        :type __taille_des_files: int
+
+        :ivar __nombre_de_fils_d_ecriture: nombre de fils d'exécution d'écriture des sous-images
+        :type __nombre_de_fils_d_ecriture: int
+
+        :ivar __limite_d_octets_en_ecriture: nombre maximal d'octets de sous-images en attente d'écriture
+        :type __limite_d_octets_en_ecriture: int
+
+        :ivar __hauteur_des_bandes: hauteur des bandes du mode grande image (None : images chargées entièrement en mémoire)
+        :type __hauteur_des_bandes: None | int
+
+        :ivar __dossier_de_sauvegarde: dossier de sauvegarde des sous-images (None : sous-dossier "Sauvegarde" du dossier des images)
+        :type __dossier_de_sauvegarde: None | str
+
+        :ivar __format_de_sauvegarde: extension des fichiers des sous-images (None : extension de chaque image à traiter)
+        :type __format_de_sauvegarde: None | str
+
+        :ivar __instrumentation: si True, chaque étape du traitement de chaque image est mesurée
+        :type __instrumentation: bool
+
+        :ivar __rapport_json: nom du fichier du rapport JSON du traitement (None : pas de rapport JSON)
+        :type __rapport_json: None | str
+
+        :ivar __rapport_openmetrics: nom du fichier du rapport OpenMetrics du traitement (None : pas de rapport OpenMetrics)
+        :type __rapport_openmetrics: None | str
+
+        :ivar __ordre_des_canaux: ordre des canaux des données des images ("RGB" ou "BGR")
+        :type __ordre_des_canaux: str
+
+        :ivar __destination_de_sauvegarde: nom de la destination des sous-images ("fichiers", "tar", "zip" ou "npz")
+        :type __destination_de_sauvegarde: str
+
+        :ivar __niveaux_d_encodage: niveau d'encodage de chaque extension (None : réglages par défaut d'OpenCV)
+        :type __niveaux_d_encodage: None | dict[str, int]
+
+        :ivar __decodage_des_palettes: si True, les images à palette sont chargées sous la forme de leur plan d'indices
+        :type __decodage_des_palettes: bool
+
+        :ivar __cache: cache des résultats du traitement des images (None : toutes les images sont traitées)
+        :type __cache: None | CacheDesResultats
+
+        :ivar __resultats_du_traitement: résumé du traitement de chaque image du dernier lancement (cf. lancement_du_traitement_des_images)
+        :type __resultats_du_traitement: list[dict]
+
+        :ivar __rapport_du_traitement: rapport cumulé de tous les lots traités (compteurs et mesures par étape, résumés des dernières images seulement,
+        cf. Sepim.modules.gestionnaire_d_instrumentation.cumul_des_resultats) : sa taille ne croît pas avec le nombre de lots du mode démon
+        :type __rapport_du_traitement: dict
+
+        :ivar __taille_de_l_historique_des_rapports: nombre maximal de résumés d'images conservés dans le rapport du traitement (les plus récents)
+        :type __taille_de_l_historique_des_rapports: int
+
+        :ivar __ecrivain: écrivain des sous-images, partagé entre les images (None en dehors d'un traitement, cf. ouverture_des_ressources)
+        :type __ecrivain: None | EcrivainDesImages
+
+        :ivar __executeur: ensemble de processus de traitement (None en dehors d'un traitement ou si les images sont traitées dans le processus courant)
+        :type __executeur: None | concurrent.futures.ProcessPoolExecutor
     """
 
-    # =================
-    def __init__(self):
+    # ===========================================================================================================================================
+    def __init__(self, moteur_d_extraction = "historique", mode_d_estimation_de_l_angle = "rectangle_minimal", preset_de_rotation = "bilineaire",
+                 nombre_de_processus = 1, parallelisme_des_etapes = None, taille_des_files = 2,
+                 nombre_de_fils_d_ecriture = NOMBRE_DE_FILS_D_ECRITURE_PAR_DEFAUT, limite_d_octets_en_ecriture = LIMITE_D_OCTETS_EN_COURS_PAR_DEFAUT,
+                 hauteur_des_bandes = None, dossier_contenant_les_images = "../Donnees", extensions_prises_en_charge = ("*.png", ),
+                 couleur_de_separation = None, dossier_de_sauvegarde = None, format_de_sauvegarde = None, instrumentation = False,
+                 rapport_json = None, rapport_openmetrics = None, dossier_du_cache = None, taille_maximale_du_cache = TAILLE_MAXIMALE_DU_CACHE_PAR_DEFAUT,
+                 ordre_des_canaux = "RGB", destination_de_sauvegarde = "fichiers", niveaux_d_encodage = None, decodage_des_palettes = False,
+                 taille_de_l_historique_des_rapports = TAILLE_DE_L_HISTORIQUE_DES_RAPPORTS):
         """
             Constructeur de la classe
+
+            :param moteur_d_extraction: nom du moteur d'extraction des sous-images ("historique", "decoupe_xy", "composantes_connexes" ou "bandes")
+            :type moteur_d_extraction: str
+
+            :param mode_d_estimation_de_l_angle: mode d'estimation de l'angle de rotation des sous-images ("rectangle_minimal", "bords" ou "hough")
+            :type mode_d_estimation_de_l_angle: str
+
+            :param preset_de_rotation: préréglage de rotation des sous-images ("plus_proche_voisin", "bilineaire", "bicubique" ou "qualite" ;
+            "qualite" ne tourne les sous-images comme le traitement historique qu'avec le mode d'estimation de l'angle "hough")
+            :type preset_de_rotation: str
+
+            :param nombre_de_processus: nombre de processus utilisés pour traiter les images (1 : traitement dans le processus courant)
+            :type nombre_de_processus: int
+
+            :param parallelisme_des_etapes: nombre de fils d'exécution de chaque étape ("chargement", "extraction", "rotation", "sauvegarde") :
+            si ce paramètre est renseigné, les images sont traitées en flux (cf. PipelineDeTraitement)
+            :type parallelisme_des_etapes: None | dict[str, int]
+
+            :param taille_des_files: taille maximale des files reliant les étapes du traitement en flux
+            :type taille_des_files: int
+
+            :param nombre_de_fils_d_ecriture: nombre de fils d'exécution d'écriture des sous-images
+            :type nombre_de_fils_d_ecriture: int
+
+            :param limite_d_octets_en_ecriture: nombre maximal d'octets de sous-images en attente d'écriture
+            :type limite_d_octets_en_ecriture: int
+
+            :param hauteur_des_bandes: si ce paramètre est renseigné (mode grande image), chaque image est convertie dans une mémoire projetée
+            et ses sous-images sont extraites par bandes horizontales de cette hauteur (en pixels)
+            :type hauteur_des_bandes: None | int
+
+            :param dossier_contenant_les_images: emplacement des images à charger
+            :type dossier_contenant_les_images: str
+
+            :param extensions_prises_en_charge: motifs des fichiers à traiter (par exemple "*.png")
+            :type extensions_prises_en_charge: tuple(str)
+
+            :param couleur_de_separation: couleur (RGB) de séparation entre les sous-images d'une image (None : [181, 230, 29])
+            :type couleur_de_separation: None | numpy.ndarray
+
+            :param dossier_de_sauvegarde: dossier de sauvegarde des sous-images (None : sous-dossier "Sauvegarde" du dossier des images)
+            :type dossier_de_sauvegarde: None | str
+
+            :param format_de_sauvegarde: extension des fichiers des sous-images (None : extension de chaque image à traiter)
+            :type format_de_sauvegarde: None | str
+
+            :param instrumentation: si True, chaque étape du traitement de chaque image est mesurée (activée d'office si un rapport est demandé)
+            :type instrumentation: bool
+
+            :param rapport_json: nom du fichier du rapport JSON du traitement (None : pas de rapport JSON)
+            :type rapport_json: None | str
+
+            :param rapport_openmetrics: nom du fichier du rapport OpenMetrics du traitement (None : pas de rapport OpenMetrics)
+            :type rapport_openmetrics: None | str
+
+            :param dossier_du_cache: dossier du cache des résultats : une image inchangée, traitée avec les mêmes paramètres
+            et dont les sous-images sauvegardées sont toujours présentes, n'est pas traitée à nouveau (None : pas de cache)
+            :type dossier_du_cache: None | str
+
+            :param taille_maximale_du_cache: taille maximale (en octets) du cache des résultats
+            :type taille_maximale_du_cache: int
+
+            :param ordre_des_canaux: ordre des canaux des données des images ("RGB" ou "BGR" : ordre natif d'OpenCV, sans conversion des couleurs)
+            :type ordre_des_canaux: str
+
+            :param destination_de_sauvegarde: destination des sous-images : "fichiers" (un fichier par sous-image), "tar" ou "zip"
+            (une archive par image) ou "npz" (un tableau non encodé par sous-image, dans un fichier par image)
+            :type destination_de_sauvegarde: str
+
+            :param niveaux_d_encodage: niveau d'encodage de chaque extension, par exemple {"png": 1, "jpg": 90, "webp": 80}
+            (None : réglages par défaut d'OpenCV)
+            :type niveaux_d_encodage: None | dict[str, int]
+
+            :param decodage_des_palettes: si True, les images à palette (PNG indexés) sont chargées sous la forme de leur plan d'indices
+            et seules les sous-images sont converties en couleurs (nécessite Pillow)
+            :type decodage_des_palettes: bool
+
+            :param taille_de_l_historique_des_rapports: nombre maximal de résumés d'images conservés dans le rapport du traitement (les plus récents)
+            :type taille_de_l_historique_des_rapports: int
         """
 
         self.__liste_des_images_a_traiter = []
         self.__dico_des_images_a_traiter = {}
-        self.__dossier_contenant_les_images = "../Donnees"
-        self.__extensions_prises_en_charge = ("*.png", )
-        self.__couleur_de_separation = numpy.array([181, 230, 29])
+        self.__dossier_contenant_les_images = os.path.abspath(dossier_contenant_les_images)
+        self.__extensions_prises_en_charge = tuple(extensions_prises_en_charge)
+        self.__couleur_de_separation = numpy.array([181, 230, 29] if couleur_de_separation is None else couleur_de_separation)
         # envisager un séparateur magenta plutôt que vert ?
+        self.__moteur_d_extraction = moteur_d_extraction
+        self.__mode_d_estimation_de_l_angle = mode_d_estimation_de_l_angle
+        self.__preset_de_rotation = preset_de_rotation
+        self.__nombre_de_processus = nombre_de_processus
+        self.__parallelisme_des_etapes = parallelisme_des_etapes
+        self.__taille_des_files = taille_des_files
+        self.__nombre_de_fils_d_ecriture = nombre_de_fils_d_ecriture
+        self.__limite_d_octets_en_ecriture = limite_d_octets_en_ecriture
+        self.__hauteur_des_bandes = hauteur_des_bandes
+        self.__dossier_de_sauvegarde = dossier_de_sauvegarde
+        self.__format_de_sauvegarde = format_de_sauvegarde
+        self.__instrumentation = instrumentation or rapport_json is not None or rapport_openmetrics is not None
+        self.__rapport_json = rapport_json
+        self.__rapport_openmetrics = rapport_openmetrics
+        self.__ordre_des_canaux = ordre_des_canaux
+        self.__destination_de_sauvegarde = destination_de_sauvegarde
+        self.__niveaux_d_encodage = niveaux_d_encodage
+        self.__decodage_des_palettes = decodage_des_palettes
+        self.__cache = None if dossier_du_cache is None else CacheDesResultats(dossier_du_cache, taille_maximale_du_cache)
+        self.__resultats_du_traitement = []
+        self.__taille_de_l_historique_des_rapports = taille_de_l_historique_des_rapports
+        self.__rapport_du_traitement = creation_du_rapport([], taille_de_l_historique_des_rapports)
+        self.__ecrivain = None
+        self.__executeur = None
 
     # ======================================
     def get_dico_des_images_a_traiter(self):
@@ -78,35 +267,187 @@ class GestionnaireDesImagesATraiter(object):
 
         return self.__dico_des_images_a_traiter
 
+    # ====================================
+    def get_resultats_du_traitement(self):
+        """
+            Accesseur de l'attribut __resultats_du_traitement
+
+            :return: le résumé du traitement de chaque image
+            :rtype: list[dict]
+        """
+
+        return self.__resultats_du_traitement
+
+    # ==================================
+    def get_rapport_du_traitement(self):
+        """
+            Accesseur de l'attribut __rapport_du_traitement
+
+            :return: __rapport_du_traitement
+            :rtype: dict
+        """
+
+        return self.__rapport_du_traitement
+
+    # =========================================
+    def get_dossier_contenant_les_images(self):
+        """
+            Accesseur de l'attribut __dossier_contenant_les_images
+
+            :return: __dossier_contenant_les_images
+            :rtype: str
+        """
+
+        return self.__dossier_contenant_les_images
+
+    # ==================================
+    def get_dossier_de_sauvegarde(self):
+        """
+            Accesseur de l'attribut __dossier_de_sauvegarde
+
+            :return: __dossier_de_sauvegarde (None : sous-dossier "Sauvegarde" du dossier des images)
+            :rtype: None | str
+        """
+
+        return self.__dossier_de_sauvegarde
+
+    # ========================================
+    def get_extensions_prises_en_charge(self):
+        """
+            Accesseur de l'attribut __extensions_prises_en_charge
+
+            :return: __extensions_prises_en_charge
+            :rtype: tuple(str)
+        """
+
+        return self.__extensions_prises_en_charge
+
     # ===========================================
     def lancement_du_traitement_des_images(self):
         """
             Méthode qui lance le traitement des images à traiter
+            Chaque image est traitée indépendamment : l'échec du traitement d'une image est consigné dans son résumé et n'interrompt pas le traitement des autres
+
+            :return: le résumé du traitement de chaque image
+            :rtype: list[dict]
         """
 
+        self.__resultats_du_traitement = []
+        self.__rapport_du_traitement = creation_du_rapport([], self.__taille_de_l_historique_des_rapports)
+
         # Listage des images à traiter
         self.listage_des_images_a_traiter()
 
         # Création des gestionnaires d'images
         self.creation_des_gestionnaires_d_images()
 
-        # Itération sur les images à traiter
-        for nom_image_a_traiter, gestionnaire_de_l_image_a_traiter in self.__dico_des_images_a_traiter.items():
+        # Traitement des images
+        self.ouverture_des_ressources()
+
+        try:
+
+            self.__resultats_du_traitement = self.traitement_des_gestionnaires(list(self.__dico_des_images_a_traiter.values()))
+
+        finally:
+
+            self.fermeture_des_ressources()
+
+        # Écriture des rapports du traitement
+        self.ecriture_des_rapports()
+
+        return self.__resultats_du_traitement
+
+    # =================================
+    def ouverture_des_ressources(self):
+        """
+            Méthode qui permet de créer les ressources partagées entre les images : l'écrivain des sous-images et, si nécessaire, l'ensemble de processus
+            Les ressources restent ouvertes jusqu'à l'appel de fermeture_des_ressources : plusieurs lots d'images peuvent les réutiliser
+        """
+
+        # Création de l'écrivain des sous-images, partagé entre les images
+        if self.__ecrivain is None:
+
+            self.__ecrivain = EcrivainDesImages(self.__nombre_de_fils_d_ecriture, self.__limite_d_octets_en_ecriture)
 
-            # Chargement de l'image
-            gestionnaire_de_l_image_a_traiter.chargement_de_l_image_a_traiter()
+        # Création de l'ensemble de processus (les processus sont créés à la première soumission, puis conservés)
+        if self.__executeur is None and self.__parallelisme_des_etapes is None and self.__nombre_de_processus > 1:
 
-            # Calcul des dimensions de l'image chargée
-            gestionnaire_de_l_image_a_traiter.calcul_dimensions_image_chargee()
+            self.__executeur = ProcessPoolExecutor(max_workers = self.__nombre_de_processus)
 
-            # Extractions des sous-images
-            gestionnaire_de_l_image_a_traiter.extraction_des_sous_images()
+    # =================================
+    def fermeture_des_ressources(self):
+        """
+            Méthode qui permet de fermer les ressources partagées entre les images, après la fin de toutes les écritures
+        """
+
+        if self.__executeur is not None:
+
+            self.__executeur.shutdown()
+            self.__executeur = None
+
+        if self.__ecrivain is not None:
 
-            # Rotation des sous-images
-            gestionnaire_de_l_image_a_traiter.rotation_des_sous_images()
+            self.__ecrivain.fermeture()
+            self.__ecrivain = None
+
+    # ==============================================================
+    def traitement_des_gestionnaires(self, liste_des_gestionnaires):
+        """
+            Méthode qui permet de traiter un lot d'images avec les ressources ouvertes (cf. ouverture_des_ressources)
+            Le résumé du traitement de chaque image est cumulé dans le rapport du traitement (cf. ecriture_des_rapports)
+
+            :param liste_des_gestionnaires: gestionnaires des images à traiter
+            :type liste_des_gestionnaires: list[GestionnaireDImage]
+
+            :return: le résumé du traitement de chaque image du lot
+            :rtype: list[dict]
+        """
 
-            # Sauvegarde des images
-            gestionnaire_de_l_image_a_traiter.sauvegarde_des_sous_images()
+        # Traitement en flux : étapes reliées par des files bornées
+        if self.__parallelisme_des_etapes is not None:
+
+            pipeline = PipelineDeTraitement(self.__parallelisme_des_etapes, self.__taille_des_files, self.__ecrivain, self.__cache)
+            resultats = pipeline.execution(liste_des_gestionnaires)
+
+        # Traitement dans le processus courant
+        elif self.__executeur is None:
+
+            resultats = [traitement_d_une_image(gestionnaire_de_l_image_a_traiter, self.__ecrivain, self.__cache)
+                         for gestionnaire_de_l_image_a_traiter in liste_des_gestionnaires]
+
+        # Traitement par un ensemble de processus : chaque processus traite une image complète et ne renvoie que son résumé
+        # (l'écrivain et le cache transmis à chaque processus n'en conservent que la configuration)
+        else:
+
+            resultats = []
+            taches = [(gestionnaire_de_l_image_a_traiter.get_nom_de_l_image_a_traiter(),
+                       self.__executeur.submit(traitement_d_une_image, gestionnaire_de_l_image_a_traiter, self.__ecrivain, self.__cache))
+                      for gestionnaire_de_l_image_a_traiter in liste_des_gestionnaires]
+
+            for nom_image_a_traiter, tache in taches:
+
+                # l'arrêt brutal d'un processus est consigné comme un échec de l'image concernée
+                try:
+
+                    resultats.append(tache.result())
+
+                except Exception as exception:
+
+                    resultats.append(creation_du_resume(nom_image_a_traiter, erreur = exception))
+
+        cumul_des_resultats(self.__rapport_du_traitement, resultats, self.__taille_de_l_historique_des_rapports)
+
+        return resultats
+
+    # ==============================
+    def ecriture_des_rapports(self):
+        """
+            Méthode qui permet d'écrire les rapports demandés (JSON, OpenMetrics) à partir du rapport cumulé du traitement
+        """
+
+        if self.__rapport_json is not None or self.__rapport_openmetrics is not None:
+
+            ecriture_des_rapports(self.__rapport_du_traitement, self.__rapport_json, self.__rapport_openmetrics)
 
     # =====================================
     def listage_des_images_a_traiter(self):
@@ -114,28 +455,20 @@ class GestionnaireDesImagesATraiter(object):
             Méthode qui permet de lister les images à traiter
             Cette méthode va parcourir le dossier indiqué via l'attribut "__dossier_contenant_les_images"
             et va récupérer les noms de tous les fichiers dont l'extension ficgure dans l'attribut "__extensions_prises_en_charge"
-        """
-
-        # Récupération du dossier courant
-        dossier_avant_deplacement = os.getcwd()
+            Le dossier est parcouru via son chemin absolu, sans changer le dossier courant du processus
 
-        # Déplacement dans le dossier qui contient les images à traiter
-        try:
-
-            os.chdir(self.__dossier_contenant_les_images)
+            :raise FileNotFoundError: si le dossier contenant les images n'existe pas
+        """
 
-        except Exception:
+        if not os.path.isdir(self.__dossier_contenant_les_images):
 
-            pass
-            # gérer l'exception si le dossier n'existe pas
+            raise FileNotFoundError("Dossier introuvable : {}".format(self.__dossier_contenant_les_images))
 
         # Récupération de la liste des images à traiter selon les extensions spécifiées via l'attribut "__extensions_prises_en_charge"
         for extension in self.__extensions_prises_en_charge:
 
-            self.__liste_des_images_a_traiter.extend(glob.glob(extension))
-
-        # Retour dans le dossier courant
-        os.chdir(dossier_avant_deplacement)
+            motif = os.path.join(glob.escape(self.__dossier_contenant_les_images), extension)
+            self.__liste_des_images_a_traiter.extend(os.path.basename(nom) for nom in glob.glob(motif))
 
     # ============================================
     def creation_des_gestionnaires_d_images(self):
@@ -145,12 +478,114 @@ class GestionnaireDesImagesATraiter(object):
 
         for image_a_traier in self.__liste_des_images_a_traiter:
 
-            self.__dico_des_images_a_traiter[image_a_traier] = GestionnaireDImage(image_a_traier, self.__dossier_contenant_les_images, self.__couleur_de_separation)
+            self.__dico_des_images_a_traiter[image_a_traier] = self.creation_d_un_gestionnaire_d_image(image_a_traier)
+
+    # =====================================================================
+    def creation_d_un_gestionnaire_d_image(self, nom_de_l_image_a_traiter):
+        """
+            Méthode qui permet de créer le gestionnaire d'une image à traiter, avec les paramètres du traitement
+
+            :param nom_de_l_image_a_traiter: nom de l'image à traiter (dans le dossier contenant les images)
+            :type nom_de_l_image_a_traiter: str
+
+            :return: le gestionnaire de l'image
+            :rtype: GestionnaireDImage
+        """
+
+        return GestionnaireDImage(nom_de_l_image_a_traiter,
+                                  self.__dossier_contenant_les_images,
+                                  self.__couleur_de_separation,
+                                  self.__moteur_d_extraction,
+                                  self.__mode_d_estimation_de_l_angle,
+                                  self.__preset_de_rotation,
+                                  self.__hauteur_des_bandes,
+                                  self.__dossier_de_sauvegarde,
+                                  self.__format_de_sauvegarde,
+                                  self.__instrumentation,
+                                  self.__ordre_des_canaux,
+                                  self.__destination_de_sauvegarde,
+                                  self.__niveaux_d_encodage,
+                                  self.__decodage_des_palettes)
 
 # ==================================================================================================
 # FONCTIONS
 # ==================================================================================================
 
+
+# ===========================================================================================
+def traitement_d_une_image(gestionnaire_de_l_image_a_traiter, ecrivain = None, cache = None):
+    """
+        Fonction qui permet d'enchaîner le chargement, l'extraction, la rotation et la sauvegarde des sous-images d'une image
+        Cette fonction peut être exécutée dans un processus séparé : seul un résumé du traitement est renvoyé
+        Les données de l'image sont libérées à la fin du traitement (cf. GestionnaireDImage.liberation_des_donnees), et l'écrivain est fermé
+        s'il s'agit d'une copie transmise au processus avec la tâche
+
+        :param gestionnaire_de_l_image_a_traiter: gestionnaire de l'image à traiter
+        :type gestionnaire_de_l_image_a_traiter: GestionnaireDImage
+
+        :param ecrivain: écrivain des sous-images (un écrivain temporaire est utilisé s'il n'est pas renseigné)
+        :type ecrivain: None | EcrivainDesImages
+
+        :param cache: cache des résultats : si le résultat de l'image y figure, l'image n'est pas traitée (None : pas de cache)
+        :type cache: None | CacheDesResultats
+
+        :return: le résumé du traitement de l'image (cf. creation_du_resume)
+        :rtype: dict
+    """
+
+    debut = time.perf_counter()
+    angles_de_rotation = []
+
+    try:
+
+        # Recherche du résultat dans le cache
+        if cache is not None:
+
+            cle_du_cache, entree = cache.recherche(gestionnaire_de_l_image_a_traiter)
+
+            if entree is not None:
+
+                return creation_du_resume(gestionnaire_de_l_image_a_traiter.get_nom_de_l_image_a_traiter(), len(entree["angles_de_rotation"]),
+                                          entree["angles_de_rotation"], time.perf_counter() - debut, depuis_le_cache = True)
+
+        # Chargement de l'image
+        gestionnaire_de_l_image_a_traiter.chargement_de_l_image_a_traiter()
+
+        # Extractions des sous-images
+        gestionnaire_de_l_image_a_traiter.extraction_des_sous_images()
+
+        # Rotation des sous-images
+        angles_de_rotation = gestionnaire_de_l_image_a_traiter.rotation_des_sous_images()
+
+        # Sauvegarde des images
+        gestionnaire_de_l_image_a_traiter.sauvegarde_des_sous_images(ecrivain)
+
+        # Enregistrement du résultat dans le cache
+        if cache is not None:
+
+            cache.enregistrement(cle_du_cache, gestionnaire_de_l_image_a_traiter, angles_de_rotation)
+
+    except Exception as exception:
+
+        return creation_du_resume(gestionnaire_de_l_image_a_traiter.get_nom_de_l_image_a_traiter(),
+                                  len(gestionnaire_de_l_image_a_traiter.get_liste_des_sous_images()), angles_de_rotation, time.perf_counter() - debut,
+                                  exception, gestionnaire_de_l_image_a_traiter.get_mesures_des_etapes())
+
+    else:
+
+        return creation_du_resume(gestionnaire_de_l_image_a_traiter.get_nom_de_l_image_a_traiter(),
+                                  len(gestionnaire_de_l_image_a_traiter.get_liste_des_sous_images()), angles_de_rotation, time.perf_counter() - debut,
+                                  etapes = gestionnaire_de_l_image_a_traiter.get_mesures_des_etapes())
+
+    # le résumé est créé avant la libération des données de l'image
+    finally:
+
+        gestionnaire_de_l_image_a_traiter.liberation_des_donnees()
+
+        if ecrivain is not None and ecrivain.get_copie():
+
+            ecrivain.fermeture()
+
 # ==================================================================================================
 # UTILISATION
 # ==================================================================================================
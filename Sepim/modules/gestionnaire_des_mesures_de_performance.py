@@ -0,0 +1,560 @@
+# coding=utf-8
+
+"""
+    Module qui regroupe les mesures de performance de Sepim
+"""
+
+# =================================================================================================
+# PARAMETRES GLOBAUX
+# =================================================================================================
+
+__author__ = 'Julien LEPAIN'
+__email__ = 'julien.lepain.31@gmail.com'
+__version__ = '1.0'
+__maintainer__ = 'Julien LEPAIN'
+__date__ = '16/05/2019'
+__status = 'dev'
+
+# ==================================================================================================
+# IMPORTS
+# ==================================================================================================
+
+from Sepim.modules.gestionnaire_d_image import GestionnaireDImage
+from Sepim.modules.gestionnaire_extraction_des_sous_images import MOTEURS_D_EXTRACTION
+from Sepim.modules.gestionnaire_d_ecriture_des_images import EcrivainDesImages
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+import multiprocessing
+from statistics import median
+from concurrent.futures import ProcessPoolExecutor
+import numpy
+
+# le module resource n'existe pas sous Windows : le pic de mémoire résidente n'y est pas mesuré
+try:
+
+    import resource
+
+except ImportError:
+
+    resource = None
+
+# ==================================================================================================
+# INITIALISATIONS
+# ==================================================================================================
+
+# Dossier racine du dépôt (dossier contenant le paquet Sepim)
+DOSSIER_RACINE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Dépendances lourdes qui ne doivent pas être chargées par le seul import de Sepim.main (chargement différé)
+MODULES_A_CHARGEMENT_DIFFERE = ("matplotlib", "scipy", "cv2")
+
+# Durée maximale (en secondes) de l'import de Sepim.main au-delà de laquelle une régression est signalée
+DUREE_MAXIMALE_D_IMPORT = 0.5
+
+# Couleur de séparation des images fournies et des planches synthétiques
+COULEUR_DE_SEPARATION = numpy.array([181, 230, 29])
+
+# Images fournies mesurées, recherchées dans les dossiers de DOSSIERS_DES_IMAGES_FOURNIES
+# (chaque image est mesurée une seule fois, dans le premier dossier qui la contient : les dossiers en contiennent des copies identiques)
+IMAGES_FOURNIES = ("t1.png", "t2.png", "t3.png", "t3_bordures.png", "t4.png", "test_x9.png", "test_x16.png")
+
+# Dossiers contenant les images fournies
+DOSSIERS_DES_IMAGES_FOURNIES = (os.path.join(DOSSIER_RACINE, "Donnees"), os.path.join(DOSSIER_RACINE, "A_tester"))
+
+# Planches synthétiques générées (à l'échelle 1) : (hauteur, largeur, nombre de lignes de sous-images, nombre de colonnes de sous-images)
+PLANCHES_SYNTHETIQUES = ((1000, 1000, 4, 4),
+                         (2000, 2000, 8, 8),
+                         (4000, 4000, 16, 16))
+
+# Proportion des sous-images des planches synthétiques qui sont tournées
+PROPORTION_DE_SOUS_IMAGES_TOURNEES = 0.25
+
+# Étapes chronométrées du traitement d'une image, dans l'ordre d'exécution
+ETAPES_CHRONOMETREES = ("chargement", "extraction", "rotation", "sauvegarde")
+
+# Dégradation relative (débit ou pic de mémoire) au-delà de laquelle une régression est signalée par rapport à la référence
+TOLERANCE_DE_REGRESSION = 0.15
+
+# ==================================================================================================
+# CLASSES
+# ==================================================================================================
+
+# ==================================================================================================
+# FONCTIONS
+# ==================================================================================================
+
+
+# ===================================================================
+def mesure_du_temps_d_import(module = "Sepim.main", repetitions = 5):
+    """
+        Fonction qui permet de mesurer le temps d'import à froid d'un module, chaque mesure étant faite dans un nouvel interpréteur (python -X importtime)
+
+        :param module: nom du module à importer
+        :type module: str
+
+        :param repetitions: nombre de mesures
+        :type repetitions: int
+
+        :return: la durée médiane (en secondes), les durées de chaque mesure et les dépendances lourdes chargées par l'import
+        :rtype: dict
+    """
+
+    commande = ("import sys, {}; "
+                "print(','.join(nom for nom in {} if nom in sys.modules))").format(module, repr(MODULES_A_CHARGEMENT_DIFFERE))
+
+    environnement = dict(os.environ)
+    environnement["PYTHONPATH"] = os.pathsep.join(filter(None, (DOSSIER_RACINE, environnement.get("PYTHONPATH"))))
+
+    durees = []
+    modules_lourds_charges = []
+
+    for _ in range(max(1, repetitions)):
+
+        resultat = subprocess.run([sys.executable, "-X", "importtime", "-c", commande], cwd = DOSSIER_RACINE, env = environnement,
+                                  stdout = subprocess.PIPE, stderr = subprocess.PIPE, universal_newlines = True, check = True)
+
+        # ligne "import time: propre | cumulé | module" du module importé (durées en microsecondes)
+        for ligne in resultat.stderr.splitlines():
+
+            colonnes = ligne.split("|")
+
+            if len(colonnes) == 3 and colonnes[2].strip() == module:
+
+                durees.append(int(colonnes[1]) / 1e6)
+
+        modules_lourds_charges = [nom for nom in resultat.stdout.strip().split(",") if nom]
+
+    return {"module": module,
+            "duree_mediane": median(durees),
+            "durees": durees,
+            "modules_lourds_charges": modules_lourds_charges}
+
+
+# ============================================================================================
+def verification_du_temps_d_import(duree_maximale = DUREE_MAXIMALE_D_IMPORT, repetitions = 5):
+    """
+        Fonction qui permet de détecter une régression du temps de démarrage : import de Sepim.main trop long,
+        ou chargement d'une dépendance lourde qui devrait être différé
+
+        :param duree_maximale: durée maximale (en secondes) de l'import de Sepim.main
+        :type duree_maximale: float
+
+        :param repetitions: nombre de mesures
+        :type repetitions: int
+
+        :return: la mesure (cf. mesure_du_temps_d_import) et la liste des régressions détectées (vide en l'absence de régression)
+        :rtype: tuple(dict, list[str])
+    """
+
+    mesure = mesure_du_temps_d_import("Sepim.main", repetitions)
+    regressions = []
+
+    if mesure["duree_mediane"] > duree_maximale:
+
+        regressions.append("import de Sepim.main en {:.3f} s (maximum : {:.3f} s)".format(mesure["duree_mediane"], duree_maximale))
+
+    for nom in mesure["modules_lourds_charges"]:
+
+        regressions.append("{} est chargé dès l'import de Sepim.main".format(nom))
+
+    return mesure, regressions
+
+
+# ===========================================================================================================
+def generation_d_une_planche_synthetique(hauteur, largeur, nombre_de_lignes, nombre_de_colonnes, graine = 0):
+    """
+        Fonction qui permet de générer une planche synthétique : une grille de sous-images de couleurs aléatoires sur fond de séparation,
+        dont une partie (cf. PROPORTION_DE_SOUS_IMAGES_TOURNEES) est tournée de quelques degrés
+
+        :param hauteur: hauteur de la planche (en pixels)
+        :type hauteur: int
+
+        :param largeur: largeur de la planche (en pixels)
+        :type largeur: int
+
+        :param nombre_de_lignes: nombre de lignes de sous-images
+        :type nombre_de_lignes: int
+
+        :param nombre_de_colonnes: nombre de colonnes de sous-images
+        :type nombre_de_colonnes: int
+
+        :param graine: graine du générateur aléatoire
+        :type graine: int
+
+        :return: les données de la planche (RGB)
+        :rtype: numpy.ndarray
+    """
+
+    from cv2 import fillConvexPoly, boxPoints
+
+    generateur = numpy.random.default_rng(graine)
+    planche = numpy.empty((hauteur, largeur, 3), dtype = numpy.uint8)
+    planche[...] = COULEUR_DE_SEPARATION
+
+    hauteur_des_cellules = hauteur / float(nombre_de_lignes)
+    largeur_des_cellules = largeur / float(nombre_de_colonnes)
+
+    for ligne in range(nombre_de_lignes):
+
+        for colonne in range(nombre_de_colonnes):
+
+            # couleur de la sous-image (composante rouge bornée : jamais égale à la couleur de séparation)
+            couleur = [int(generateur.integers(0, 150)), int(generateur.integers(0, 256)), int(generateur.integers(0, 256))]
+
+            # sous-image de 70 % de la cellule, centrée, éventuellement tournée (au plus 10 degrés : elle reste dans sa cellule)
+            centre = ((colonne + 0.5) * largeur_des_cellules, (ligne + 0.5) * hauteur_des_cellules)
+            dimensions = (0.7 * largeur_des_cellules, 0.7 * hauteur_des_cellules)
+            angle = float(generateur.uniform(-10.0, 10.0)) if generateur.random() < PROPORTION_DE_SOUS_IMAGES_TOURNEES else 0.0
+
+            if angle == 0.0:
+
+                haut, gauche = int(round(centre[1] - dimensions[1] / 2)), int(round(centre[0] - dimensions[0] / 2))
+                planche[haut:haut + int(dimensions[1]), gauche:gauche + int(dimensions[0])] = couleur
+
+            else:
+
+                fillConvexPoly(planche, numpy.round(boxPoints((centre, dimensions, angle))).astype(numpy.int32), couleur)
+
+    return planche
+
+
+# ===================================================================================
+def creation_des_planches_synthetiques(dossier, facteur_d_echelle = 1.0, graine = 0):
+    """
+        Fonction qui permet de générer les planches synthétiques (cf. PLANCHES_SYNTHETIQUES) et de les enregistrer au format PNG
+
+        :param dossier: dossier dans lequel les planches sont enregistrées
+        :type dossier: str
+
+        :param facteur_d_echelle: facteur appliqué à la résolution des planches (le nombre de sous-images n'est pas modifié)
+        :type facteur_d_echelle: float
+
+        :param graine: graine du générateur aléatoire
+        :type graine: int
+
+        :return: les noms des planches enregistrées
+        :rtype: list[str]
+    """
+
+    from cv2 import imwrite, cvtColor, COLOR_RGB2BGR
+
+    noms_des_planches = []
+
+    for indice, (hauteur, largeur, nombre_de_lignes, nombre_de_colonnes) in enumerate(PLANCHES_SYNTHETIQUES):
+
+        hauteur, largeur = int(hauteur * facteur_d_echelle), int(largeur * facteur_d_echelle)
+        planche = generation_d_une_planche_synthetique(hauteur, largeur, nombre_de_lignes, nombre_de_colonnes, graine + indice)
+
+        nom_de_la_planche = "synthetique_{}x{}_{}.png".format(largeur, hauteur, nombre_de_lignes * nombre_de_colonnes)
+        imwrite(os.path.join(dossier, nom_de_la_planche), cvtColor(planche, COLOR_RGB2BGR))
+        noms_des_planches.append(nom_de_la_planche)
+
+    return noms_des_planches
+
+
+# ================================================================================================================
+def mesure_des_etapes_d_une_image(nom_de_l_image, dossier_de_l_image, moteur_d_extraction, dossier_de_sauvegarde):
+    """
+        Fonction qui permet de chronométrer chacune des étapes du traitement d'une image (cf. ETAPES_CHRONOMETREES)
+
+        :param nom_de_l_image: nom de l'image à traiter
+        :type nom_de_l_image: str
+
+        :param dossier_de_l_image: dossier contenant l'image à traiter
+        :type dossier_de_l_image: str
+
+        :param moteur_d_extraction: nom du moteur d'extraction des sous-images
+        :type moteur_d_extraction: str
+
+        :param dossier_de_sauvegarde: dossier de sauvegarde des sous-images
+        :type dossier_de_sauvegarde: str
+
+        :return: la durée de chaque étape (en secondes), le nombre de pixels de l'image et le nombre de sous-images
+        :rtype: dict
+    """
+
+    gestionnaire = GestionnaireDImage(nom_de_l_image, dossier_de_l_image, COULEUR_DE_SEPARATION, moteur_d_extraction,
+                                      dossier_de_sauvegarde_des_sous_images = dossier_de_sauvegarde)
+    ecrivain = EcrivainDesImages()
+    durees = {}
+
+    debut = time.perf_counter()
+    gestionnaire.chargement_de_l_image_a_traiter()
+    gestionnaire.calcul_dimensions_image_chargee()
+    durees["chargement"] = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    gestionnaire.extraction_des_sous_images()
+    durees["extraction"] = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    gestionnaire.rotation_des_sous_images()
+    durees["rotation"] = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    gestionnaire.sauvegarde_des_sous_images(ecrivain)
+    durees["sauvegarde"] = time.perf_counter() - debut
+
+    ecrivain.fermeture()
+
+    return {"image": nom_de_l_image,
+            "durees": durees,
+            "pixels": int(gestionnaire.get_hauteur_image_chargee()) * int(gestionnaire.get_largeur_image_chargee()),
+            "sous_images": len(gestionnaire.get_liste_des_sous_images())}
+
+
+# ===================================================================
+def mesure_d_un_moteur(moteur_d_extraction, images, repetitions = 1):
+    """
+        Fonction qui permet de mesurer un moteur d'extraction sur un ensemble d'images
+        Cette fonction est destinée à être exécutée dans un processus dédié : le pic de mémoire résidente mesuré est celui du moteur seul
+
+        :param moteur_d_extraction: nom du moteur d'extraction des sous-images
+        :type moteur_d_extraction: str
+
+        :param images: images à traiter, sous la forme (dossier, nom)
+        :type images: list[tuple(str, str)]
+
+        :param repetitions: nombre de mesures de chaque image (la plus rapide est retenue)
+        :type repetitions: int
+
+        :return: la mesure de chaque image (cf. mesure_des_etapes_d_une_image), les totaux, les débits et le pic de mémoire résidente (en Mo)
+        :rtype: dict
+    """
+
+    dossier_de_sauvegarde = tempfile.mkdtemp(prefix = "sepim_mesures_")
+    mesures = []
+
+    try:
+
+        for dossier_de_l_image, nom_de_l_image in images:
+
+            mesures_de_l_image = [mesure_des_etapes_d_une_image(nom_de_l_image, dossier_de_l_image, moteur_d_extraction, dossier_de_sauvegarde)
+                                  for _ in range(max(1, repetitions))]
+            mesures.append(min(mesures_de_l_image, key = lambda mesure: sum(mesure["durees"].values())))
+
+    finally:
+
+        shutil.rmtree(dossier_de_sauvegarde, ignore_errors = True)
+
+    durees_par_etape = {etape: sum(mesure["durees"][etape] for mesure in mesures) for etape in ETAPES_CHRONOMETREES}
+    duree_totale = sum(durees_par_etape.values())
+    pixels = sum(mesure["pixels"] for mesure in mesures)
+    sous_images = sum(mesure["sous_images"] for mesure in mesures)
+
+    # ru_maxrss est exprimé en kilo-octets sous Linux
+    pic_de_memoire = None if resource is None else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+    return {"moteur": moteur_d_extraction,
+            "images": mesures,
+            "durees_par_etape": durees_par_etape,
+            "duree_totale": duree_totale,
+            "pixels_par_seconde": pixels / duree_totale if duree_totale else 0.0,
+            "sous_images_par_seconde": sous_images / duree_totale if duree_totale else 0.0,
+            "pic_de_memoire_residente": pic_de_memoire}
+
+
+# ================================================================================================================
+def lancement_des_mesures(moteurs = None, facteur_d_echelle = 1.0, planches_synthetiques = True, repetitions = 1):
+    """
+        Fonction qui permet de mesurer les moteurs d'extraction sur les images fournies et sur les planches synthétiques
+        Chaque moteur est mesuré dans un nouveau processus
+
+        :param moteurs: noms des moteurs à mesurer (par défaut, le moteur historique et tous les moteurs de MOTEURS_D_EXTRACTION)
+        :type moteurs: None | list[str]
+
+        :param facteur_d_echelle: facteur appliqué à la résolution des planches synthétiques
+        :type facteur_d_echelle: float
+
+        :param planches_synthetiques: si True, les planches synthétiques sont générées et mesurées
+        :type planches_synthetiques: bool
+
+        :param repetitions: nombre de mesures de chaque image (la plus rapide est retenue)
+        :type repetitions: int
+
+        :return: le rapport des mesures : mesure de chaque moteur (cf. mesure_d_un_moteur), indexée par le nom du moteur
+        :rtype: dict[str, dict]
+    """
+
+    if moteurs is None:
+
+        moteurs = ["historique"] + sorted(MOTEURS_D_EXTRACTION)
+
+    images = []
+
+    for nom in IMAGES_FOURNIES:
+
+        dossiers = [dossier for dossier in DOSSIERS_DES_IMAGES_FOURNIES if os.path.isfile(os.path.join(dossier, nom))]
+
+        if dossiers:
+
+            images.append((dossiers[0], nom))
+
+    dossier_des_planches = tempfile.mkdtemp(prefix = "sepim_planches_")
+
+    try:
+
+        if planches_synthetiques:
+
+            images.extend((dossier_des_planches, nom) for nom in creation_des_planches_synthetiques(dossier_des_planches, facteur_d_echelle))
+
+        rapport = {}
+
+        for moteur in moteurs:
+
+            with ProcessPoolExecutor(max_workers = 1, mp_context = multiprocessing.get_context("spawn")) as executeur:
+
+                rapport[moteur] = executeur.submit(mesure_d_un_moteur, moteur, images, repetitions).result()
+
+    finally:
+
+        shutil.rmtree(dossier_des_planches, ignore_errors = True)
+
+    return rapport
+
+
+# =========================================================================================
+def comparaison_avec_la_reference(rapport, reference, tolerance = TOLERANCE_DE_REGRESSION):
+    """
+        Fonction qui permet de comparer un rapport de mesures à un rapport de référence (cf. lancement_des_mesures)
+
+        :param rapport: rapport des mesures
+        :type rapport: dict[str, dict]
+
+        :param reference: rapport de référence
+        :type reference: dict[str, dict]
+
+        :param tolerance: dégradation relative tolérée du débit et du pic de mémoire résidente
+        :type tolerance: float
+
+        :return: la liste des régressions détectées (vide en l'absence de régression)
+        :rtype: list[str]
+    """
+
+    regressions = []
+
+    for moteur, mesure in sorted(rapport.items()):
+
+        if moteur not in reference:
+
+            continue
+
+        mesure_de_reference = reference[moteur]
+
+        for cle in ("pixels_par_seconde", "sous_images_par_seconde"):
+
+            if mesure[cle] < mesure_de_reference[cle] * (1.0 - tolerance):
+
+                regressions.append("{} : {} {:.1f} (référence : {:.1f})".format(moteur, cle, mesure[cle], mesure_de_reference[cle]))
+
+        if mesure["pic_de_memoire_residente"] and mesure_de_reference.get("pic_de_memoire_residente"):
+
+            if mesure["pic_de_memoire_residente"] > mesure_de_reference["pic_de_memoire_residente"] * (1.0 + tolerance):
+
+                regressions.append("{} : pic de mémoire résidente {:.1f} Mo (référence : {:.1f} Mo)".format(moteur, mesure["pic_de_memoire_residente"],
+                                                                                                          mesure_de_reference["pic_de_memoire_residente"]))
+
+    return regressions
+
+
+# ================================
+def affichage_du_rapport(rapport):
+    """
+        Fonction qui permet de mettre en forme un rapport de mesures : une ligne par moteur
+
+        :param rapport: rapport des mesures (cf. lancement_des_mesures)
+        :type rapport: dict[str, dict]
+
+        :return: le rapport mis en forme
+        :rtype: str
+    """
+
+    lignes = []
+
+    for moteur, mesure in sorted(rapport.items()):
+
+        etapes = ", ".join("{} {:.3f} s".format(etape, mesure["durees_par_etape"][etape]) for etape in ETAPES_CHRONOMETREES)
+        memoire = "n/d" if mesure["pic_de_memoire_residente"] is None else "{:.1f} Mo".format(mesure["pic_de_memoire_residente"])
+
+        lignes.append("{} : {:.0f} pixels/s, {:.1f} sous-images/s, pic de mémoire {} ({})".format(moteur, mesure["pixels_par_seconde"],
+                                                                                                 mesure["sous_images_par_seconde"], memoire, etapes))
+
+    return "\n".join(lignes)
+
+
+# ==============================
+def principal(arguments = None):
+    """
+        Fonction principale des mesures de performance : temps d'import de Sepim.main, puis mesure des moteurs d'extraction
+        et comparaison éventuelle avec un rapport de référence
+
+        :param arguments: arguments de la ligne de commande (None : sys.argv)
+        :type arguments: None | list[str]
+
+        :return: le code de sortie (0 en l'absence de régression, 1 sinon)
+        :rtype: int
+    """
+
+    analyseur = argparse.ArgumentParser(description = "Mesures de performance de Sepim")
+    analyseur.add_argument("--moteurs", nargs = "+", choices = ["historique"] + sorted(MOTEURS_D_EXTRACTION), default = None,
+                           help = "moteurs d'extraction mesurés (défaut : tous)")
+    analyseur.add_argument("--echelle", type = float, default = 1.0, help = "facteur d'échelle de la résolution des planches synthétiques")
+    analyseur.add_argument("--sans-planches-synthetiques", action = "store_true", help = "mesure des seules images fournies")
+    analyseur.add_argument("--repetitions", type = int, default = 1, help = "nombre de mesures de chaque image (la plus rapide est retenue)")
+    analyseur.add_argument("--reference", default = None, help = "fichier JSON du rapport de référence")
+    analyseur.add_argument("--enregistrer-la-reference", action = "store_true", help = "enregistre le rapport comme nouvelle référence")
+    analyseur.add_argument("--import-seulement", action = "store_true", help = "mesure du seul temps d'import de Sepim.main")
+    arguments_analyses = analyseur.parse_args(arguments)
+
+    # une référence introuvable n'est pas ignorée : la comparaison ne serait pas faite
+    reference_introuvable = arguments_analyses.reference is not None and not os.path.isfile(arguments_analyses.reference)
+
+    if reference_introuvable and not arguments_analyses.enregistrer_la_reference:
+
+        analyseur.error("rapport de référence introuvable : {} (cf. --enregistrer-la-reference)".format(arguments_analyses.reference))
+
+    # temps d'import
+    mesure_d_import, regressions = verification_du_temps_d_import()
+    print("Import de {} : {:.3f} s (médiane de {} mesures)".format(mesure_d_import["module"], mesure_d_import["duree_mediane"], len(mesure_d_import["durees"])))
+
+    # mesure des moteurs d'extraction
+    if not arguments_analyses.import_seulement:
+
+        rapport = lancement_des_mesures(arguments_analyses.moteurs, arguments_analyses.echelle, not arguments_analyses.sans_planches_synthetiques,
+                                        arguments_analyses.repetitions)
+        print(affichage_du_rapport(rapport))
+
+        if arguments_analyses.reference is not None:
+
+            if arguments_analyses.enregistrer_la_reference:
+
+                with open(arguments_analyses.reference, "w") as fichier:
+
+                    json.dump(rapport, fichier, indent = 2)
+
+            else:
+
+                with open(arguments_analyses.reference) as fichier:
+
+                    regressions.extend(comparaison_avec_la_reference(rapport, json.load(fichier)))
+
+    for regression in regressions:
+
+        print("Régression : {}".format(regression))
+
+    return 1 if regressions else 0
+
+# ==================================================================================================
+# UTILISATION
+# ==================================================================================================
+
+if __name__ == "__main__":
+
+    sys.exit(principal())
@@ -0,0 +1,316 @@
+# coding=utf-8
+
+"""
+    Module qui permet de conserver, d'un traitement à l'autre, les résultats du traitement de chaque image (cache adressé par le contenu)
+"""
+
+# =================================================================================================
+# PARAMETRES GLOBAUX
+# =================================================================================================
+
+__author__ = 'Julien LEPAIN'
+__email__ = 'julien.lepain.31@gmail.com'
+__version__ = '1.0'
+__maintainer__ = 'Julien LEPAIN'
+__date__ = '16/05/2019'
+__status = 'dev'
+
+# ==================================================================================================
+# IMPORTS
+# ==================================================================================================
+
+import os
+import json
+import hashlib
+import tempfile
+
+# ==================================================================================================
+# INITIALISATIONS
+# ==================================================================================================
+
+# Version du format des entrées du cache (à incrémenter lorsque le traitement ou le format des entrées change)
+VERSION_DU_CACHE = 2
+
+# Taille maximale par défaut (en octets) du cache
+TAILLE_MAXIMALE_DU_CACHE_PAR_DEFAUT = 64 * 1024 * 1024
+
+# Taille des blocs lus lors du calcul de l'empreinte d'un fichier
+TAILLE_DES_BLOCS_DE_LECTURE = 1024 * 1024
+
+# ==================================================================================================
+# CLASSES
+# ==================================================================================================
+
+
+# ==============================
+class CacheDesResultats(object):
+    """
+        Classe de cache persistant des résultats du traitement des images
+
+        Chaque entrée est un fichier JSON dont le nom est la clé : l'empreinte (SHA-256) du contenu de l'image et des paramètres du traitement.
+        Une entrée contient les limites des sous-images extraites, les angles de rotation et la liste des fichiers sauvegardés
+        (avec leur taille et leur date de modification). Le dossier de sauvegarde fait partie des paramètres du traitement.
+        Lorsque la taille du cache dépasse sa taille maximale, les entrées les moins récemment utilisées sont supprimées.
+
+        Seuls le dossier et la taille maximale sont conservés : le cache peut être transmis à d'autres processus.
+
+        :ivar __dossier_du_cache: dossier contenant les entrées du cache
+        :type __dossier_du_cache: str
+
+        :ivar __taille_maximale: taille maximale (en octets) du cache
+        :type __taille_maximale: int
+    """
+
+    # ==========================================================================================
+    def __init__(self, dossier_du_cache, taille_maximale = TAILLE_MAXIMALE_DU_CACHE_PAR_DEFAUT):
+        """
+            Constructeur de la classe
+
+            :param dossier_du_cache: dossier contenant les entrées du cache (créé s'il n'existe pas)
+            :type dossier_du_cache: str
+
+            :param taille_maximale: taille maximale (en octets) du cache
+            :type taille_maximale: int
+        """
+
+        # Attributs d'instance initialisés via les paramètres du constructeur
+        self.__dossier_du_cache = os.path.abspath(dossier_du_cache)
+        self.__taille_maximale = taille_maximale
+
+        os.makedirs(self.__dossier_du_cache, exist_ok = True)
+
+    # ============================================================
+    def calcul_de_la_cle(self, nom_absolu_de_l_image, parametres):
+        """
+            Méthode qui permet de calculer la clé d'une image : empreinte de son contenu et des paramètres du traitement
+
+            :param nom_absolu_de_l_image: nom absolu du fichier de l'image
+            :type nom_absolu_de_l_image: str
+
+            :param parametres: paramètres du traitement (valeurs sérialisables en JSON)
+            :type parametres: dict
+
+            :return: la clé (empreinte SHA-256 en hexadécimal)
+            :rtype: str
+        """
+
+        empreinte = hashlib.sha256()
+        empreinte.update(json.dumps({"version": VERSION_DU_CACHE, "parametres": parametres}, sort_keys = True).encode("utf-8"))
+
+        with open(nom_absolu_de_l_image, "rb") as fichier:
+
+            for bloc in iter(lambda: fichier.read(TAILLE_DES_BLOCS_DE_LECTURE), b""):
+
+                empreinte.update(bloc)
+
+        return empreinte.hexdigest()
+
+    # ==============================
+    def calcul_du_chemin(self, cle):
+        """
+            Méthode qui permet de calculer le nom absolu du fichier d'une entrée
+
+            :param cle: clé de l'entrée
+            :type cle: str
+
+            :return: le nom absolu du fichier de l'entrée
+            :rtype: str
+        """
+
+        return os.path.join(self.__dossier_du_cache, "{}.json".format(cle))
+
+    # =====================
+    def lecture(self, cle):
+        """
+            Méthode qui permet de lire une entrée du cache
+            L'entrée n'est renvoyée que si tous ses fichiers sauvegardés existent encore avec la même taille et la même date de modification
+            (un fichier réécrit par un traitement avec d'autres paramètres invalide l'entrée) ; sa date d'utilisation est mise-à-jour
+
+            :param cle: clé de l'entrée
+            :type cle: str
+
+            :return: l'entrée, ou None si elle n'existe pas, est illisible ou si ses fichiers sauvegardés ont changé
+            :rtype: None | dict
+        """
+
+        chemin = self.calcul_du_chemin(cle)
+
+        try:
+
+            with open(chemin, encoding = "utf-8") as fichier:
+
+                entree = json.load(fichier)
+
+            fichiers_presents = all(etat_d_un_fichier(nom) == (taille, date_de_modification) for nom, taille, date_de_modification in entree["fichiers_sauvegardes"])
+
+        except (OSError, ValueError, KeyError, TypeError):
+
+            return None
+
+        if not fichiers_presents:
+
+            return None
+
+        # mise-à-jour de la date d'utilisation (éviction des entrées les moins récemment utilisées)
+        try:
+
+            os.utime(chemin)
+
+        except OSError:
+
+            pass
+
+        return entree
+
+    # ================================
+    def recherche(self, gestionnaire):
+        """
+            Méthode qui permet de rechercher dans le cache le résultat du traitement d'une image
+
+            :param gestionnaire: gestionnaire de l'image à traiter
+            :type gestionnaire: Sepim.modules.gestionnaire_d_image.GestionnaireDImage
+
+            :return: la clé de l'image et l'entrée du cache (None si l'image doit être traitée)
+            :rtype: (str, None | dict)
+        """
+
+        cle = self.calcul_de_la_cle(gestionnaire.get_nom_absolu_de_l_image_a_traiter(), gestionnaire.get_parametres_du_traitement())
+
+        return cle, self.lecture(cle)
+
+    # ==============================================================
+    def enregistrement(self, cle, gestionnaire, angles_de_rotation):
+        """
+            Méthode qui permet d'enregistrer dans le cache le résultat du traitement d'une image (après la sauvegarde de ses sous-images)
+
+            :param cle: clé de l'image (cf. recherche)
+            :type cle: str
+
+            :param gestionnaire: gestionnaire de l'image traitée
+            :type gestionnaire: Sepim.modules.gestionnaire_d_image.GestionnaireDImage
+
+            :param angles_de_rotation: angle de la rotation appliquée à chaque sous-image
+            :type angles_de_rotation: list[float]
+        """
+
+        self.ecriture(cle, {"image": gestionnaire.get_nom_de_l_image_a_traiter(),
+                            "limites_des_sous_images": gestionnaire.get_limites_des_sous_images_extraites(),
+                            "angles_de_rotation": [float(angle) for angle in angles_de_rotation],
+                            "fichiers_sauvegardes": gestionnaire.get_fichiers_sauvegardes()})
+
+    # ==============================
+    def ecriture(self, cle, entree):
+        """
+            Méthode qui permet d'écrire une entrée dans le cache (de manière atomique), puis de limiter la taille du cache
+
+            :param cle: clé de l'entrée
+            :type cle: str
+
+            :param entree: entrée : limites des sous-images, angles de rotation et fichiers sauvegardés (nom absolu, taille, date de modification en nanosecondes)
+            :type entree: dict
+        """
+
+        descripteur, chemin_temporaire = tempfile.mkstemp(dir = self.__dossier_du_cache, suffix = ".tmp")
+
+        with os.fdopen(descripteur, "w", encoding = "utf-8") as fichier:
+
+            json.dump(entree, fichier)
+
+        os.replace(chemin_temporaire, self.calcul_du_chemin(cle))
+
+        self.eviction()
+
+    # =================
+    def eviction(self):
+        """
+            Méthode qui permet de supprimer les entrées les moins récemment utilisées tant que la taille du cache dépasse sa taille maximale
+        """
+
+        entrees = []
+
+        for nom in os.listdir(self.__dossier_du_cache):
+
+            if nom.endswith(".json"):
+
+                try:
+
+                    etat = os.stat(os.path.join(self.__dossier_du_cache, nom))
+                    entrees.append((etat.st_mtime, etat.st_size, nom))
+
+                except OSError:
+
+                    pass
+
+        taille_du_cache = sum(taille for _, taille, _ in entrees)
+
+        for _, taille, nom in sorted(entrees):
+
+            if taille_du_cache <= self.__taille_maximale:
+
+                break
+
+            # l'entrée peut avoir été supprimée par un autre processus
+            try:
+
+                os.remove(os.path.join(self.__dossier_du_cache, nom))
+
+            except OSError:
+
+                pass
+
+            taille_du_cache -= taille
+
+    # =================================
+    def invalidation(self, cle = None):
+        """
+            Méthode qui permet d'invalider une entrée du cache, ou tout le cache
+
+            :param cle: clé de l'entrée à invalider (None : toutes les entrées)
+            :type cle: None | str
+
+            :return: le nombre d'entrées supprimées
+            :rtype: int
+        """
+
+        noms = ["{}.json".format(cle)] if cle is not None else [nom for nom in os.listdir(self.__dossier_du_cache) if nom.endswith((".json", ".tmp"))]
+        nombre_d_entrees_supprimees = 0
+
+        for nom in noms:
+
+            try:
+
+                os.remove(os.path.join(self.__dossier_du_cache, nom))
+                nombre_d_entrees_supprimees += 1
+
+            except OSError:
+
+                pass
+
+        return nombre_d_entrees_supprimees
+
+# ==================================================================================================
+# FONCTIONS
+# ==================================================================================================
+
+
+# =========================
+def etat_d_un_fichier(nom):
+    """
+        Fonction qui permet de relever l'état d'un fichier sauvegardé
+
+        :param nom: nom absolu du fichier
+        :type nom: str
+
+        :return: la taille (en octets) et la date de modification (en nanosecondes) du fichier
+        :rtype: tuple(int, int)
+
+        :raise OSError: si le fichier n'existe pas
+    """
+
+    etat = os.stat(nom)
+
+    return etat.st_size, etat.st_mtime_ns
+
+# ==================================================================================================
+# UTILISATION
+# ==================================================================================================
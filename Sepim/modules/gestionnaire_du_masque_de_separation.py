@@ -0,0 +1,684 @@
+# coding=utf-8
+
+"""
+    Module qui permet de représenter le masque de séparation d'une image (moteur d'extraction historique) :
+    masque compact (un bit par pixel et index des plages de chaque ligne) et table des sommes cumulées du contenu
+"""
+
+# =================================================================================================
+# PARAMETRES GLOBAUX
+# =================================================================================================
+
+__author__ = 'Julien LEPAIN'
+__email__ = 'julien.lepain.31@gmail.com'
+__version__ = '1.0'
+__maintainer__ = 'Julien LEPAIN'
+__date__ = '16/05/2019'
+__status = 'dev'
+
+# ==================================================================================================
+# IMPORTS
+# ==================================================================================================
+
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from numpy import packbits, unpackbits, invert, zeros, empty, not_equal, flatnonzero, bincount, cumsum, subtract, arange, array, minimum, maximum, int64, uint8, uint16
+from numpy.lib.stride_tricks import as_strided
+
+# OpenCV (cv2) n'est utilisé que pour calculer la table des sommes cumulées (cf. TableDesSommesCumulees) :
+# il est importé lors de sa construction
+
+# ==================================================================================================
+# INITIALISATIONS
+# ==================================================================================================
+
+# Nombre de pixels au-delà duquel l'image intégrale complète ne tient plus sur 32 bits (les sommes de chaque bloc sont alors calculées directement)
+NOMBRE_DE_PIXELS_MAXIMAL_SUR_32_BITS = 2 ** 31 - 1
+
+# Côté (en pixels) des blocs de la table des sommes cumulées (cf. TableDesSommesCumulees) : les sommes locales d'un bloc tiennent sur 16 bits
+TAILLE_DES_BLOCS = 64
+
+# ==================================================================================================
+# CLASSES
+# ==================================================================================================
+
+
+# ======================================
+class MasqueDeSeparationCompact(object):
+    """
+        Classe de représentation compacte du masque de séparation d'une image, construite une seule fois par image :
+
+            - un masque compacté (un bit par pixel, 1 si le pixel est sur la séparation ou appartient à une sous-image déjà extraite) ;
+            - un index, par ligne, des plages de pixels hors séparation (débuts et fins, triés).
+
+        Le test d'un pixel est une lecture de bit, et la recherche du pixel hors séparation (ou sur la séparation) le plus proche
+        d'une position est une recherche dichotomique dans les plages de la ligne, sans parcours de la ligne.
+        Les colonnes (et les lignes) négatives sont indexées depuis la fin, comme pour un tableau numpy.
+
+        :ivar __largeur: largeur (en pixels) de l'image
+        :type __largeur: int
+
+        :ivar __masque_compacte: masque de séparation, huit pixels par octet (bit de poids fort : pixel de gauche)
+        :type __masque_compacte: numpy.ndarray
+
+        :ivar __debuts_des_plages: position du premier pixel de chaque plage hors séparation, pour chaque ligne
+        :type __debuts_des_plages: list[list[int]]
+
+        :ivar __fins_des_plages: position qui suit le dernier pixel de chaque plage hors séparation, pour chaque ligne
+        :type __fins_des_plages: list[list[int]]
+    """
+
+    # ====================================
+    def __init__(self, masque_du_contenu):
+        """
+            Constructeur de la classe
+
+            :param masque_du_contenu: masque du contenu de l'image (True si le pixel n'est pas sur la séparation)
+            :type masque_du_contenu: numpy.ndarray
+        """
+
+        hauteur, self.__largeur = masque_du_contenu.shape
+
+        # masque compacté : le masque du contenu est compacté puis inversé (les bits de complément de la dernière colonne ne sont jamais lus)
+        self.__masque_compacte = packbits(masque_du_contenu, axis = 1)
+        invert(self.__masque_compacte, out = self.__masque_compacte)
+
+        # plages hors séparation : transitions du masque du contenu, bordé d'une colonne sur la séparation de chaque côté
+        # (sur chaque ligne, les transitions sont alternativement le début et la fin d'une plage)
+        transitions = empty((hauteur, self.__largeur + 1), dtype = bool)
+        transitions[:, 0] = masque_du_contenu[:, 0]
+        transitions[:, -1] = masque_du_contenu[:, -1]
+        not_equal(masque_du_contenu[:, 1:], masque_du_contenu[:, :-1], out = transitions[:, 1:-1])
+
+        # positions dans le tableau aplati, puis lignes et colonnes (le nombre de transitions est faible devant le nombre de pixels)
+        lignes, colonnes = divmod(flatnonzero(transitions), self.__largeur + 1)
+        del transitions
+
+        colonnes = colonnes.tolist()
+        fins_des_lignes = list(accumulate(bincount(lignes, minlength = hauteur).tolist()))
+        debuts_des_lignes = [0] + fins_des_lignes[:-1]
+
+        self.__debuts_des_plages = [colonnes[debut:fin:2] for debut, fin in zip(debuts_des_lignes, fins_des_lignes)]
+        self.__fins_des_plages = [colonnes[debut + 1:fin:2] for debut, fin in zip(debuts_des_lignes, fins_des_lignes)]
+
+    # ==============================================
+    def est_sur_la_separation(self, ligne, colonne):
+        """
+            Méthode qui permet de tester si un pixel est sur la séparation (ou appartient à une sous-image déjà extraite)
+
+            :param ligne: position verticale du pixel
+            :type ligne: long
+
+            :param colonne: position horizontale du pixel (négative : depuis la fin de la ligne)
+            :type colonne: long
+
+            :return: True si le pixel est sur la séparation
+            :rtype: bool
+        """
+
+        if colonne < 0:
+
+            colonne += self.__largeur
+
+        return bool((self.__masque_compacte[ligne, colonne >> 3] >> (7 - (colonne & 7))) & 1)
+
+    # =========================================
+    def calcul_masque_de_la_ligne(self, ligne):
+        """
+            Méthode qui permet de décompacter le masque de séparation d'une ligne
+
+            :param ligne: position verticale de la ligne
+            :type ligne: long
+
+            :return: le masque de la ligne (True si le pixel est sur la séparation)
+            :rtype: numpy.ndarray
+        """
+
+        return unpackbits(self.__masque_compacte[ligne], count = self.__largeur).astype(bool)
+
+    # =============================================
+    def premier_pixel_hors_separation(self, ligne):
+        """
+            Méthode qui permet de récupérer le premier pixel hors séparation d'une ligne
+
+            :param ligne: position verticale de la ligne
+            :type ligne: long
+
+            :return: la position horizontale du pixel (-1 si tous les pixels de la ligne sont sur la séparation)
+            :rtype: int
+        """
+
+        debuts = self.__debuts_des_plages[ligne]
+
+        return debuts[0] if debuts else -1
+
+    # ============================================================
+    def dernier_pixel_hors_separation_avant(self, ligne, colonne):
+        """
+            Méthode qui permet de récupérer le pixel hors séparation le plus proche, strictement à gauche d'une position
+
+            :param ligne: position verticale de la ligne
+            :type ligne: long
+
+            :param colonne: position horizontale (positive)
+            :type colonne: long
+
+            :return: la position horizontale du pixel (-1 s'il n'existe pas)
+            :rtype: int
+        """
+
+        # dernière plage qui débute avant la position
+        indice = bisect_left(self.__debuts_des_plages[ligne], colonne) - 1
+
+        if indice < 0:
+
+            return -1
+
+        return min(self.__fins_des_plages[ligne][indice], colonne) - 1
+
+    # ===========================================================
+    def dernier_pixel_sur_la_separation(self, ligne, debut, fin):
+        """
+            Méthode qui permet de récupérer le dernier pixel sur la séparation d'un intervalle de positions
+
+            :param ligne: position verticale de la ligne
+            :type ligne: long
+
+            :param debut: première position (positive) de l'intervalle
+            :type debut: long
+
+            :param fin: dernière position (positive) de l'intervalle, incluse
+            :type fin: long
+
+            :return: la position horizontale du pixel (-1 s'il n'existe pas)
+            :rtype: int
+        """
+
+        # si la fin de l'intervalle est dans une plage hors séparation, le pixel qui précède cette plage est sur la séparation
+        indice = bisect_right(self.__debuts_des_plages[ligne], fin) - 1
+        position = self.__debuts_des_plages[ligne][indice] - 1 if indice >= 0 and fin < self.__fins_des_plages[ligne][indice] else fin
+
+        return position if position >= debut else -1
+
+    # ==========================================================
+    def prochain_pixel_sur_la_separation(self, lignes, colonne):
+        """
+            Méthode qui permet de récupérer le premier pixel, à partir d'une position, situé sur la séparation dans chacune des lignes indiquées
+
+            :param lignes: positions verticales des lignes
+            :type lignes: tuple[long]
+
+            :param colonne: position horizontale (positive) à partir de laquelle la recherche est effectuée
+            :type colonne: long
+
+            :return: la position horizontale du pixel (largeur de l'image s'il n'existe pas)
+            :rtype: int
+        """
+
+        # chaque ligne repousse la position candidate à la fin de sa plage hors séparation, jusqu'à ce qu'aucune ne la repousse
+        while colonne < self.__largeur:
+
+            position = colonne
+
+            for ligne in lignes:
+
+                indice = bisect_right(self.__debuts_des_plages[ligne], position) - 1
+
+                if indice >= 0 and position < self.__fins_des_plages[ligne][indice]:
+
+                    position = self.__fins_des_plages[ligne][indice]
+
+            if position == colonne:
+
+                return colonne
+
+            colonne = position
+
+        return self.__largeur
+
+    # ==============================================
+    def effacement(self, haut, gauche, bas, droite):
+        """
+            Méthode qui permet d'effacer une zone rectangulaire : ses pixels sont considérés comme situés sur la séparation
+
+            :param haut: première ligne de la zone
+            :type haut: long
+
+            :param gauche: première colonne de la zone
+            :type gauche: long
+
+            :param bas: dernière ligne de la zone (incluse)
+            :type bas: long
+
+            :param droite: dernière colonne de la zone (incluse)
+            :type droite: long
+        """
+
+        bas = min(bas, len(self.__debuts_des_plages) - 1)
+        droite = min(droite, self.__largeur - 1)
+
+        if bas < haut or droite < gauche:
+
+            return
+
+        # masque compacté : seuls les octets couverts par la zone sont modifiés
+        colonnes_de_la_zone = zeros(self.__largeur, dtype = bool)
+        colonnes_de_la_zone[gauche:droite + 1] = True
+        premier_octet, dernier_octet = gauche >> 3, (droite >> 3) + 1
+        self.__masque_compacte[haut:bas + 1, premier_octet:dernier_octet] |= packbits(colonnes_de_la_zone)[premier_octet:dernier_octet]
+
+        # index des plages : les plages qui chevauchent la zone sont retirées, leurs parties hors de la zone sont conservées
+        for ligne in range(haut, bas + 1):
+
+            debuts, fins = self.__debuts_des_plages[ligne], self.__fins_des_plages[ligne]
+            premiere, derniere = bisect_right(fins, gauche), bisect_left(debuts, droite + 1)
+
+            if premiere == derniere:
+
+                continue
+
+            nouveaux_debuts, nouvelles_fins = [], []
+
+            if debuts[premiere] < gauche:
+
+                nouveaux_debuts.append(debuts[premiere])
+                nouvelles_fins.append(gauche)
+
+            if fins[derniere - 1] > droite + 1:
+
+                nouveaux_debuts.append(droite + 1)
+                nouvelles_fins.append(fins[derniere - 1])
+
+            debuts[premiere:derniere] = nouveaux_debuts
+            fins[premiere:derniere] = nouvelles_fins
+
+
+# ===================================
+class TableDesSommesCumulees(object):
+    """
+        Classe de table des sommes cumulées (image intégrale) par blocs du masque du contenu d'une image, calculée une seule fois par image
+
+        L'image est découpée en blocs carrés : chaque bloc a sa propre image intégrale (sommes locales, sur 16 bits), et une image intégrale
+        des totaux des blocs permet de compter les blocs entièrement couverts par un rectangle en quatre lectures.
+        Le nombre de pixels hors séparation d'un rectangle (et donc son taux de remplissage, ou le fait qu'il soit entièrement sur la séparation)
+        est ainsi obtenu en quatre lectures par bloc de son contour, soit O((hauteur + largeur) / taille des blocs), et le test de fin
+        de l'extraction (nombre total de pixels, tenu à jour) en temps constant.
+        L'effacement d'une zone ne modifie que les sommes locales des blocs qu'elle recouvre, puis l'image intégrale des totaux des blocs
+        (une valeur par bloc) : l'image intégrale complète, elle, devrait être modifiée en bas et à droite de la zone, jusqu'aux bords de l'image.
+
+        :ivar __hauteur: hauteur (en pixels) de l'image
+        :type __hauteur: int
+
+        :ivar __largeur: largeur (en pixels) de l'image
+        :type __largeur: int
+
+        :ivar __taille_des_blocs: côté (en pixels) des blocs
+        :type __taille_des_blocs: int
+
+        :ivar __sommes_locales: nombre de pixels hors séparation du rectangle [0, ligne[ x [0, colonne[ de chaque bloc, indexé par
+        (ligne du bloc, ligne, colonne du bloc, colonne) ; une ligne et une colonne de zéros précèdent les sommes de chaque bloc
+        :type __sommes_locales: numpy.ndarray
+
+        :ivar __sommes_des_blocs: nombre de pixels hors séparation des blocs [0, ligne du bloc[ x [0, colonne du bloc[,
+        pour chaque ligne et chaque colonne de blocs (une ligne et une colonne de zéros précèdent les sommes de l'image)
+        :type __sommes_des_blocs: numpy.ndarray
+
+        :ivar __nombre_total: nombre de pixels hors séparation de l'image entière
+        :type __nombre_total: int
+    """
+
+    # =========================================================================
+    def __init__(self, masque_du_contenu, taille_des_blocs = TAILLE_DES_BLOCS):
+        """
+            Constructeur de la classe
+
+            :param masque_du_contenu: masque du contenu de l'image (True si le pixel n'est pas sur la séparation)
+            :type masque_du_contenu: numpy.ndarray
+
+            :param taille_des_blocs: côté (en pixels) des blocs (au plus 255, les sommes locales étant stockées sur 16 bits)
+            :type taille_des_blocs: int
+        """
+
+        self.__hauteur, self.__largeur = masque_du_contenu.shape
+        self.__taille_des_blocs = taille_des_blocs
+
+        lignes_de_blocs = -(-self.__hauteur // taille_des_blocs)
+        colonnes_de_blocs = -(-self.__largeur // taille_des_blocs)
+
+        # masque complété par des pixels sur la séparation jusqu'à un nombre entier de blocs
+        masque_complete = zeros((lignes_de_blocs * taille_des_blocs, colonnes_de_blocs * taille_des_blocs), dtype = bool)
+        masque_complete[:self.__hauteur, :self.__largeur] = masque_du_contenu
+
+        # image intégrale de chaque bloc
+        self.__sommes_locales = empty((lignes_de_blocs, taille_des_blocs + 1, colonnes_de_blocs, taille_des_blocs + 1), dtype = uint16)
+
+        # sommes sur 32 bits : image intégrale complète calculée par OpenCV, vue bloc par bloc (les blocs voisins partagent leurs bords),
+        # dont chaque bloc retranche ses sommes de la ligne et de la colonne qui le précèdent (la différence tient sur 16 bits)
+        if masque_complete.size <= NOMBRE_DE_PIXELS_MAXIMAL_SUR_32_BITS:
+
+            import cv2
+
+            sommes = cv2.integral(masque_complete.view(uint8), sdepth = cv2.CV_32S)
+            del masque_complete
+
+            pas_des_lignes, pas_des_colonnes = sommes.strides
+            sommes_par_bloc = as_strided(sommes, shape = self.__sommes_locales.shape,
+                                         strides = (taille_des_blocs * pas_des_lignes, pas_des_lignes, taille_des_blocs * pas_des_colonnes, pas_des_colonnes))
+
+            subtract(sommes_par_bloc, sommes_par_bloc[:, :1, :, :], out = self.__sommes_locales, casting = "unsafe")
+            self.__sommes_locales -= (sommes_par_bloc[:, :, :, :1] - sommes_par_bloc[:, :1, :, :1]).astype(uint16)
+            del sommes, sommes_par_bloc
+
+        # sinon, sommes cumulées de chaque bloc calculées directement
+        else:
+
+            blocs = masque_complete.reshape(lignes_de_blocs, taille_des_blocs, colonnes_de_blocs, taille_des_blocs)
+            self.__sommes_locales[:, 0, :, :] = 0
+            self.__sommes_locales[:, :, :, 0] = 0
+            cumsum(blocs, axis = 1, dtype = uint16, out = self.__sommes_locales[:, 1:, :, 1:])
+            cumsum(self.__sommes_locales[:, 1:, :, 1:], axis = 3, out = self.__sommes_locales[:, 1:, :, 1:])
+            del masque_complete, blocs
+
+        # image intégrale des totaux des blocs
+        self.__sommes_des_blocs = zeros((lignes_de_blocs + 1, colonnes_de_blocs + 1), dtype = int64)
+        cumsum(self.__sommes_locales[:, -1, :, -1], axis = 0, dtype = int64, out = self.__sommes_des_blocs[1:, 1:])
+        cumsum(self.__sommes_des_blocs[1:, 1:], axis = 1, out = self.__sommes_des_blocs[1:, 1:])
+
+        self.__nombre_total = int(self.__sommes_des_blocs[-1, -1])
+
+    # ====================================================================
+    def nombre_de_pixels_hors_separation(self, haut, gauche, bas, droite):
+        """
+            Méthode qui permet de calculer le nombre de pixels hors séparation d'un rectangle (limité à l'image)
+            Les blocs intérieurs au rectangle sont comptés par l'image intégrale des totaux des blocs, ceux de son contour par leurs sommes locales
+
+            :param haut: première ligne du rectangle
+            :type haut: long
+
+            :param gauche: première colonne du rectangle
+            :type gauche: long
+
+            :param bas: dernière ligne du rectangle (incluse)
+            :type bas: long
+
+            :param droite: dernière colonne du rectangle (incluse)
+            :type droite: long
+
+            :return: le nombre de pixels hors séparation
+            :rtype: int
+        """
+
+        bas = min(bas, self.__hauteur - 1) + 1
+        droite = min(droite, self.__largeur - 1) + 1
+
+        if bas <= haut or droite <= gauche:
+
+            return 0
+
+        premiere_ligne, derniere_ligne = haut // self.__taille_des_blocs, (bas - 1) // self.__taille_des_blocs
+        premiere_colonne, derniere_colonne = gauche // self.__taille_des_blocs, (droite - 1) // self.__taille_des_blocs
+
+        # un seul bloc : quatre lectures de ses sommes locales
+        if premiere_ligne == derniere_ligne and premiere_colonne == derniere_colonne:
+
+            sommes, taille = self.__sommes_locales, self.__taille_des_blocs
+            haut, bas = haut - premiere_ligne * taille, bas - premiere_ligne * taille
+            gauche, droite = gauche - premiere_colonne * taille, droite - premiere_colonne * taille
+
+            return (int(sommes[premiere_ligne, bas, premiere_colonne, droite]) - int(sommes[premiere_ligne, haut, premiere_colonne, droite])
+                    - int(sommes[premiere_ligne, bas, premiere_colonne, gauche]) + int(sommes[premiere_ligne, haut, premiere_colonne, gauche]))
+
+        # au plus deux lignes ou deux colonnes de blocs : tous les blocs sont sur le contour
+        if derniere_ligne - premiere_ligne < 2 or derniere_colonne - premiere_colonne < 2:
+
+            return int(self.calcul_nombres_par_bloc(haut, gauche, bas, droite, arange(premiere_ligne, derniere_ligne + 1),
+                                                    arange(premiere_colonne, derniere_colonne + 1)).sum())
+
+        sommes = self.__sommes_des_blocs
+        interieur = (sommes[derniere_ligne, derniere_colonne] - sommes[premiere_ligne + 1, derniere_colonne]
+                     - sommes[derniere_ligne, premiere_colonne + 1] + sommes[premiere_ligne + 1, premiere_colonne + 1])
+
+        # contour : première et dernière lignes de blocs, puis première et dernière colonnes de blocs (sans les coins)
+        lignes_du_contour = self.calcul_nombres_par_bloc(haut, gauche, bas, droite, array([premiere_ligne, derniere_ligne]),
+                                                         arange(premiere_colonne, derniere_colonne + 1))
+        colonnes_du_contour = self.calcul_nombres_par_bloc(haut, gauche, bas, droite, arange(premiere_ligne + 1, derniere_ligne),
+                                                           array([premiere_colonne, derniere_colonne]))
+
+        return int(interieur + lignes_du_contour.sum() + colonnes_du_contour.sum())
+
+    # ===============================================================================================
+    def calcul_nombres_par_bloc(self, haut, gauche, bas, droite, lignes_de_blocs, colonnes_de_blocs):
+        """
+            Méthode qui permet de calculer, pour chacun des blocs indiqués, le nombre de pixels hors séparation de son intersection avec un rectangle
+            (quatre lectures des sommes locales par bloc)
+
+            :param haut: première ligne du rectangle
+            :type haut: long
+
+            :param gauche: première colonne du rectangle
+            :type gauche: long
+
+            :param bas: ligne qui suit la dernière ligne du rectangle (limitée à l'image)
+            :type bas: long
+
+            :param droite: colonne qui suit la dernière colonne du rectangle (limitée à l'image)
+            :type droite: long
+
+            :param lignes_de_blocs: positions des lignes de blocs
+            :type lignes_de_blocs: numpy.ndarray
+
+            :param colonnes_de_blocs: positions des colonnes de blocs
+            :type colonnes_de_blocs: numpy.ndarray
+
+            :return: le nombre de pixels hors séparation de chaque bloc (lignes de blocs x colonnes de blocs)
+            :rtype: numpy.ndarray
+        """
+
+        # bornes locales de l'intersection dans chaque ligne (et chaque colonne) de blocs
+        taille = self.__taille_des_blocs
+
+        origines_des_lignes = lignes_de_blocs * taille
+        debuts_des_lignes = minimum(maximum(haut - origines_des_lignes, 0), taille)[:, None]
+        fins_des_lignes = minimum(maximum(bas - origines_des_lignes, 0), taille)[:, None]
+
+        origines_des_colonnes = colonnes_de_blocs * taille
+        debuts_des_colonnes = minimum(maximum(gauche - origines_des_colonnes, 0), taille)[None, :]
+        fins_des_colonnes = minimum(maximum(droite - origines_des_colonnes, 0), taille)[None, :]
+
+        lignes_de_blocs, colonnes_de_blocs = lignes_de_blocs[:, None], colonnes_de_blocs[None, :]
+        sommes = self.__sommes_locales
+
+        return (sommes[lignes_de_blocs, fins_des_lignes, colonnes_de_blocs, fins_des_colonnes].astype(int64)
+                - sommes[lignes_de_blocs, debuts_des_lignes, colonnes_de_blocs, fins_des_colonnes]
+                - sommes[lignes_de_blocs, fins_des_lignes, colonnes_de_blocs, debuts_des_colonnes]
+                + sommes[lignes_de_blocs, debuts_des_lignes, colonnes_de_blocs, debuts_des_colonnes])
+
+    # =======================================================
+    def taux_de_remplissage(self, haut, gauche, bas, droite):
+        """
+            Méthode qui permet de calculer le taux de remplissage (pixels hors séparation / pixels) d'un rectangle (limité à l'image)
+
+            :param haut: première ligne du rectangle
+            :type haut: long
+
+            :param gauche: première colonne du rectangle
+            :type gauche: long
+
+            :param bas: dernière ligne du rectangle (incluse)
+            :type bas: long
+
+            :param droite: dernière colonne du rectangle (incluse)
+            :type droite: long
+
+            :return: le taux de remplissage (0 pour un rectangle vide)
+            :rtype: float
+        """
+
+        nombre_de_pixels = (min(bas, self.__hauteur - 1) + 1 - haut) * (min(droite, self.__largeur - 1) + 1 - gauche)
+
+        if nombre_de_pixels <= 0:
+
+            return 0.0
+
+        return self.nombre_de_pixels_hors_separation(haut, gauche, bas, droite) / float(nombre_de_pixels)
+
+    # =====================================================================
+    def est_entierement_sur_la_separation(self, haut, gauche, bas, droite):
+        """
+            Méthode qui permet de tester si tous les pixels d'un rectangle sont sur la séparation (ou ont été effacés)
+
+            :param haut: première ligne du rectangle
+            :type haut: long
+
+            :param gauche: première colonne du rectangle
+            :type gauche: long
+
+            :param bas: dernière ligne du rectangle (incluse)
+            :type bas: long
+
+            :param droite: dernière colonne du rectangle (incluse)
+            :type droite: long
+
+            :return: True si aucun pixel du rectangle n'est hors séparation
+            :rtype: bool
+        """
+
+        return self.nombre_de_pixels_hors_separation(haut, gauche, bas, droite) == 0
+
+    # ===================================================
+    def get_nombre_total_de_pixels_hors_separation(self):
+        """
+            Méthode qui permet de récupérer le nombre de pixels hors séparation de l'image entière
+
+            :return: le nombre de pixels hors séparation
+            :rtype: int
+        """
+
+        return self.__nombre_total
+
+    # ==============================================
+    def effacement(self, haut, gauche, bas, droite):
+        """
+            Méthode qui permet d'effacer une zone rectangulaire (limitée à l'image) : ses pixels sont considérés comme situés sur la séparation
+            Seules les sommes locales des blocs qui recouvrent la zone sont modifiées : celles des blocs entièrement couverts sont annulées,
+            celles des blocs du contour sont mises à jour pixel par pixel (cf. effacement_dans_les_blocs).
+            L'image intégrale des totaux des blocs est ensuite mise à jour à partir du nombre de pixels effacés de chaque bloc.
+
+            :param haut: première ligne de la zone
+            :type haut: long
+
+            :param gauche: première colonne de la zone
+            :type gauche: long
+
+            :param bas: dernière ligne de la zone (incluse)
+            :type bas: long
+
+            :param droite: dernière colonne de la zone (incluse)
+            :type droite: long
+
+            :return: le nombre de pixels hors séparation effacés
+            :rtype: int
+        """
+
+        bas = min(bas, self.__hauteur - 1) + 1
+        droite = min(droite, self.__largeur - 1) + 1
+
+        if bas <= haut or droite <= gauche:
+
+            return 0
+
+        # blocs qui recouvrent la zone, puis blocs entièrement couverts par la zone (positions de fin exclues)
+        taille = self.__taille_des_blocs
+        premiere_ligne, derniere_ligne = haut // taille, (bas - 1) // taille + 1
+        premiere_colonne, derniere_colonne = gauche // taille, (droite - 1) // taille + 1
+
+        lignes_couvertes = [max(-(-haut // taille), premiere_ligne), max(bas // taille, premiere_ligne)]
+        colonnes_couvertes = [max(-(-gauche // taille), premiere_colonne), max(droite // taille, premiere_colonne)]
+
+        if lignes_couvertes[1] <= lignes_couvertes[0] or colonnes_couvertes[1] <= colonnes_couvertes[0]:
+
+            lignes_couvertes, colonnes_couvertes = [premiere_ligne, premiere_ligne], [premiere_colonne, premiere_colonne]
+
+        nombres = zeros((derniere_ligne - premiere_ligne, derniere_colonne - premiere_colonne), dtype = int64)
+
+        # blocs entièrement couverts : tous leurs pixels sont effacés
+        blocs_couverts = (slice(lignes_couvertes[0], lignes_couvertes[1]), slice(None), slice(colonnes_couvertes[0], colonnes_couvertes[1]), slice(None))
+        nombres[lignes_couvertes[0] - premiere_ligne:lignes_couvertes[1] - premiere_ligne,
+                colonnes_couvertes[0] - premiere_colonne:colonnes_couvertes[1] - premiere_colonne] = self.__sommes_locales[blocs_couverts][:, -1, :, -1]
+        self.__sommes_locales[blocs_couverts] = 0
+
+        # blocs du contour : au-dessus, au-dessous, puis à gauche et à droite des blocs entièrement couverts
+        for lignes, colonnes in (((premiere_ligne, lignes_couvertes[0]), (premiere_colonne, derniere_colonne)),
+                                 ((lignes_couvertes[1], derniere_ligne), (premiere_colonne, derniere_colonne)),
+                                 ((lignes_couvertes[0], lignes_couvertes[1]), (premiere_colonne, colonnes_couvertes[0])),
+                                 ((lignes_couvertes[0], lignes_couvertes[1]), (colonnes_couvertes[1], derniere_colonne))):
+
+            if lignes[0] < lignes[1] and colonnes[0] < colonnes[1]:
+
+                nombres[lignes[0] - premiere_ligne:lignes[1] - premiere_ligne, colonnes[0] - premiere_colonne:colonnes[1] - premiere_colonne] = \
+                    self.effacement_dans_les_blocs(haut, gauche, bas, droite, lignes, colonnes)
+
+        # image intégrale des totaux des blocs : les pixels effacés de chaque bloc sont retranchés en bas et à droite de celui-ci
+        cumuls = cumsum(cumsum(nombres, axis = 0), axis = 1)
+        self.__sommes_des_blocs[premiere_ligne + 1:derniere_ligne + 1, premiere_colonne + 1:derniere_colonne + 1] -= cumuls
+        self.__sommes_des_blocs[derniere_ligne + 1:, premiere_colonne + 1:derniere_colonne + 1] -= cumuls[-1:, :]
+        self.__sommes_des_blocs[premiere_ligne + 1:derniere_ligne + 1, derniere_colonne + 1:] -= cumuls[:, -1:]
+        self.__sommes_des_blocs[derniere_ligne + 1:, derniere_colonne + 1:] -= cumuls[-1, -1]
+
+        nombre_de_pixels_effaces = int(cumuls[-1, -1])
+        self.__nombre_total -= nombre_de_pixels_effaces
+
+        return nombre_de_pixels_effaces
+
+    # =================================================================================================
+    def effacement_dans_les_blocs(self, haut, gauche, bas, droite, lignes_de_blocs, colonnes_de_blocs):
+        """
+            Méthode qui permet d'effacer l'intersection d'une zone avec un ensemble de blocs : le contenu de chacun de leurs pixels est obtenu
+            à partir des sommes locales elles-mêmes, restreint à la zone, puis ses sommes cumulées sont retranchées des sommes locales
+
+            :param haut: première ligne de la zone
+            :type haut: long
+
+            :param gauche: première colonne de la zone
+            :type gauche: long
+
+            :param bas: ligne qui suit la dernière ligne de la zone (limitée à l'image)
+            :type bas: long
+
+            :param droite: colonne qui suit la dernière colonne de la zone (limitée à l'image)
+            :type droite: long
+
+            :param lignes_de_blocs: première ligne de blocs et ligne de blocs qui suit la dernière
+            :type lignes_de_blocs: tuple(int, int)
+
+            :param colonnes_de_blocs: première colonne de blocs et colonne de blocs qui suit la dernière
+            :type colonnes_de_blocs: tuple(int, int)
+
+            :return: le nombre de pixels hors séparation effacés de chaque bloc (lignes de blocs x colonnes de blocs)
+            :rtype: numpy.ndarray
+        """
+
+        taille = self.__taille_des_blocs
+
+        # sommes locales des blocs (vue), puis contenu de chacun de leurs pixels
+        sommes = self.__sommes_locales[lignes_de_blocs[0]:lignes_de_blocs[1], :, colonnes_de_blocs[0]:colonnes_de_blocs[1], :]
+        contenu = (sommes[:, 1:, :, 1:] - sommes[:, :-1, :, 1:]) - (sommes[:, 1:, :, :-1] - sommes[:, :-1, :, :-1])
+
+        # restriction du contenu à la zone, puis sommes cumulées des pixels effacés de chaque bloc
+        lignes = arange(lignes_de_blocs[0] * taille, lignes_de_blocs[1] * taille).reshape(-1, taille)
+        colonnes = arange(colonnes_de_blocs[0] * taille, colonnes_de_blocs[1] * taille).reshape(-1, taille)
+        contenu *= (((lignes >= haut) & (lignes < bas))[:, :, None, None] & ((colonnes >= gauche) & (colonnes < droite))[None, None, :, :])
+
+        cumsum(contenu, axis = 1, out = contenu)
+        cumsum(contenu, axis = 3, out = contenu)
+        sommes[:, 1:, :, 1:] -= contenu
+
+        return contenu[:, -1, :, -1]
+
+# ==================================================================================================
+# FONCTIONS
+# ==================================================================================================
+
+# ==================================================================================================
+# UTILISATION
+# ==================================================================================================
@@ -0,0 +1,453 @@
+# coding=utf-8
+
+"""
+    Module qui regroupe les moteurs vectorisés d'extraction des sous-images d'une image
+"""
+
+# =================================================================================================
+# PARAMETRES GLOBAUX
+# =================================================================================================
+
+__author__ = 'Julien LEPAIN'
+__email__ = 'julien.lepain.31@gmail.com'
+__version__ = '1.0'
+__maintainer__ = 'Julien LEPAIN'
+__date__ = '16/05/2019'
+__status = 'dev'
+
+# ==================================================================================================
+# IMPORTS
+# ==================================================================================================
+
+from Sepim.modules.objet_image import ObjetImage
+
+from numpy import concatenate, diff, flatnonzero, int8, ones, where, stack, unique
+
+# scipy.ndimage est importé à sa première utilisation, dans les moteurs qui étiquettent les composantes connexes
+
+# ==================================================================================================
+# INITIALISATIONS
+# ==================================================================================================
+
+# Hauteur par défaut (en pixels) des bandes horizontales traitées par le moteur d'extraction par bandes
+HAUTEUR_DES_BANDES_PAR_DEFAUT = 1024
+
+# ==================================================================================================
+# CLASSES
+# ==================================================================================================
+
+
+# ===================================
+class ExtractionParDecoupeXY(object):
+    """
+        Classe d'extraction des sous-images par découpe XY (profils de projection)
+
+        Le masque du contenu (i.e. des pixels qui ne sont pas sur la séparation) est calculé une seule fois,
+        puis l'image est découpée successivement selon les lignes et les colonnes entièrement situées sur la séparation.
+        Ce moteur est adapté aux images dont les sous-images sont disposées en grille ou en mosaïque.
+
+        :ivar __image_chargee: données de l'image chargée
+        :type __image_chargee: numpy.ndarray
+
+        :ivar __couleur_de_separation: couleur de séparation entre les sous-images d'une image
+        :type __couleur_de_separation: numpy.ndarray
+    """
+
+    # =======================================================
+    def __init__(self, image_chargee, couleur_de_separation):
+        """
+            Constructeur de la classe
+
+            :param image_chargee: données de l'image chargée
+            :type image_chargee: numpy.ndarray
+
+            :param couleur_de_separation: couleur de séparation entre les sous-images d'une image
+            :type couleur_de_separation: numpy.ndarray
+        """
+
+        # Attributs d'instance initialisés via les paramètres du constructeur
+        self.__image_chargee = image_chargee
+        self.__couleur_de_separation = couleur_de_separation
+
+    # ===================================
+    def extraction_des_sous_images(self):
+        """
+            Méthode qui permet d'extraire, en une seule passe, les sous-images de l'image chargée
+
+            :return: la liste des sous-images, triées selon l'ordre de parcours de l'image (de haut en bas puis de gauche à droite)
+            :rtype: list[ObjetImage]
+        """
+
+        # calcul du masque du contenu
+        masque_du_contenu = calcul_masque_du_contenu(self.__image_chargee, self.__couleur_de_separation)
+
+        # découpe récursive, gérée via une pile afin de ne pas dépendre de la profondeur de récursion
+        limites_des_sous_images = []
+        pile = [(0, masque_du_contenu.shape[0], 0, masque_du_contenu.shape[1])]
+
+        while pile:
+
+            haut, bas, gauche, droite = pile.pop()
+
+            # découpe selon les lignes entièrement situées sur la séparation
+            plages_des_lignes = calcul_plages_de_contenu(masque_du_contenu[haut:bas, gauche:droite].any(axis = 1))
+
+            if len(plages_des_lignes) != 1:
+
+                pile.extend((haut + debut, haut + fin, gauche, droite) for debut, fin in plages_des_lignes)
+                continue
+
+            haut, bas = haut + plages_des_lignes[0][0], haut + plages_des_lignes[0][1]
+
+            # découpe selon les colonnes entièrement situées sur la séparation
+            plages_des_colonnes = calcul_plages_de_contenu(masque_du_contenu[haut:bas, gauche:droite].any(axis = 0))
+
+            if len(plages_des_colonnes) != 1:
+
+                pile.extend((haut, bas, gauche + debut, gauche + fin) for debut, fin in plages_des_colonnes)
+                continue
+
+            gauche, droite = gauche + plages_des_colonnes[0][0], gauche + plages_des_colonnes[0][1]
+
+            # aucune découpe n'est possible : la zone correspond à une sous-image
+            limites_des_sous_images.append((haut, gauche, bas - 1, droite - 1))
+
+        # création des sous-images
+        liste_des_sous_images = []
+
+        for limite_haute, limite_gauche, limite_basse, limite_droite in sorted(limites_des_sous_images):
+
+            sous_image = ObjetImage(limite_haute, limite_gauche, limite_basse, limite_droite)
+            sous_image.set_donnees_image(self.__image_chargee)
+            liste_des_sous_images.append(sous_image)
+
+        return liste_des_sous_images
+
+
+# =============================================
+class ExtractionParComposantesConnexes(object):
+    """
+        Classe d'extraction des sous-images par étiquetage des composantes connexes
+
+        Le masque du contenu est étiqueté en une seule passe ; chaque composante connexe (8-connexité) donne une boîte englobante.
+        Les boîtes qui se chevauchent (par exemple un motif isolé à l'intérieur d'une sous-image) sont fusionnées.
+        Ce moteur est adapté aux images dont les sous-images ne sont pas disposées en grille (décalées, de tailles différentes).
+
+        :ivar __image_chargee: données de l'image chargée
+        :type __image_chargee: numpy.ndarray
+
+        :ivar __couleur_de_separation: couleur de séparation entre les sous-images d'une image
+        :type __couleur_de_separation: numpy.ndarray
+    """
+
+    # =======================================================
+    def __init__(self, image_chargee, couleur_de_separation):
+        """
+            Constructeur de la classe
+
+            :param image_chargee: données de l'image chargée
+            :type image_chargee: numpy.ndarray
+
+            :param couleur_de_separation: couleur de séparation entre les sous-images d'une image
+            :type couleur_de_separation: numpy.ndarray
+        """
+
+        # Attributs d'instance initialisés via les paramètres du constructeur
+        self.__image_chargee = image_chargee
+        self.__couleur_de_separation = couleur_de_separation
+
+    # ===================================
+    def extraction_des_sous_images(self):
+        """
+            Méthode qui permet d'extraire, en une seule passe, les sous-images de l'image chargée
+
+            :return: la liste des sous-images, triées selon l'ordre de parcours de l'image (de haut en bas puis de gauche à droite)
+            :rtype: list[ObjetImage]
+        """
+
+        from scipy import ndimage
+
+        # étiquetage des composantes connexes du masque du contenu
+        masque_du_contenu = calcul_masque_du_contenu(self.__image_chargee, self.__couleur_de_separation)
+        etiquettes, _ = ndimage.label(masque_du_contenu, structure = ones((3, 3), dtype = int8))
+
+        # récupération des boîtes englobantes (limites incluses) de chaque composante
+        limites_des_sous_images = [(tranche_verticale.start, tranche_horizontale.start, tranche_verticale.stop - 1, tranche_horizontale.stop - 1)
+                                   for tranche_verticale, tranche_horizontale in ndimage.find_objects(etiquettes)]
+
+        # création des sous-images
+        liste_des_sous_images = []
+
+        for limite_haute, limite_gauche, limite_basse, limite_droite in sorted(fusion_des_limites_qui_se_chevauchent(limites_des_sous_images)):
+
+            sous_image = ObjetImage(limite_haute, limite_gauche, limite_basse, limite_droite)
+            sous_image.set_donnees_image(self.__image_chargee)
+            liste_des_sous_images.append(sous_image)
+
+        return liste_des_sous_images
+
+
+# ================================
+class ExtractionParBandes(object):
+    """
+        Classe d'extraction des sous-images par étiquetage des composantes connexes, bande horizontale par bande horizontale
+
+        Seules une bande de l'image (son masque et ses étiquettes) et la dernière ligne d'étiquettes de la bande précédente sont
+        présentes simultanément en mémoire : ce moteur est destiné aux très grandes images, chargées dans une mémoire projetée.
+        Les composantes qui traversent la frontière entre deux bandes sont raccordées (8-connexité), puis les boîtes qui se chevauchent
+        sont fusionnées : le résultat est identique à celui de ExtractionParComposantesConnexes.
+
+        :ivar __image_chargee: données de l'image chargée (éventuellement une mémoire projetée, cf. numpy.memmap)
+        :type __image_chargee: numpy.ndarray
+
+        :ivar __couleur_de_separation: couleur de séparation entre les sous-images d'une image
+        :type __couleur_de_separation: numpy.ndarray
+
+        :ivar __hauteur_des_bandes: hauteur (en pixels) des bandes horizontales
+        :type __hauteur_des_bandes: int
+    """
+
+    # ===========================================================================================================
+    def __init__(self, image_chargee, couleur_de_separation, hauteur_des_bandes = HAUTEUR_DES_BANDES_PAR_DEFAUT):
+        """
+            Constructeur de la classe
+
+            :param image_chargee: données de l'image chargée
+            :type image_chargee: numpy.ndarray
+
+            :param couleur_de_separation: couleur de séparation entre les sous-images d'une image
+            :type couleur_de_separation: numpy.ndarray
+
+            :param hauteur_des_bandes: hauteur (en pixels) des bandes horizontales
+            :type hauteur_des_bandes: int
+        """
+
+        # Attributs d'instance initialisés via les paramètres du constructeur
+        self.__image_chargee = image_chargee
+        self.__couleur_de_separation = couleur_de_separation
+        self.__hauteur_des_bandes = max(1, int(hauteur_des_bandes))
+
+    # ===================================
+    def extraction_des_sous_images(self):
+        """
+            Méthode qui permet d'extraire les sous-images de l'image chargée, bande par bande
+
+            :return: la liste des sous-images, triées selon l'ordre de parcours de l'image (de haut en bas puis de gauche à droite)
+            :rtype: list[ObjetImage]
+        """
+
+        from scipy import ndimage
+
+        hauteur, largeur = self.__image_chargee.shape[:2]
+        structure = ones((3, 3), dtype = int8)
+
+        # étiquettes globales : parent de chaque étiquette (union-find) et boîte englobante de chaque étiquette
+        parents = []
+        limites_par_etiquette = []
+        derniere_ligne_precedente = None
+
+        for debut in range(0, hauteur, self.__hauteur_des_bandes):
+
+            # étiquetage des composantes connexes de la bande
+            masque_de_la_bande = calcul_masque_du_contenu(self.__image_chargee[debut:debut + self.__hauteur_des_bandes], self.__couleur_de_separation)
+            etiquettes, _ = ndimage.label(masque_de_la_bande, structure = structure)
+
+            # conversion des étiquettes de la bande en étiquettes globales
+            decalage = len(parents) - 1
+
+            for tranche_verticale, tranche_horizontale in ndimage.find_objects(etiquettes):
+
+                parents.append(len(parents))
+                limites_par_etiquette.append((debut + tranche_verticale.start, tranche_horizontale.start,
+                                              debut + tranche_verticale.stop - 1, tranche_horizontale.stop - 1))
+
+            premiere_ligne = where(etiquettes[0] > 0, etiquettes[0] + decalage, -1)
+
+            # raccordement des composantes de part et d'autre de la frontière avec la bande précédente (voisins verticaux et diagonaux)
+            if derniere_ligne_precedente is not None:
+
+                for decalage_horizontal in (-1, 0, 1):
+
+                    etiquettes_du_haut = derniere_ligne_precedente[max(0, -decalage_horizontal):largeur - max(0, decalage_horizontal)]
+                    etiquettes_du_bas = premiere_ligne[max(0, decalage_horizontal):largeur - max(0, -decalage_horizontal)]
+                    contacts = (etiquettes_du_haut >= 0) & (etiquettes_du_bas >= 0)
+
+                    if contacts.any():
+
+                        for etiquette_du_haut, etiquette_du_bas in unique(stack((etiquettes_du_haut[contacts], etiquettes_du_bas[contacts]), axis = 1), axis = 0):
+
+                            union_des_etiquettes(parents, int(etiquette_du_haut), int(etiquette_du_bas))
+
+            derniere_ligne_precedente = where(etiquettes[-1] > 0, etiquettes[-1] + decalage, -1)
+
+        # regroupement des boîtes englobantes des étiquettes raccordées
+        limites_par_composante = {}
+
+        for etiquette, (haute, gauche, basse, droite) in enumerate(limites_par_etiquette):
+
+            racine = recherche_de_la_racine(parents, etiquette)
+
+            if racine in limites_par_composante:
+
+                autre_haute, autre_gauche, autre_basse, autre_droite = limites_par_composante[racine]
+                limites_par_composante[racine] = (min(haute, autre_haute), min(gauche, autre_gauche), max(basse, autre_basse), max(droite, autre_droite))
+
+            else:
+
+                limites_par_composante[racine] = (haute, gauche, basse, droite)
+
+        # création des sous-images
+        liste_des_sous_images = []
+
+        for limite_haute, limite_gauche, limite_basse, limite_droite in sorted(fusion_des_limites_qui_se_chevauchent(limites_par_composante.values())):
+
+            sous_image = ObjetImage(limite_haute, limite_gauche, limite_basse, limite_droite)
+            sous_image.set_donnees_image(self.__image_chargee)
+            liste_des_sous_images.append(sous_image)
+
+        return liste_des_sous_images
+
+
+# Moteurs d'extraction disponibles, indexés par leur nom
+# (le moteur "historique" est le parcours pixel par pixel de Sepim.modules.gestionnaire_d_image.GestionnaireDImage)
+MOTEURS_D_EXTRACTION = {"decoupe_xy": ExtractionParDecoupeXY,
+                        "composantes_connexes": ExtractionParComposantesConnexes,
+                        "bandes": ExtractionParBandes}
+
+# ==================================================================================================
+# FONCTIONS
+# ==================================================================================================
+
+
+# =================================================================
+def calcul_masque_du_contenu(image_chargee, couleur_de_separation):
+    """
+        Fonction qui permet de calculer le masque du contenu d'une image, i.e. des pixels qui ne sont pas sur la séparation
+
+        L'image peut aussi être un plan d'indices (image à palette) : la séparation est alors l'indice de sa couleur dans la palette
+
+        :param image_chargee: données de l'image chargée (couleurs ou plan d'indices)
+        :type image_chargee: numpy.ndarray
+
+        :param couleur_de_separation: couleur de séparation entre les sous-images d'une image (ou son indice dans la palette)
+        :type couleur_de_separation: numpy.ndarray | int
+
+        :return: le masque du contenu (True si le pixel n'est pas sur la séparation)
+        :rtype: numpy.ndarray
+    """
+
+    masque = image_chargee != couleur_de_separation
+
+    return masque if masque.ndim == 2 else masque.any(axis = 2)
+
+
+# ===========================================
+def calcul_plages_de_contenu(profil_booleen):
+    """
+        Fonction qui permet de calculer les plages consécutives de valeurs vraies d'un profil de projection
+
+        :param profil_booleen: profil de projection (True si la ligne ou la colonne contient du contenu)
+        :type profil_booleen: numpy.ndarray
+
+        :return: la liste des plages sous la forme (début inclus, fin exclue)
+        :rtype: list[tuple(int, int)]
+    """
+
+    transitions = diff(concatenate(([0], profil_booleen.astype(int8), [0])))
+
+    return list(zip(flatnonzero(transitions == 1).tolist(), flatnonzero(transitions == -1).tolist()))
+
+
+# ===========================================================
+def fusion_des_limites_qui_se_chevauchent(liste_des_limites):
+    """
+        Fonction qui permet de fusionner les boîtes englobantes qui se chevauchent, jusqu'à ce qu'aucun chevauchement ne subsiste
+
+        :param liste_des_limites: liste des limites (haute, gauche, basse, droite), incluses
+        :type liste_des_limites: list[tuple(int, int, int, int)]
+
+        :return: la liste des limites après fusion
+        :rtype: list[tuple(int, int, int, int)]
+    """
+
+    limites_fusionnees = list(liste_des_limites)
+    fusion_effectuee = True
+
+    while fusion_effectuee:
+
+        fusion_effectuee = False
+        resultat = []
+
+        for haute, gauche, basse, droite in limites_fusionnees:
+
+            for indice, (autre_haute, autre_gauche, autre_basse, autre_droite) in enumerate(resultat):
+
+                # les deux boîtes se chevauchent : elles sont remplacées par leur union
+                if haute <= autre_basse and autre_haute <= basse and gauche <= autre_droite and autre_gauche <= droite:
+
+                    resultat[indice] = (min(haute, autre_haute), min(gauche, autre_gauche), max(basse, autre_basse), max(droite, autre_droite))
+                    fusion_effectuee = True
+                    break
+
+            else:
+
+                resultat.append((haute, gauche, basse, droite))
+
+        limites_fusionnees = resultat
+
+    return limites_fusionnees
+
+
+# =============================================
+def recherche_de_la_racine(parents, etiquette):
+    """
+        Fonction qui permet de rechercher la racine d'une étiquette dans une structure union-find (avec compression des chemins)
+
+        :param parents: parent de chaque étiquette
+        :type parents: list[int]
+
+        :param etiquette: étiquette
+        :type etiquette: int
+
+        :return: la racine de l'étiquette
+        :rtype: int
+    """
+
+    racine = etiquette
+
+    while parents[racine] != racine:
+
+        racine = parents[racine]
+
+    while parents[etiquette] != racine:
+
+        parents[etiquette], etiquette = racine, parents[etiquette]
+
+    return racine
+
+
+# ============================================================
+def union_des_etiquettes(parents, etiquette, autre_etiquette):
+    """
+        Fonction qui permet de réunir deux étiquettes dans une structure union-find
+
+        :param parents: parent de chaque étiquette
+        :type parents: list[int]
+
+        :param etiquette: première étiquette
+        :type etiquette: int
+
+        :param autre_etiquette: seconde étiquette
+        :type autre_etiquette: int
+    """
+
+    racine = recherche_de_la_racine(parents, etiquette)
+    autre_racine = recherche_de_la_racine(parents, autre_etiquette)
+
+    if racine != autre_racine:
+
+        parents[max(racine, autre_racine)] = min(racine, autre_racine)
+
+# ==================================================================================================
+# UTILISATION
+# ==================================================================================================
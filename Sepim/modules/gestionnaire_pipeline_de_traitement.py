@@ -0,0 +1,291 @@
+# coding=utf-8
+
+"""
+    Module qui permet de traiter les images en flux, via des étapes (chargement, extraction, rotation, sauvegarde) reliées par des files bornées
+"""
+
+# =================================================================================================
+# PARAMETRES GLOBAUX
+# =================================================================================================
+
+__author__ = 'Julien LEPAIN'
+__email__ = 'julien.lepain.31@gmail.com'
+__version__ = '1.0'
+__maintainer__ = 'Julien LEPAIN'
+__date__ = '16/05/2019'
+__status = 'dev'
+
+# ==================================================================================================
+# IMPORTS
+# ==================================================================================================
+
+import time
+import threading
+from queue import Queue
+
+# ==================================================================================================
+# INITIALISATIONS
+# ==================================================================================================
+
+# Étapes du traitement, dans l'ordre d'exécution
+ETAPES_DU_TRAITEMENT = ("chargement", "extraction", "rotation", "sauvegarde")
+
+# Nombre de fils d'exécution par défaut de chaque étape
+PARALLELISME_PAR_DEFAUT = {"chargement": 2, "extraction": 2, "rotation": 2, "sauvegarde": 2}
+
+# Marqueur de fin de flux transmis d'une étape à la suivante
+_FIN_DU_FLUX = None
+
+# ==================================================================================================
+# CLASSES
+# ==================================================================================================
+
+
+# =================================
+class PipelineDeTraitement(object):
+    """
+        Classe de traitement des images en flux
+
+        Chaque étape dispose de ses propres fils d'exécution et transmet les images à l'étape suivante via une file bornée :
+        la lecture et l'écriture des fichiers se recouvrent avec l'extraction et la rotation, et la taille des files
+        limite le nombre d'images décodées présentes simultanément en mémoire.
+
+        :ivar __parallelisme: nombre de fils d'exécution de chaque étape
+        :type __parallelisme: dict[str, int]
+
+        :ivar __taille_des_files: taille maximale de chacune des files reliant les étapes
+        :type __taille_des_files: int
+
+        :ivar __ecrivain: écrivain des sous-images utilisé par l'étape de sauvegarde
+        :type __ecrivain: None | Sepim.modules.gestionnaire_d_ecriture_des_images.EcrivainDesImages
+
+        :ivar __cache: cache des résultats : les images dont le résultat est en cache ne dépassent pas l'étape de chargement
+        :type __cache: None | Sepim.modules.gestionnaire_du_cache_des_resultats.CacheDesResultats
+
+        :ivar __resultats: résumé du traitement de chaque image
+        :type __resultats: list[dict]
+
+        :ivar __verrou_des_resultats: verrou protégeant la liste des résultats
+        :type __verrou_des_resultats: threading.Lock
+    """
+
+    # ===========================================================================================
+    def __init__(self, parallelisme = None, taille_des_files = 2, ecrivain = None, cache = None):
+        """
+            Constructeur de la classe
+
+            :param parallelisme: nombre de fils d'exécution de chaque étape (les étapes non renseignées utilisent PARALLELISME_PAR_DEFAUT)
+            :type parallelisme: None | dict[str, int]
+
+            :param taille_des_files: taille maximale de chacune des files reliant les étapes
+            :type taille_des_files: int
+
+            :param ecrivain: écrivain des sous-images utilisé par l'étape de sauvegarde (un écrivain temporaire est utilisé pour chaque image s'il n'est pas renseigné)
+            :type ecrivain: None | Sepim.modules.gestionnaire_d_ecriture_des_images.EcrivainDesImages
+
+            :param cache: cache des résultats (None : toutes les images sont traitées)
+            :type cache: None | Sepim.modules.gestionnaire_du_cache_des_resultats.CacheDesResultats
+        """
+
+        # Attributs d'instance initialisés via les paramètres du constructeur
+        self.__parallelisme = dict(PARALLELISME_PAR_DEFAUT)
+        self.__parallelisme.update(parallelisme or {})
+        self.__taille_des_files = taille_des_files
+        self.__ecrivain = ecrivain
+        self.__cache = cache
+
+        # Autres attributs d'instance
+        self.__resultats = []
+        self.__verrou_des_resultats = threading.Lock()
+
+    # ====================================================
+    def execution(self, liste_des_gestionnaires_d_images):
+        """
+            Méthode qui permet de traiter un ensemble d'images en flux
+
+            :param liste_des_gestionnaires_d_images: gestionnaires des images à traiter
+            :type liste_des_gestionnaires_d_images: list[Sepim.modules.gestionnaire_d_image.GestionnaireDImage]
+
+            :return: le résumé du traitement de chaque image, dans l'ordre de fin de traitement
+            :rtype: list[dict]
+        """
+
+        self.__resultats = []
+
+        # création des files : une file en entrée de chaque étape
+        files = [Queue(maxsize = self.__taille_des_files) for _ in ETAPES_DU_TRAITEMENT]
+
+        # démarrage des fils d'exécution de chaque étape
+        fils_par_etape = []
+
+        for indice, etape in enumerate(ETAPES_DU_TRAITEMENT):
+
+            file_de_sortie = files[indice + 1] if indice + 1 < len(files) else None
+            fils = [threading.Thread(target = self.execution_d_une_etape, args = (etape, files[indice], file_de_sortie), daemon = True)
+                    for _ in range(max(1, self.__parallelisme[etape]))]
+
+            for fil in fils:
+
+                fil.start()
+
+            fils_par_etape.append(fils)
+
+        # alimentation de la première étape (bloquante lorsque la file est pleine)
+        for gestionnaire in liste_des_gestionnaires_d_images:
+
+            files[0].put({"gestionnaire": gestionnaire, "angles_de_rotation": [], "cle_du_cache": None, "debut": time.perf_counter()})
+
+        # propagation de la fin du flux : une étape n'est terminée que lorsque tous ses fils d'exécution le sont
+        for indice, fils in enumerate(fils_par_etape):
+
+            for _ in fils:
+
+                files[indice].put(_FIN_DU_FLUX)
+
+            for fil in fils:
+
+                fil.join()
+
+        return self.__resultats
+
+    # ====================================================================
+    def execution_d_une_etape(self, etape, file_d_entree, file_de_sortie):
+        """
+            Méthode exécutée par chaque fil d'exécution d'une étape : les images sont traitées jusqu'à la réception du marqueur de fin de flux
+            Une image dont le traitement échoue n'est pas transmise à l'étape suivante et son échec est consigné dans les résultats
+            Les données d'une image sont libérées dès la fin (ou l'échec) de son traitement : seules les images présentes dans les étapes et les files
+            restent décodées en mémoire
+
+            :param etape: nom de l'étape (cf. ETAPES_DU_TRAITEMENT)
+            :type etape: str
+
+            :param file_d_entree: file dans laquelle l'étape récupère les images à traiter
+            :type file_d_entree: queue.Queue
+
+            :param file_de_sortie: file dans laquelle l'étape dépose les images traitées (None pour la dernière étape)
+            :type file_de_sortie: None | queue.Queue
+        """
+
+        while True:
+
+            element = file_d_entree.get()
+
+            if element is _FIN_DU_FLUX:
+
+                return
+
+            gestionnaire = element["gestionnaire"]
+
+            try:
+
+                if etape == "chargement":
+
+                    # une image dont le résultat est en cache n'est pas transmise à l'étape suivante
+                    if self.__cache is not None:
+
+                        element["cle_du_cache"], entree = self.__cache.recherche(gestionnaire)
+
+                        if entree is not None:
+
+                            self.ajout_d_un_resultat(creation_du_resume(gestionnaire.get_nom_de_l_image_a_traiter(), len(entree["angles_de_rotation"]),
+                                                                        entree["angles_de_rotation"], time.perf_counter() - element["debut"],
+                                                                        depuis_le_cache = True))
+                            continue
+
+                    gestionnaire.chargement_de_l_image_a_traiter()
+
+                elif etape == "extraction":
+
+                    gestionnaire.extraction_des_sous_images()
+
+                elif etape == "rotation":
+
+                    element["angles_de_rotation"] = gestionnaire.rotation_des_sous_images()
+
+                else:
+
+                    gestionnaire.sauvegarde_des_sous_images(self.__ecrivain)
+
+                    if self.__cache is not None:
+
+                        self.__cache.enregistrement(element["cle_du_cache"], gestionnaire, element["angles_de_rotation"])
+
+            except Exception as exception:
+
+                self.ajout_d_un_resultat(creation_du_resume(gestionnaire.get_nom_de_l_image_a_traiter(), len(gestionnaire.get_liste_des_sous_images()),
+                                                            element["angles_de_rotation"], time.perf_counter() - element["debut"], exception,
+                                                            gestionnaire.get_mesures_des_etapes()))
+                gestionnaire.liberation_des_donnees()
+                continue
+
+            if file_de_sortie is not None:
+
+                file_de_sortie.put(element)
+
+            else:
+
+                self.ajout_d_un_resultat(creation_du_resume(gestionnaire.get_nom_de_l_image_a_traiter(), len(gestionnaire.get_liste_des_sous_images()),
+                                                            element["angles_de_rotation"], time.perf_counter() - element["debut"],
+                                                            etapes = gestionnaire.get_mesures_des_etapes()))
+                gestionnaire.liberation_des_donnees()
+
+    # ====================================
+    def ajout_d_un_resultat(self, resume):
+        """
+            Méthode qui permet d'ajouter, de manière sûre entre fils d'exécution, le résumé du traitement d'une image aux résultats
+
+            :param resume: résumé du traitement d'une image (cf. creation_du_resume)
+            :type resume: dict
+        """
+
+        with self.__verrou_des_resultats:
+
+            self.__resultats.append(resume)
+
+# ==================================================================================================
+# FONCTIONS
+# ==================================================================================================
+
+
+# ===========================================================================================================================================================
+def creation_du_resume(nom_de_l_image, nombre_de_sous_images = 0, angles_de_rotation = (), duree = 0.0, erreur = None, etapes = (), depuis_le_cache = False):
+    """
+        Fonction qui permet de créer le résumé du traitement d'une image
+
+        :param nom_de_l_image: nom de l'image traitée
+        :type nom_de_l_image: str
+
+        :param nombre_de_sous_images: nombre de sous-images extraites (y compris lorsque le traitement échoue après l'extraction)
+        :type nombre_de_sous_images: int
+
+        :param angles_de_rotation: angle de la rotation appliquée à chaque sous-image
+        :type angles_de_rotation: list[float]
+
+        :param duree: durée du traitement (en secondes)
+        :type duree: float
+
+        :param erreur: exception levée lors du traitement, le cas échéant
+        :type erreur: None | Exception
+
+        :param etapes: mesure de chaque étape exécutée, si l'instrumentation est activée (cf. Sepim.modules.gestionnaire_d_instrumentation)
+        :type etapes: list[dict]
+
+        :param depuis_le_cache: si True, le résultat provient du cache des résultats (l'image n'a pas été traitée)
+        :type depuis_le_cache: bool
+
+        :return: le résumé du traitement : nom de l'image, nombre de sous-images, nombre de rotations, durée, erreur éventuelle,
+        mesures des étapes et provenance du résultat
+        :rtype: dict
+    """
+
+    return {"image": nom_de_l_image,
+            "nombre_de_sous_images": nombre_de_sous_images,
+            "nombre_de_rotations": sum(1 for angle in angles_de_rotation if angle != 0.0),
+            "duree": duree,
+            "erreur": None if erreur is None else "{}: {}".format(type(erreur).__name__, erreur),
+            "etapes": list(etapes),
+            "depuis_le_cache": depuis_le_cache}
+
+# ==================================================================================================
+# UTILISATION
+# ==================================================================================================
@@ -21,15 +21,41 @@ __status = 'dev'
 # IMPORTS
 # ==================================================================================================
 
-from numpy import array_equal, where, cos, sin, median
-from cv2 import cvtColor, Canny, HoughLines, COLOR_RGB2GRAY
-from math import pi, degrees, atan2
-from scipy import ndimage
+from Sepim.modules.gestionnaire_extraction_des_sous_images import calcul_masque_du_contenu
+
+from numpy import cos, sin, median, flatnonzero, array, sort, ceil, floor, uint8, float32, vstack, ptp
+from math import pi, degrees, radians, atan2
+
+# OpenCV (cv2) et scipy.ndimage sont importés à leur première utilisation, dans les méthodes concernées :
+# leur chargement est évité lorsqu'aucune sous-image n'est tournée
 
 # ==================================================================================================
 # INITIALISATIONS
 # ==================================================================================================
 
+# Taux de remplissage minimal (pixels hors séparation / pixels de la sous-image) d'une sous-image droite
+SEUIL_DE_REMPLISSAGE = 0.98
+
+# Taux minimal de pixels hors séparation sur chacun des quatre bords d'une sous-image droite
+SEUIL_DES_BORDS = 0.95
+
+# Modes d'estimation de l'angle de rotation disponibles
+MODES_D_ESTIMATION_DE_L_ANGLE = ("rectangle_minimal", "bords", "hough")
+
+# Préréglages de rotation disponibles : nom de l'interpolation (constante de cv2) utilisée par cv2.warpAffine
+# (le préréglage "qualite" effectue la rotation du traitement historique : scipy.ndimage.rotate, i.e. une interpolation par splines cubiques ;
+# les sous-images inclinées ne sont tournées comme par le traitement historique qu'avec le mode d'estimation de l'angle "hough")
+PRESETS_DE_ROTATION = {"plus_proche_voisin": "INTER_NEAREST",
+                       "bilineaire": "INTER_LINEAR",
+                       "bicubique": "INTER_CUBIC",
+                       "qualite": None}
+
+# Conversion en nuances de gris (constante de cv2) selon l'ordre des canaux des données de l'image
+CONVERSIONS_EN_NUANCES_DE_GRIS = {"RGB": "COLOR_RGB2GRAY", "BGR": "COLOR_BGR2GRAY"}
+
+# Dimension maximale de la copie réduite utilisée pour la détection de la rotation et l'estimation de l'angle
+DIMENSION_MAXIMALE_D_ESTIMATION = 512
+
 # ==================================================================================================
 # CLASSES
 # ==================================================================================================
@@ -45,10 +71,20 @@ class RotationDesImages(object):
 
         :ivar __couleur_de_separation: couleur de séparation entre les sous-images d'une image
         :type __couleur_de_separation: numpy.ndarray
+
+        :ivar __mode_d_estimation_de_l_angle: mode d'estimation de l'angle de rotation (cf. MODES_D_ESTIMATION_DE_L_ANGLE)
+        :type __mode_d_estimation_de_l_angle: str
+
+        :ivar __preset_de_rotation: préréglage de rotation (cf. PRESETS_DE_ROTATION)
+        :type __preset_de_rotation: str
+
+        :ivar __ordre_des_canaux: ordre des canaux des données de l'image (cf. CONVERSIONS_EN_NUANCES_DE_GRIS)
+        :type __ordre_des_canaux: str
     """
 
-    # ===============================================
-    def __init__(self, image, couleur_de_separation):
+    # =====================================================================================================================================
+    def __init__(self, image, couleur_de_separation, mode_d_estimation_de_l_angle = "rectangle_minimal", preset_de_rotation = "bilineaire",
+                 ordre_des_canaux = "RGB"):
         """
             Constructeur de la classe
 
@@ -57,11 +93,30 @@ class RotationDesImages(object):
 
             :param couleur_de_separation: couleur de séparation entre les sous-images d'une image
             :type couleur_de_separation: numpy.ndarray
+
+            :param mode_d_estimation_de_l_angle: mode d'estimation de l'angle de rotation :
+            - "rectangle_minimal" : rectangle d'aire minimale englobant le contenu de l'image
+            - "bords" : points de contact du contenu de l'image avec sa boîte englobante
+            - "hough" : détection des lignes principales de l'image (Canny puis HoughLines)
+            :type mode_d_estimation_de_l_angle: str
+
+            :param preset_de_rotation: préréglage de rotation :
+            - "plus_proche_voisin", "bilineaire" ou "bicubique" : rotation via cv2.warpAffine avec l'interpolation correspondante
+            - "qualite" : rotation historique, en pleine résolution, via scipy.ndimage.rotate (splines cubiques, plus lent) ;
+            à combiner avec le mode d'estimation "hough" pour tourner les sous-images inclinées comme le traitement historique
+            (les sous-images détectées droites ne sont pas tournées, cf. detection_rotation)
+            :type preset_de_rotation: str
+
+            :param ordre_des_canaux: ordre des canaux des données de l'image et de la couleur de séparation ("RGB" ou "BGR")
+            :type ordre_des_canaux: str
         """
 
         # Attributs d'instance initialisés via les paramètres du constructeur
         self.__image = image
         self.__couleur_de_separation = couleur_de_separation
+        self.__mode_d_estimation_de_l_angle = mode_d_estimation_de_l_angle
+        self.__preset_de_rotation = preset_de_rotation
+        self.__ordre_des_canaux = ordre_des_canaux
 
         # Autres attributs d'instance
         # N/A
@@ -69,50 +124,256 @@ class RotationDesImages(object):
     # ===========================
     def detection_rotation(self):
         """
-            Méthode qui permet de détectter si une image nécessite une rotation et de lancer la rotation si elle en a besoin
+            Méthode qui permet de détecter si une image nécessite une rotation et de lancer la rotation si elle en a besoin
+
+            La détection est faite en une seule fois à partir du masque du contenu d'une copie réduite de l'image (i.e. des pixels hors séparation) :
+            une image droite remplit sa boîte englobante, et chacun de ses quatre bords est entièrement hors séparation.
+            Les images droites ne passent donc pas par la rotation.
+            Si les statistiques du contenu de l'image ont été calculées lors de l'extraction (table des sommes cumulées), elles sont utilisées
+            directement : ni la copie réduite ni son masque ne sont calculés pour une image droite.
 
-            TODO: à améliorer, ne fonctionne pas terrible...
+            :return: l'angle de la rotation appliquée (en degrés, 0 si l'image est droite)
+            :rtype: float
         """
 
-        # initialisations
-        rotation = False        # paramètre de rotation (initialisé à False)
-        donnees_image = self.__image.get_donnees_image()
-        largeur = 0
+        statistiques_du_contenu = self.__image.get_statistiques_du_contenu()
 
-        # itération sur la hauteur de l'image
-        for hauteur in reversed(range(donnees_image.shape[0])):
+        # taux de remplissage de l'image et taux de pixels hors séparation sur chacun des bords, calculés lors de l'extraction
+        if statistiques_du_contenu is not None:
 
-            # si un pixel ne se trouve pas sur la séparation le paramètre de rotation passe à True
-            if not array_equal(donnees_image[hauteur, largeur], self.__couleur_de_separation):
+            taux_de_remplissage, taux_des_bords = statistiques_du_contenu
 
-                rotation = True
-                break
+        # sinon, calcul du masque du contenu de la copie réduite de l'image
+        else:
 
-        # si le paramètre de rotation est à True on lance la rotation de l'image
-        if rotation:
+            image_reduite, _ = self.calcul_image_reduite(self.__image.get_donnees_image())
+            masque_du_contenu = calcul_masque_du_contenu(image_reduite, self.__couleur_de_separation)
 
-            self.rotation_image()
+            taux_de_remplissage = masque_du_contenu.mean()
+            taux_des_bords = min(masque_du_contenu[0].mean(), masque_du_contenu[-1].mean(), masque_du_contenu[:, 0].mean(), masque_du_contenu[:, -1].mean())
 
-    # =======================
-    def rotation_image(self):
+        # l'image est droite : aucune rotation n'est nécessaire
+        if taux_de_remplissage >= SEUIL_DE_REMPLISSAGE and taux_des_bords >= SEUIL_DES_BORDS:
+
+            return 0.0
+
+        # sinon on lance la rotation de l'image
+        return self.rotation_image()
+
+    # ============================================
+    def calcul_image_reduite(self, donnees_image):
         """
-            Méthode qui permet de faire tourner une image
+            Méthode qui permet de calculer une copie réduite de l'image, dont la plus grande dimension vaut au plus DIMENSION_MAXIMALE_D_ESTIMATION
+            La réduction se fait au plus proche voisin afin de conserver exactement la couleur de séparation : des pixels isolés peuvent être perdus,
+            la copie n'est donc utilisée que pour les taux de la détection (cf. detection_rotation)
+
+            :param donnees_image: données de l'image
+            :type donnees_image: numpy.ndarray
+
+            :return: la copie réduite (les données elles-mêmes si aucune réduction n'est nécessaire) et le facteur de réduction
+            :rtype: tuple(numpy.ndarray, float)
         """
 
-        # Récupération des données de l'image à traiter
-        donnees_image = self.__image.get_donnees_image()
+        facteur_de_reduction = min(1.0, DIMENSION_MAXIMALE_D_ESTIMATION / float(max(donnees_image.shape[:2])))
 
-        # On modifie les pixels qui ont la même couleur que la séparation : on définit leur nouvelle couleur comme étant le noir
-        donnees_image[where((donnees_image == [181, 230, 29]).all(axis = 2))] = [0, 0, 0]
+        if facteur_de_reduction == 1.0:
+
+            return donnees_image, facteur_de_reduction
+
+        from cv2 import resize, INTER_NEAREST
+
+        return resize(donnees_image, None, fx = facteur_de_reduction, fy = facteur_de_reduction, interpolation = INTER_NEAREST), facteur_de_reduction
+
+    # ===============================================================
+    def calcul_copie_reduite(self, donnees_image, masque_du_contenu):
+        """
+            Méthode qui permet de calculer les copies réduites de l'image et de son masque du contenu utilisées pour l'estimation de l'angle,
+            dont la plus grande dimension vaut au plus DIMENSION_MAXIMALE_D_ESTIMATION
+            La réduction se fait par moyenne sur des zones (INTER_AREA) : un pixel de la copie réduite du masque est hors séparation
+            dès que sa zone contient un pixel hors séparation, le contenu (et en particulier les coins d'une image tournée) est donc conservé
+
+            :param donnees_image: données de l'image (pixels de la séparation déjà remplacés par du noir)
+            :type donnees_image: numpy.ndarray
+
+            :param masque_du_contenu: masque du contenu de l'image (True si le pixel n'est pas sur la séparation)
+            :type masque_du_contenu: numpy.ndarray
+
+            :return: les copies réduites des données et du masque (les données et le masque eux-mêmes si aucune réduction n'est nécessaire)
+            :rtype: tuple(numpy.ndarray, numpy.ndarray)
+        """
+
+        facteur_de_reduction = min(1.0, DIMENSION_MAXIMALE_D_ESTIMATION / float(max(donnees_image.shape[:2])))
+
+        if facteur_de_reduction == 1.0:
+
+            return donnees_image, masque_du_contenu
+
+        from cv2 import resize, INTER_AREA
+
+        image_reduite = resize(donnees_image, None, fx = facteur_de_reduction, fy = facteur_de_reduction, interpolation = INTER_AREA)
+        masque_reduit = resize(masque_du_contenu.astype(float32), None, fx = facteur_de_reduction, fy = facteur_de_reduction, interpolation = INTER_AREA) > 0
+
+        return image_reduite, masque_reduit
+
+    # ====================================================
+    def calcul_points_de_contact(self, masque_du_contenu):
+        """
+            Méthode qui permet de calculer les points de contact d'une image tournée avec les bords de la boîte englobante de son contenu
+            Pour une image tournée, ces points correspondent aux coins de l'image
+            Les bords sont ceux de la boîte englobante du contenu (et non ceux de l'image) : chacun d'eux contient au moins un pixel hors séparation
+
+            :param masque_du_contenu: masque du contenu de l'image (True si le pixel n'est pas sur la séparation)
+            :type masque_du_contenu: numpy.ndarray
+
+            :return: les positions (hauteur, largeur) des points le plus haut, le plus à gauche, le plus bas et le plus à droite,
+                     ou None si l'image n'a pas de contenu
+            :rtype: None | list[tuple(float, float)]
+        """
+
+        # boîte englobante du contenu
+        lignes_du_contenu = flatnonzero(masque_du_contenu.any(axis = 1))
+        colonnes_du_contenu = flatnonzero(masque_du_contenu.any(axis = 0))
+
+        if len(lignes_du_contenu) == 0:
+
+            return None
+
+        haut, bas = int(lignes_du_contenu[0]), int(lignes_du_contenu[-1])
+        gauche, droite = int(colonnes_du_contenu[0]), int(colonnes_du_contenu[-1])
+
+        # positions moyennes des pixels hors séparation sur chacun des bords
+        return [(float(haut), flatnonzero(masque_du_contenu[haut]).mean()),
+                (flatnonzero(masque_du_contenu[:, gauche]).mean(), float(gauche)),
+                (float(bas), flatnonzero(masque_du_contenu[bas]).mean()),
+                (flatnonzero(masque_du_contenu[:, droite]).mean(), float(droite))]
+
+    # ==========================================================
+    def estimation_angle_par_les_bords(self, points_de_contact):
+        """
+            Méthode qui permet d'estimer l'angle de rotation d'une image à partir de ses points de contact avec sa boîte englobante
+
+            Le côté qui relie le point le plus à gauche au point le plus haut (et celui qui relie le point le plus bas au point le plus à droite)
+            donne l'inclinaison de l'image.
+
+            :param points_de_contact: points le plus haut, le plus à gauche, le plus bas et le plus à droite (cf. calcul_points_de_contact)
+            :type points_de_contact: list[tuple(float, float)]
+
+            :return: l'angle (en degrés) dont il faut tourner l'image pour la redresser, au sens de scipy.ndimage.rotate
+            :rtype: float
+        """
+
+        point_haut, point_gauche, point_bas, point_droit = points_de_contact
+
+        # inclinaison des côtés gauche -> haut et bas -> droit, comprise entre 0 et 90 degrés
+        inclinaison = (degrees(atan2(point_gauche[0] - point_haut[0], point_haut[1] - point_gauche[1])) +
+                       degrees(atan2(point_bas[0] - point_droit[0], point_droit[1] - point_bas[1]))) / 2.0
+
+        # on retient le côté le plus proche de l'horizontale
+        return float(-inclinaison if inclinaison <= 45.0 else 90.0 - inclinaison)
+
+    # ==========================================================================================
+    def estimation_angle_de_rotation(self, donnees_image, masque_du_contenu, points_de_contact):
+        """
+            Méthode qui permet d'estimer l'angle de rotation d'une image selon le mode d'estimation sélectionné
+            Si le mode "hough" ne détecte aucune ligne, l'angle est estimé à partir des points de contact
+
+            :param donnees_image: données de l'image (pixels de la séparation déjà remplacés par du noir)
+            :type donnees_image: numpy.ndarray
+
+            :param masque_du_contenu: masque du contenu de l'image (True si le pixel n'est pas sur la séparation)
+            :type masque_du_contenu: numpy.ndarray
+
+            :param points_de_contact: points de contact de l'image avec sa boîte englobante (cf. calcul_points_de_contact)
+            :type points_de_contact: list[tuple(float, float)]
+
+            :return: l'angle (en degrés) dont il faut tourner l'image pour la redresser, au sens de scipy.ndimage.rotate
+            :rtype: float
+        """
+
+        angle = None
+
+        if self.__mode_d_estimation_de_l_angle == "rectangle_minimal":
+
+            angle = self.estimation_angle_par_rectangle_minimal(masque_du_contenu)
+
+        elif self.__mode_d_estimation_de_l_angle == "hough":
+
+            angle = self.estimation_angle_par_hough(donnees_image)
+
+        elif self.__mode_d_estimation_de_l_angle != "bords":
+
+            raise ValueError("Mode d'estimation de l'angle inconnu : {}".format(self.__mode_d_estimation_de_l_angle))
+
+        if angle is None:
+
+            angle = self.estimation_angle_par_les_bords(points_de_contact)
+
+        return angle
+
+    # ==================================================================
+    def estimation_angle_par_rectangle_minimal(self, masque_du_contenu):
+        """
+            Méthode qui permet d'estimer l'angle de rotation d'une image à partir du rectangle d'aire minimale englobant son contenu
+            Seuls les contours extérieurs du masque sont utilisés : le calcul est linéaire en nombre de pixels de l'image
+
+            :param masque_du_contenu: masque du contenu de l'image (True si le pixel n'est pas sur la séparation)
+            :type masque_du_contenu: numpy.ndarray
+
+            :return: l'angle (en degrés) dont il faut tourner l'image pour la redresser, au sens de scipy.ndimage.rotate,
+                     ou None si l'image n'a pas de contenu
+            :rtype: None | float
+        """
+
+        from cv2 import findContours, minAreaRect, boxPoints, RETR_EXTERNAL, CHAIN_APPROX_SIMPLE
+
+        # contours extérieurs du contenu de l'image
+        contours, _ = findContours(masque_du_contenu.astype(uint8), RETR_EXTERNAL, CHAIN_APPROX_SIMPLE)
+
+        if len(contours) == 0:
+
+            return None
+
+        # coins du rectangle d'aire minimale, sous la forme (largeur, hauteur)
+        coins = boxPoints(minAreaRect(vstack(contours)))
+
+        # inclinaison de chaque côté du rectangle, ramenée entre -45 et 45 degrés : on retient le côté le plus proche de l'horizontale
+        inclinaisons = []
+
+        for indice in range(4):
+
+            delta_largeur, delta_hauteur = coins[(indice + 1) % 4] - coins[indice]
+            inclinaison = (degrees(atan2(delta_hauteur, delta_largeur)) + 45.0) % 90.0 - 45.0
+            inclinaisons.append((abs(inclinaison), inclinaison))
+
+        return float(min(inclinaisons)[1])
+
+    # ==================================================
+    def estimation_angle_par_hough(self, donnees_image):
+        """
+            Méthode qui permet d'estimer l'angle de rotation d'une image à partir de sa première ligne principale (Canny puis HoughLines)
+
+            :param donnees_image: données de l'image (pixels de la séparation déjà remplacés par du noir)
+            :type donnees_image: numpy.ndarray
+
+            :return: l'angle (en degrés) dont il faut tourner l'image pour la redresser, au sens de scipy.ndimage.rotate,
+                     ou None si aucune ligne n'a été détectée
+            :rtype: None | float
+        """
+
+        import cv2
 
         # Conversion des données de l'image en nuances de gris
-        donnees_image_nuances_de_gris = cvtColor(donnees_image, COLOR_RGB2GRAY)
+        donnees_image_nuances_de_gris = cv2.cvtColor(donnees_image, getattr(cv2, CONVERSIONS_EN_NUANCES_DE_GRIS[self.__ordre_des_canaux]))
 
         # Appel à la méthode Canny afin de détecter les bords de l'image
-        bords_de_l_image = Canny(donnees_image_nuances_de_gris, 100, 100, apertureSize = 3)
+        bords_de_l_image = cv2.Canny(donnees_image_nuances_de_gris, 100, 100, apertureSize = 3)
 
         # Appel à la méthode HoughLines afin de détecter les lignes principales de l'image
-        lignes_principales_de_l_image = HoughLines(bords_de_l_image, 1, pi / 180.0, 100)
+        lignes_principales_de_l_image = cv2.HoughLines(bords_de_l_image, 1, pi / 180.0, 100)
+
+        if lignes_principales_de_l_image is None:
+
+            return None
 
         # Calcul de l'angle de rotation de l'image en utilisant la première ligne principale de l'image
         angles = []
@@ -134,16 +395,65 @@ class RotationDesImages(object):
             angle = degrees(atan2(y2 - y1, x2 - x1))
             angles.append(angle)
 
-        angle_median = median(angles)
+        return float(median(angles))
 
-        # Rotation de l'image
-        donnees_image_tournee = ndimage.rotate(donnees_image, angle_median)
+    # =======================
+    def rotation_image(self):
+        """
+            Méthode qui permet de faire tourner une image
+            Les coins de l'image sont pris sur le masque du contenu en pleine résolution. L'angle est estimé sur une copie réduite de l'image
+            et de son masque (cf. calcul_copie_reduite) : seule la rotation finale porte sur l'image en pleine résolution.
+
+            Le préréglage "qualite" reprend la rotation du traitement historique : l'angle est estimé en pleine résolution, la rotation est faite
+            par scipy et les limites de l'image tournée sont celles de ses bords (cf. calcul_limites_historiques). L'angle dépend toutefois
+            du mode d'estimation : l'image tournée n'est identique à celle du traitement historique qu'avec le mode d'estimation "hough"
+            (le mode par défaut, "rectangle_minimal", donne un angle différent).
+
+            :return: l'angle de la rotation appliquée (en degrés, 0 si l'image n'a pas de contenu)
+            :rtype: float
+        """
 
-        # Appel à la méthode Canny afin de détecter les bords de l'image tournée
-        bords_de_l_image_tournee = Canny(donnees_image_tournee, 100, 100, apertureSize = 3)
+        # Récupération des données de l'image à traiter : une copie privée est créée, les pixels de séparation étant modifiés ci-dessous
+        donnees_image = self.__image.get_donnees_image_modifiables()
+
+        # Calcul du masque du contenu et des coins de l'image (i.e. de ses points de contact avec la boîte englobante de son contenu)
+        masque_du_contenu = calcul_masque_du_contenu(donnees_image, self.__couleur_de_separation)
+        points_de_contact = self.calcul_points_de_contact(masque_du_contenu)
+
+        # image sans contenu : aucune rotation n'est appliquée
+        if points_de_contact is None:
+
+            return 0.0
+
+        # On modifie les pixels qui ont la même couleur que la séparation : on définit leur nouvelle couleur comme étant le noir
+        donnees_image[~masque_du_contenu] = [0, 0, 0]
+
+        preset_historique = PRESETS_DE_ROTATION.get(self.__preset_de_rotation, "") is None
+
+        # Estimation de l'angle de rotation de l'image (en pleine résolution pour le préréglage "qualite")
+        if preset_historique:
+
+            angle_median = self.estimation_angle_de_rotation(donnees_image, masque_du_contenu, points_de_contact)
+
+        else:
+
+            image_reduite, masque_reduit = self.calcul_copie_reduite(donnees_image, masque_du_contenu)
+            angle_median = self.estimation_angle_de_rotation(image_reduite, masque_reduit, points_de_contact)
+
+        # Rotation de l'image
+        donnees_image_tournee = self.application_de_la_rotation(donnees_image, angle_median)
 
         # Calcul des nouvelles limites de l'image tournée
-        largeur_point_A, hauteur_point_A, largeur_point_B, hauteur_point_B = self.calcul_nouvelles_limites_image_tournee(bords_de_l_image_tournee)
+        if preset_historique:
+
+            largeur_point_A, hauteur_point_A, largeur_point_B, hauteur_point_B = calcul_limites_historiques(donnees_image_tournee)
+
+        else:
+
+            largeur_point_A, hauteur_point_A, largeur_point_B, hauteur_point_B = self.calcul_nouvelles_limites_image_tournee(points_de_contact,
+                                                                                                                             donnees_image.shape,
+                                                                                                                             donnees_image_tournee.shape,
+                                                                                                                             angle_median)
 
         # Redéfinition des limites de l'image à traiter
         self.__image.set_limite_droite(largeur_point_B)
@@ -154,85 +464,157 @@ class RotationDesImages(object):
         # Redéfinition des données de l'image à traiter
         self.__image.set_donnees_image(donnees_image_tournee)
 
-    # ===================================================================
-    def calcul_nouvelles_limites_image_tournee(self, donnees_de_l_image):
+        return angle_median
+
+    # =========================================================
+    def application_de_la_rotation(self, donnees_image, angle):
+        """
+            Méthode qui permet d'appliquer la rotation à l'image en pleine résolution, selon le préréglage de rotation sélectionné
+            Quel que soit le préréglage, l'image tournée a les mêmes dimensions et la même géométrie que celle produite par scipy.ndimage.rotate
+
+            :param donnees_image: données de l'image
+            :type donnees_image: numpy.ndarray
+
+            :param angle: angle de la rotation (en degrés, au sens de scipy.ndimage.rotate)
+            :type angle: float
+
+            :return: les données de l'image tournée
+            :rtype: numpy.ndarray
+        """
+
+        if self.__preset_de_rotation not in PRESETS_DE_ROTATION:
+
+            raise ValueError("Préréglage de rotation inconnu : {}".format(self.__preset_de_rotation))
+
+        # préréglage "qualite" : rotation historique par scipy
+        if PRESETS_DE_ROTATION[self.__preset_de_rotation] is None:
+
+            from scipy import ndimage
+
+            return ndimage.rotate(donnees_image, angle)
+
+        import cv2
+
+        # autres préréglages : transformation affine par OpenCV, définie de la sortie vers l'entrée
+        matrice_de_rotation, centre_initial, centre_tourne, dimensions_tournees = calcul_geometrie_de_rotation(donnees_image.shape, angle)
+
+        # passage des coordonnées (hauteur, largeur) aux coordonnées (largeur, hauteur) d'OpenCV
+        decalage = centre_initial - matrice_de_rotation @ centre_tourne
+        matrice_affine = array([[matrice_de_rotation[1, 1], matrice_de_rotation[1, 0], decalage[1]],
+                                [matrice_de_rotation[0, 1], matrice_de_rotation[0, 0], decalage[0]]])
+
+        return cv2.warpAffine(donnees_image, matrice_affine, (int(dimensions_tournees[1]), int(dimensions_tournees[0])),
+                              flags = getattr(cv2, PRESETS_DE_ROTATION[self.__preset_de_rotation]) | cv2.WARP_INVERSE_MAP,
+                              borderMode = cv2.BORDER_CONSTANT, borderValue = 0)
+
+    # ====================================================================================================================
+    def calcul_nouvelles_limites_image_tournee(self, points_de_contact, dimensions_initiales, dimensions_tournees, angle):
         """
             Méthode qui permet de calculer les nouvelles limites d'une image qui a été tournée
             Les limites retournées sont les largeur et hauteur de deux points : les points A et B
             Le point A correspond au bord haut, gauche de l'image
             Le point B correspond au bord bas, droit de l'image
 
-            :param donnees_de_l_image: données de l'image
-            :type donnees_de_l_image: numpy.ndarray
+            Les coins de l'image (i.e. ses points de contact avec sa boîte englobante) sont transformés directement
+            par la rotation appliquée (cf. calcul_geometrie_de_rotation), sans parcourir les pixels de l'image tournée.
+            On retient le rectangle intérieur aux coins transformés afin d'exclure le fond ajouté par la rotation.
+
+            :param points_de_contact: coins de l'image avant rotation (cf. calcul_points_de_contact)
+            :type points_de_contact: list[tuple(float, float)]
+
+            :param dimensions_initiales: dimensions de l'image avant rotation
+            :type dimensions_initiales: tuple(int)
+
+            :param dimensions_tournees: dimensions de l'image après rotation
+            :type dimensions_tournees: tuple(int)
+
+            :param angle: angle de la rotation (en degrés, au sens de scipy.ndimage.rotate)
+            :type angle: float
 
             :return: les positions (en largeur et hauteur) des points A et B
             :rtype: tuple(int, int, int ,int)
         """
 
-        # initialisation de la condition d'arrêt de l'extraction
-        extraction_terminee = False
+        # géométrie de la rotation : position_initiale = matrice . (position_tournee - centre_tourne) + centre_initial
+        matrice_de_rotation, centre_initial, _, _ = calcul_geometrie_de_rotation(dimensions_initiales, angle)
+        centre_tourne = (array(dimensions_tournees[:2]) - 1) / 2.0
 
-        # boucle d'extraction
-        while not extraction_terminee:
+        # transformation des coins : position_tournee = transposée(matrice) . (position_initiale - centre_initial) + centre_tourne
+        coins_tournes = (array(points_de_contact) - centre_initial) @ matrice_de_rotation + centre_tourne
 
-            # initialisation de la condition de sortie sur la hauteur
-            condition_de_sortie_sur_la_hauteur = False
+        # rectangle intérieur : deuxième plus petite et deuxième plus grande coordonnée, selon chaque axe
+        hauteurs = sort(coins_tournes[:, 0])
+        largeurs = sort(coins_tournes[:, 1])
 
-            # itération sur la hauteur de l'image
-            for hauteur_actuelle in range(donnees_de_l_image.shape[0]):
+        hauteur_point_A = max(int(ceil(hauteurs[1])), 0)
+        largeur_point_A = max(int(ceil(largeurs[1])), 0)
 
-                # vérification de la condition de sortie sur la hauteur
-                if condition_de_sortie_sur_la_hauteur:
+        hauteur_point_B = min(int(floor(hauteurs[2])), dimensions_tournees[0] - 1)
+        largeur_point_B = min(int(floor(largeurs[2])), dimensions_tournees[1] - 1)
 
-                    break
+        return largeur_point_A, hauteur_point_A, largeur_point_B, hauteur_point_B
 
-                # itération sur la largeur de l'image
-                for largeur_actuelle in range(donnees_de_l_image.shape[1]):
+# ==================================================================================================
+# FONCTIONS
+# ==================================================================================================
 
-                    # le pixel courant n'est pas noir
-                    if donnees_de_l_image[hauteur_actuelle, largeur_actuelle] != 0:
 
-                        largeur_point_A = largeur_actuelle
-                        hauteur_point_A = hauteur_actuelle
+# ============================================================
+def calcul_geometrie_de_rotation(dimensions_initiales, angle):
+    """
+        Fonction qui permet de calculer la géométrie de la rotation d'une image, telle que définie par scipy.ndimage.rotate (avec agrandissement de l'image) :
+        en coordonnées (hauteur, largeur), position_initiale = matrice . (position_tournee - centre_tourne) + centre_initial
 
-                        condition_de_sortie_sur_la_hauteur = True
-                        extraction_terminee = True
-                        break
+        :param dimensions_initiales: dimensions de l'image avant rotation
+        :type dimensions_initiales: tuple(int)
 
-        # initialisation de la condition d'arrêt de l'extraction
-        extraction_terminee = False
+        :param angle: angle de la rotation (en degrés)
+        :type angle: float
 
-        # boucle d'extraction
-        while not extraction_terminee:
+        :return: la matrice de rotation, le centre de l'image initiale, le centre de l'image tournée et les dimensions (hauteur, largeur) de l'image tournée
+        :rtype: tuple(numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray)
+    """
 
-            # initialisation de la condition de sortie sur la hauteur
-            condition_de_sortie_sur_la_hauteur = False
+    cosinus, sinus = cos(radians(angle)), sin(radians(angle))
+    matrice_de_rotation = array([[cosinus, sinus], [-sinus, cosinus]])
 
-            # itération sur la hauteur de l'image
-            for hauteur_actuelle in reversed(range(donnees_de_l_image.shape[0])):
+    # dimensions de l'image tournée : étendue des coins de l'image initiale après rotation
+    hauteur, largeur = dimensions_initiales[:2]
+    coins_tournes = matrice_de_rotation @ array([[0, 0, hauteur, hauteur], [0, largeur, 0, largeur]])
+    dimensions_tournees = (ptp(coins_tournes, axis = 1) + 0.5).astype(int)
 
-                # vérification de la condition de sortie sur la hauteur
-                if condition_de_sortie_sur_la_hauteur:
-                    break
+    centre_initial = (array([hauteur, largeur]) - 1) / 2.0
+    centre_tourne = (dimensions_tournees - 1) / 2.0
 
-                # itération sur la largeur de l'image
-                for largeur_actuelle in reversed(range(donnees_de_l_image.shape[1])):
+    return matrice_de_rotation, centre_initial, centre_tourne, dimensions_tournees
 
-                    # le pixel courant n'est pas noir
-                    if donnees_de_l_image[hauteur_actuelle, largeur_actuelle] != 0:
 
-                        largeur_point_B = largeur_actuelle
-                        hauteur_point_B = hauteur_actuelle
+# ====================================================
+def calcul_limites_historiques(donnees_image_tournee):
+    """
+        Fonction qui permet de calculer les limites d'une image tournée telles que les calculait le traitement historique (préréglage "qualite") :
+        le point A est le premier pixel des bords de l'image tournée (Canny) dans l'ordre de lecture, le point B est le dernier
 
-                        condition_de_sortie_sur_la_hauteur = True
-                        extraction_terminee = True
-                        break
+        :param donnees_image_tournee: données de l'image tournée
+        :type donnees_image_tournee: numpy.ndarray
 
-        return largeur_point_A, hauteur_point_A, largeur_point_B, hauteur_point_B
+        :return: les positions (en largeur et hauteur) des points A et B (l'image entière si elle n'a aucun bord)
+        :rtype: tuple(int, int, int ,int)
+    """
 
-# ==================================================================================================
-# FONCTIONS
-# ==================================================================================================
+    import cv2
+
+    hauteur, largeur = donnees_image_tournee.shape[:2]
+    positions_des_bords = flatnonzero(cv2.Canny(donnees_image_tournee, 100, 100, apertureSize = 3))
+
+    if len(positions_des_bords) == 0:
+
+        return 0, 0, largeur - 1, hauteur - 1
+
+    hauteur_point_A, largeur_point_A = divmod(int(positions_des_bords[0]), largeur)
+    hauteur_point_B, largeur_point_B = divmod(int(positions_des_bords[-1]), largeur)
+
+    return largeur_point_A, hauteur_point_A, largeur_point_B, hauteur_point_B
 
 # ==================================================================================================
 # UTILISATION
@@ -19,7 +19,8 @@ __status = 'dev'
 # IMPORTS
 # ==================================================================================================
 
-import matplotlib.pyplot as plt
+# matplotlib n'est utilisé que pour le débogage (cf. ObjetImage.affichage_image) : il est importé à sa première utilisation
+# OpenCV (cv2) n'est utilisé que pour convertir en couleurs les données d'une image à palette (cf. ObjetImage.expansion_de_la_palette)
 
 # ==================================================================================================
 # INITIALISATIONS
@@ -47,8 +48,12 @@ class ObjetImage(object):
         :ivar __limite_droite: limite droite de l'image
         :type __limite_droite: long
 
-        :ivar __donnees_image: les données de l'image
+        :ivar __donnees_image: les données de l'image (par défaut, une vue sur les données de l'image chargée)
         :type __donnees_image: None | numpy.ndarray
+
+        :ivar __statistiques_du_contenu: taux de remplissage et taux minimal de pixels hors séparation des quatre bords de l'image,
+        s'ils ont été calculés lors de l'extraction (cf. Sepim.modules.gestionnaire_du_masque_de_separation.TableDesSommesCumulees)
+        :type __statistiques_du_contenu: None | tuple(float, float)
     """
 
     # ===========================================================================
@@ -74,6 +79,7 @@ class ObjetImage(object):
         self.__limite_basse = limite_basse
         self.__limite_droite = limite_droite
         self.__donnees_image = None
+        self.__statistiques_du_contenu = None
 
     # =========================
     def get_limite_haute(self):
@@ -127,6 +133,34 @@ class ObjetImage(object):
 
         return self.__donnees_image
 
+    # ====================================
+    def get_statistiques_du_contenu(self):
+        """
+            Accesseur de l'attribut __statistiques_du_contenu
+
+            :return: __statistiques_du_contenu
+            :rtype: None | tuple(float, float)
+        """
+
+        return self.__statistiques_du_contenu
+
+    # ======================================
+    def get_donnees_image_modifiables(self):
+        """
+            Accesseur de l'attribut __donnees_image, destiné aux traitements qui modifient les données
+            Si les données sont une vue sur l'image chargée, elles sont d'abord remplacées par une copie privée (copie à l'écriture) :
+            l'image chargée et les autres sous-images ne sont jamais modifiées
+
+            :return: les données de l'image, propres à la sous-image
+            :rtype: None | numpy.ndarray
+        """
+
+        if self.__donnees_image is not None and self.__donnees_image.base is not None:
+
+            self.__donnees_image = self.__donnees_image.copy()
+
+        return self.__donnees_image
+
     # =================================
     def set_limite_haute(self, valeur):
         """
@@ -176,6 +210,7 @@ class ObjetImage(object):
         """
             Mutateur de l'attribut __donnees_image
             Cette méthode permet de définir les données associée
+            Les données sont une vue (sans copie) sur l'image chargée : cf. get_donnees_image_modifiables avant toute modification
 
             :param image_chargee: l'image chargée
             :type image_chargee: numpy.ndarray
@@ -183,7 +218,7 @@ class ObjetImage(object):
 
         try:
 
-            extraction_des_donnees = image_chargee[self.__limite_haute:self.__limite_basse + 1, self.__limite_gauche:self.__limite_droite + 1].copy()
+            extraction_des_donnees = image_chargee[self.__limite_haute:self.__limite_basse + 1, self.__limite_gauche:self.__limite_droite + 1]
 
         except Exception:
 
@@ -192,6 +227,37 @@ class ObjetImage(object):
 
         self.__donnees_image = extraction_des_donnees
 
+    # =========================================================================
+    def set_statistiques_du_contenu(self, taux_de_remplissage, taux_des_bords):
+        """
+            Mutateur de l'attribut __statistiques_du_contenu
+
+            :param taux_de_remplissage: taux de remplissage (pixels hors séparation / pixels) de l'image
+            :type taux_de_remplissage: float
+
+            :param taux_des_bords: taux minimal de pixels hors séparation des quatre bords de l'image
+            :type taux_des_bords: float
+        """
+
+        self.__statistiques_du_contenu = (taux_de_remplissage, taux_des_bords)
+
+    # =========================================
+    def expansion_de_la_palette(self, palette):
+        """
+            Méthode qui permet de remplacer des données en indices de palette (cf. set_donnees_image sur un plan d'indices) par leurs couleurs
+            Les données obtenues sont propres à l'image (elles ne sont plus une vue sur l'image chargée)
+            Chaque canal est obtenu par une table de correspondance sur les indices (un octet par pixel, sans indices intermédiaires en entiers longs)
+
+            :param palette: couleur de chaque indice de la palette (256 entrées), dans l'ordre des canaux retenu
+            :type palette: numpy.ndarray
+        """
+
+        import cv2
+
+        if self.__donnees_image is not None:
+
+            self.__donnees_image = cv2.merge([cv2.LUT(self.__donnees_image, palette[:, canal].copy()) for canal in range(palette.shape[1])])
+
     # =====================================
     def affichage_limites_de_l_image(self):
         """
@@ -214,6 +280,8 @@ class ObjetImage(object):
 
         try:
 
+            import matplotlib.pyplot as plt
+
             plt.imshow(self.__donnees_image)
             plt.show()
 
@@ -0,0 +1,258 @@
+# coding=utf-8
+
+"""
+    Tests du gestionnaire d'une image (Sepim.modules.gestionnaire_d_image)
+"""
+
+# ==================================================================================================
+# IMPORTS
+# ==================================================================================================
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import cv2
+import numpy
+
+from Sepim.modules.gestionnaire_d_image import GestionnaireDImage, conversion_dans_une_memoire_projetee, decodage_d_une_image_a_palette
+
+# ==================================================================================================
+# INITIALISATIONS
+# ==================================================================================================
+
+# Couleur de séparation utilisée par les tests (RGB)
+COULEUR_DE_SEPARATION = numpy.array([181, 230, 29], dtype = numpy.uint8)
+
+# Dossier des images fournies avec le projet
+DOSSIER_DES_DONNEES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Donnees")
+
+# ==================================================================================================
+# CLASSES
+# ==================================================================================================
+
+
+# ============================================================
+class TestConversionDansUneMemoireProjetee(unittest.TestCase):
+    """
+        Tests de la conversion bande par bande d'une image dans une mémoire projetée
+    """
+
+    # =================================================
+    def test_identique_a_une_conversion_complete(self):
+        """
+            Quelle que soit la hauteur des bandes, la mémoire projetée contient les pixels d'une conversion de l'image entière
+        """
+
+        generateur = numpy.random.default_rng(0)
+        image = generateur.integers(0, 256, (37, 23, 3), dtype = numpy.uint8)
+
+        for hauteur_des_bandes in (1, 2, 5, 36, 37, 1000):
+
+            with self.subTest(hauteur_des_bandes = hauteur_des_bandes):
+
+                numpy.testing.assert_array_equal(conversion_dans_une_memoire_projetee(image, hauteur_des_bandes),
+                                                 cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+                numpy.testing.assert_array_equal(conversion_dans_une_memoire_projetee(image, hauteur_des_bandes, None), image)
+
+    # ================================
+    def test_image_en_flottants(self):
+        """
+            Une image en flottants (de 0 à 1) est convertie en entiers (de 0 à 255), comme une conversion de l'image entière
+        """
+
+        image = numpy.random.default_rng(1).random((19, 11, 3), dtype = numpy.float32)
+
+        numpy.testing.assert_array_equal(conversion_dans_une_memoire_projetee(image, 4),
+                                         (cv2.cvtColor(image, cv2.COLOR_BGR2RGB) * 255).astype(numpy.uint8))
+
+
+# ==========================================
+class TestOrdreDesCanaux(unittest.TestCase):
+    """
+        Tests de l'ordre des canaux "BGR" : les sous-images extraites, tournées et sauvegardées sont celles de l'ordre "RGB" par défaut
+    """
+
+    # ==============
+    def setUp(self):
+        """
+            Création d'un dossier de sauvegarde temporaire
+        """
+
+        self.dossier = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dossier)
+
+    # =====================================
+    def test_identique_a_l_ordre_rgb(self):
+        """
+            Pour chaque moteur d'extraction et chaque préréglage de rotation, l'ordre "BGR" donne les mêmes sous-images et les mêmes fichiers
+            (test.png comporte des sous-images à redresser)
+        """
+
+        for nom in ("t1.png", "test.png"):
+
+            for moteur_d_extraction, preset_de_rotation in (("historique", "bilineaire"), ("composantes_connexes", "qualite")):
+
+                with self.subTest(image = nom, moteur_d_extraction = moteur_d_extraction, preset_de_rotation = preset_de_rotation):
+
+                    parametres = {"moteur_d_extraction": moteur_d_extraction, "preset_de_rotation": preset_de_rotation}
+                    reference = traitement_complet(nom, DOSSIER_DES_DONNEES, os.path.join(self.dossier, "rgb"), **parametres)
+                    traitement = traitement_complet(nom, DOSSIER_DES_DONNEES, os.path.join(self.dossier, "bgr"), ordre_des_canaux = "BGR", **parametres)
+
+                    self.assertTrue(reference["sous_images"])
+                    comparaison_des_traitements(self, reference, traitement, "BGR")
+
+                    shutil.rmtree(os.path.join(self.dossier, "rgb"))
+                    shutil.rmtree(os.path.join(self.dossier, "bgr"))
+
+
+# ==========================================
+class TestImagesAPalette(unittest.TestCase):
+    """
+        Tests du décodage des images à palette : l'extraction sur le plan d'indices, puis l'expansion de la palette des seules sous-images,
+        donnent les sous-images et les fichiers du chargement en couleurs, dans l'ordre "RGB" comme dans l'ordre "BGR"
+    """
+
+    # ==============
+    def setUp(self):
+        """
+            Création d'un dossier de travail contenant une image à palette (mode "P" de Pillow)
+        """
+
+        self.dossier = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dossier)
+
+        creation_d_une_image_a_palette(os.path.join(self.dossier, "palette.png"))
+
+    # =================================================
+    def test_identique_au_chargement_en_couleurs(self):
+        """
+            Pour chaque moteur d'extraction, les sous-images et les fichiers issus du plan d'indices (ordres "RGB" et "BGR")
+            sont ceux du chargement de l'image en couleurs, dans l'ordre "RGB" par défaut
+        """
+
+        self.assertIsNotNone(decodage_d_une_image_a_palette(os.path.join(self.dossier, "palette.png")))
+
+        for moteur_d_extraction in ("historique", "composantes_connexes", "decoupe_xy"):
+
+            reference = traitement_complet("palette.png", self.dossier, os.path.join(self.dossier, "reference_" + moteur_d_extraction),
+                                           moteur_d_extraction = moteur_d_extraction)
+
+            self.assertEqual(len(reference["sous_images"]), 4)
+            self.assertTrue(any(reference["angles"]))
+
+            for ordre_des_canaux in ("RGB", "BGR"):
+
+                with self.subTest(moteur_d_extraction = moteur_d_extraction, ordre_des_canaux = ordre_des_canaux):
+
+                    traitement = traitement_complet("palette.png", self.dossier, os.path.join(self.dossier, ordre_des_canaux + "_" + moteur_d_extraction),
+                                                    moteur_d_extraction = moteur_d_extraction, ordre_des_canaux = ordre_des_canaux,
+                                                    decodage_des_palettes = True)
+
+                    comparaison_des_traitements(self, reference, traitement, ordre_des_canaux)
+
+# ==================================================================================================
+# FONCTIONS
+# ==================================================================================================
+
+
+# ========================================================
+def creation_d_une_image_a_palette(nom_absolu_de_l_image):
+    """
+        Fonction qui permet de créer une image à palette (PNG indexé) : sur un fond de la couleur de séparation, présente sous deux indices
+        de la palette, deux sous-images droites, une sous-image inclinée et une sous-image d'un pixel de large
+
+        :param nom_absolu_de_l_image: nom absolu du fichier de l'image
+        :type nom_absolu_de_l_image: str
+    """
+
+    from PIL import Image, ImageDraw
+
+    generateur = numpy.random.default_rng(0)
+
+    # palette : séparation (indices 0 et 7), puis des couleurs quelconques
+    palette = generateur.integers(0, 256, (16, 3), dtype = numpy.uint8)
+    palette[[0, 7]] = COULEUR_DE_SEPARATION
+
+    # fond de séparation mêlant ses deux indices
+    indices = numpy.where(generateur.random((150, 200)) < 0.5, 0, 7).astype(numpy.uint8)
+    indices[10:50, 10:70] = generateur.integers(1, 7, (40, 60))
+    indices[10:60, 90:180] = 3
+    indices[100:140, 160:161] = 12
+
+    image = Image.fromarray(indices, mode = "P")
+    image.putpalette(palette.flatten().tolist())
+    ImageDraw.Draw(image).polygon([(20, 95), (110, 75), (118, 115), (28, 135)], fill = 9)
+    image.save(nom_absolu_de_l_image)
+
+
+# ============================================================================================
+def comparaison_des_traitements(cas_de_test, reference, traitement, ordre_des_canaux = "RGB"):
+    """
+        Fonction qui permet de comparer le traitement complet d'une image à un traitement de référence, dans l'ordre "RGB"
+
+        :param cas_de_test: cas de test qui effectue les vérifications
+        :type cas_de_test: unittest.TestCase
+
+        :param reference: traitement de référence (cf. traitement_complet)
+        :type reference: dict
+
+        :param traitement: traitement comparé (cf. traitement_complet)
+        :type traitement: dict
+
+        :param ordre_des_canaux: ordre des canaux des sous-images du traitement comparé ("RGB" ou "BGR")
+        :type ordre_des_canaux: str
+    """
+
+    cas_de_test.assertEqual(traitement["limites"], reference["limites"])
+    cas_de_test.assertEqual(traitement["angles"], reference["angles"])
+    cas_de_test.assertEqual(len(traitement["sous_images"]), len(reference["sous_images"]))
+
+    for donnees_image, donnees_de_reference in zip(traitement["sous_images"], reference["sous_images"]):
+
+        numpy.testing.assert_array_equal(donnees_image[..., ::-1] if ordre_des_canaux == "BGR" else donnees_image, donnees_de_reference)
+
+    cas_de_test.assertEqual(sorted(traitement["fichiers"]), sorted(reference["fichiers"]))
+
+    for nom, donnees_image in reference["fichiers"].items():
+
+        numpy.testing.assert_array_equal(traitement["fichiers"][nom], donnees_image)
+
+
+# ========================================================================
+def traitement_complet(nom, dossier, dossier_de_sauvegarde, **parametres):
+    """
+        Fonction qui permet de charger une image, d'en extraire les sous-images, de les tourner et de les sauvegarder
+
+        :param nom: nom de l'image
+        :type nom: str
+
+        :param dossier: dossier contenant l'image
+        :type dossier: str
+
+        :param dossier_de_sauvegarde: dossier de sauvegarde des sous-images
+        :type dossier_de_sauvegarde: str
+
+        :param parametres: autres paramètres du gestionnaire de l'image
+
+        :return: les limites extraites, les angles de rotation, les données de chaque sous-image tournée (dans l'ordre des canaux retenu)
+        et les données (BGR) de chaque fichier sauvegardé, indexées par son nom
+        :rtype: dict
+    """
+
+    gestionnaire = GestionnaireDImage(nom, dossier, COULEUR_DE_SEPARATION, dossier_de_sauvegarde_des_sous_images = dossier_de_sauvegarde, **parametres)
+    gestionnaire.chargement_de_l_image_a_traiter()
+    gestionnaire.extraction_des_sous_images()
+    angles = gestionnaire.rotation_des_sous_images()
+    gestionnaire.sauvegarde_des_sous_images()
+
+    return {"limites": gestionnaire.get_limites_des_sous_images_extraites(),
+            "angles": list(angles),
+            "sous_images": [numpy.array(sous_image.get_donnees_image()) for sous_image in gestionnaire.get_liste_des_sous_images()],
+            "fichiers": {fichier: cv2.imread(os.path.join(dossier_de_sauvegarde, fichier), cv2.IMREAD_UNCHANGED)
+                         for fichier in os.listdir(dossier_de_sauvegarde)}}
+
+# ==================================================================================================
+# UTILISATION
+# ==================================================================================================
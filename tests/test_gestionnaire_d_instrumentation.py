@@ -0,0 +1,109 @@
+# coding=utf-8
+
+"""
+    Tests de l'instrumentation du traitement (Sepim.modules.gestionnaire_d_instrumentation)
+"""
+
+# ==================================================================================================
+# IMPORTS
+# ==================================================================================================
+
+import unittest
+
+from Sepim.modules.gestionnaire_d_instrumentation import creation_du_rapport, cumul_des_resultats, conversion_en_openmetrics
+
+# ==================================================================================================
+# INITIALISATIONS
+# ==================================================================================================
+
+# ==================================================================================================
+# CLASSES
+# ==================================================================================================
+
+
+# ===================================================
+class TestConversionEnOpenMetrics(unittest.TestCase):
+    """
+        Tests de la conversion d'un rapport au format OpenMetrics : les valeurs cumulées sont des compteurs, le pic de mémoire une jauge
+    """
+
+    # ================================
+    def test_compteurs_et_jauge(self):
+        """
+            Seul le pic de mémoire est une jauge ; les échantillons des compteurs sont suffixés par "_total"
+            et les durées sont en secondes
+        """
+
+        texte = conversion_en_openmetrics(creation_du_rapport([creation_d_un_resume(1.5, 100)]))
+        lignes = texte.splitlines()
+        types = {ligne.split()[2]: ligne.split()[3] for ligne in lignes if ligne.startswith("# TYPE ")}
+
+        self.assertEqual(lignes[-1], "# EOF")
+        self.assertEqual(sorted(famille for famille, type_de_la_metrique in types.items() if type_de_la_metrique == "gauge"),
+                         ["sepim_etape_pic_de_memoire_bytes"])
+        self.assertIn("sepim_etape_duree_seconds", types)
+        self.assertIn("# UNIT sepim_etape_duree_seconds seconds", lignes)
+
+        for ligne in lignes:
+
+            if ligne.startswith("#"):
+
+                continue
+
+            nom_de_l_echantillon = ligne.split()[0].split("{")[0]
+
+            if nom_de_l_echantillon.endswith("_total"):
+
+                self.assertEqual(types.get(nom_de_l_echantillon[:-len("_total")]), "counter", ligne)
+
+            else:
+
+                self.assertEqual(types.get(nom_de_l_echantillon), "gauge", ligne)
+
+    # ==============================
+    def test_valeurs_cumulees(self):
+        """
+            Les compteurs cumulent les lots successifs ; la jauge conserve le pic de mémoire le plus élevé
+        """
+
+        rapport = creation_du_rapport([creation_d_un_resume(1.5, 100)])
+        cumul_des_resultats(rapport, [creation_d_un_resume(2.0, 40, "ValueError: image illisible")])
+        lignes = conversion_en_openmetrics(rapport).splitlines()
+
+        self.assertIn("sepim_images_traitees_total 2", lignes)
+        self.assertIn("sepim_images_en_echec_total 1", lignes)
+        self.assertIn("sepim_images_depuis_le_cache_total 0", lignes)
+        self.assertIn('sepim_etape_duree_seconds_total{etape="extraction"} 3.5', lignes)
+        self.assertIn('sepim_etape_pic_de_memoire_bytes{etape="extraction"} 100', lignes)
+
+# ==================================================================================================
+# FONCTIONS
+# ==================================================================================================
+
+
+# =============================================================
+def creation_d_un_resume(duree, pic_de_memoire, erreur = None):
+    """
+        Fonction qui permet de créer le résumé du traitement d'une image dont seule l'étape d'extraction est mesurée
+
+        :param duree: durée de l'étape d'extraction (en secondes)
+        :type duree: float
+
+        :param pic_de_memoire: pic de mémoire de l'étape d'extraction (en octets)
+        :type pic_de_memoire: int
+
+        :param erreur: erreur du traitement, le cas échéant
+        :type erreur: None | str
+
+        :return: le résumé du traitement
+        :rtype: dict
+    """
+
+    return {"image": "image.png", "nombre_de_sous_images": 2, "nombre_de_rotations": 0, "duree": duree, "erreur": erreur,
+            "depuis_le_cache": False,
+            "etapes": [{"etape": "extraction", "duree": duree, "sous_images": 2, "pixels": 1000, "rotations": 0, "pic_de_memoire": pic_de_memoire,
+                        "erreur": None}]}
+
+# ==================================================================================================
+# UTILISATION
+# ==================================================================================================
@@ -0,0 +1,190 @@
+# coding=utf-8
+
+"""
+    Tests de la surveillance du dossier des images à traiter (Sepim.modules.gestionnaire_de_surveillance_du_dossier)
+"""
+
+# ==================================================================================================
+# IMPORTS
+# ==================================================================================================
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from Sepim.modules.gestionnaire_des_images_a_traiter import GestionnaireDesImagesATraiter
+from Sepim.modules.gestionnaire_de_surveillance_du_dossier import SurveillanceDuDossier
+
+# ==================================================================================================
+# INITIALISATIONS
+# ==================================================================================================
+
+# Dossier des images fournies avec le projet
+DOSSIER_DES_DONNEES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Donnees")
+
+# ==================================================================================================
+# CLASSES
+# ==================================================================================================
+
+
+# =================================================
+class TestSurveillanceDuDossier(unittest.TestCase):
+    """
+        Tests de la classe SurveillanceDuDossier, cycle par cycle (délai de stabilité nul : une image est prête dès que son état
+        est inchangé entre deux scrutations)
+    """
+
+    # ==============
+    def setUp(self):
+        """
+            Création d'un dossier surveillé vide et d'une surveillance dont les images traitées à chaque cycle sont consignées
+        """
+
+        self.dossier = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dossier)
+
+        os.mkdir(os.path.join(self.dossier, "images"))
+        self.images_traitees = []
+        self.surveillance = self.creation_d_une_surveillance()
+
+    # =====================================================================================================
+    def creation_d_une_surveillance(self, dossier_de_sauvegarde = "sortie", taille_de_l_historique = 1000):
+        """
+            Méthode qui permet de créer une surveillance du dossier des images, dont les ressources sont ouvertes pour la durée du test
+
+            :param dossier_de_sauvegarde: dossier de sauvegarde des sous-images (relatif au dossier de travail)
+            :type dossier_de_sauvegarde: str
+
+            :param taille_de_l_historique: nombre maximal de résumés d'images conservés dans le rapport du traitement
+            :type taille_de_l_historique: int
+
+            :return: la surveillance
+            :rtype: SurveillanceDuDossier
+        """
+
+        self.gestionnaire = GestionnaireDesImagesATraiter(dossier_contenant_les_images = os.path.join(self.dossier, "images"),
+                                                          dossier_de_sauvegarde = os.path.join(self.dossier, dossier_de_sauvegarde),
+                                                          taille_de_l_historique_des_rapports = taille_de_l_historique)
+        self.gestionnaire.ouverture_des_ressources()
+        self.addCleanup(self.gestionnaire.fermeture_des_ressources)
+
+        return SurveillanceDuDossier(self.gestionnaire, delai_de_stabilite = 0.0,
+                                     traitement_des_resultats = lambda resultats: self.images_traitees.extend(resume["image"] for resume in resultats))
+
+    # ====================================================
+    def depot(self, nom, image = "t1.png", taille = None):
+        """
+            Méthode qui permet de déposer (ou de remplacer) une image fournie dans le dossier surveillé, éventuellement tronquée (copie en cours)
+
+            :param nom: nom de l'image dans le dossier surveillé
+            :type nom: str
+
+            :param image: nom de l'image fournie
+            :type image: str
+
+            :param taille: nombre d'octets copiés (None : image entière)
+            :type taille: None | int
+        """
+
+        with open(os.path.join(DOSSIER_DES_DONNEES, image), "rb") as fichier:
+
+            contenu = fichier.read()
+
+        with open(os.path.join(self.dossier, "images", nom), "wb") as fichier:
+
+            fichier.write(contenu if taille is None else contenu[:taille])
+
+    # ===================================================
+    def test_fichier_en_cours_de_copie_puis_stable(self):
+        """
+            Un fichier qui grandit entre deux scrutations n'est pas traité ; une fois stable, il est traité une seule fois
+        """
+
+        self.depot("a.png", taille = 1000)
+        self.assertEqual(self.surveillance.cycle_de_surveillance(), [])
+
+        self.depot("a.png", taille = 5000)
+        self.assertEqual(self.surveillance.cycle_de_surveillance(), [])
+
+        self.depot("a.png")
+        self.assertEqual(self.surveillance.cycle_de_surveillance(), [])
+        self.assertEqual(self.images_traitees, [])
+
+        resume, = self.surveillance.cycle_de_surveillance()
+
+        self.assertEqual(resume["image"], "a.png")
+        self.assertIsNone(resume["erreur"])
+        self.assertTrue(os.listdir(os.path.join(self.dossier, "sortie")))
+
+        for _ in range(3):
+
+            self.assertEqual(self.surveillance.cycle_de_surveillance(), [])
+
+        self.assertEqual(self.images_traitees, ["a.png"])
+
+    # ==============================================
+    def test_fichier_modifie_traite_a_nouveau(self):
+        """
+            Une image traitée puis modifiée (autre taille, autre date de modification) est traitée à nouveau, une fois stable
+        """
+
+        self.depot("a.png")
+        self.surveillance.cycle_de_surveillance()
+        self.surveillance.cycle_de_surveillance()
+
+        self.depot("a.png", "t2.png")
+        self.assertEqual(self.surveillance.cycle_de_surveillance(), [])
+        self.surveillance.cycle_de_surveillance()
+        self.surveillance.cycle_de_surveillance()
+
+        self.assertEqual(self.images_traitees, ["a.png", "a.png"])
+        self.assertEqual(self.surveillance.get_index_des_fichiers_traites()["a.png"][0], os.path.getsize(os.path.join(DOSSIER_DES_DONNEES, "t2.png")))
+
+    # ===========================================
+    def test_historique_des_rapports_borne(self):
+        """
+            Le rapport cumule les compteurs de tous les lots, mais ne conserve que les résumés des dernières images
+        """
+
+        self.surveillance = self.creation_d_une_surveillance(taille_de_l_historique = 2)
+
+        for nom in ("a.png", "b.png", "c.png"):
+
+            self.depot(nom)
+            self.surveillance.cycle_de_surveillance()
+            self.surveillance.cycle_de_surveillance()
+
+        rapport = self.gestionnaire.get_rapport_du_traitement()
+
+        self.assertEqual(self.images_traitees, ["a.png", "b.png", "c.png"])
+        self.assertEqual(rapport["images_traitees"], 3)
+        self.assertEqual([resume["image"] for resume in rapport["images"]], ["b.png", "c.png"])
+
+    # =============================================================
+    def test_dossier_de_sauvegarde_dans_le_dossier_surveille(self):
+        """
+            Les sous-images ne peuvent pas être sauvegardées dans le dossier surveillé (elles seraient traitées à leur tour) ;
+            un sous-dossier n'est pas scruté
+        """
+
+        surveillance = self.creation_d_une_surveillance(os.path.join("images", "."))
+
+        with self.assertRaises(ValueError):
+
+            surveillance.surveillance(nombre_de_cycles = 1)
+
+        surveillance = self.creation_d_une_surveillance(os.path.join("images", "sortie"))
+        self.depot("a.png")
+        surveillance.surveillance(nombre_de_cycles = 4)
+
+        self.assertEqual(self.images_traitees, ["a.png"])
+        self.assertTrue(os.listdir(os.path.join(self.dossier, "images", "sortie")))
+
+# ==================================================================================================
+# FONCTIONS
+# ==================================================================================================
+
+# ==================================================================================================
+# UTILISATION
+# ==================================================================================================
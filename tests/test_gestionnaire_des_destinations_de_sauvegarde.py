@@ -0,0 +1,211 @@
+# coding=utf-8
+
+"""
+    Tests des destinations de sauvegarde des sous-images (Sepim.modules.gestionnaire_des_destinations_de_sauvegarde)
+"""
+
+# ==================================================================================================
+# IMPORTS
+# ==================================================================================================
+
+import os
+import shutil
+import tarfile
+import zipfile
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy
+
+from Sepim.modules.gestionnaire_des_destinations_de_sauvegarde import DESTINATIONS_DE_SAUVEGARDE, SUFFIXE_DES_FICHIERS_EN_COURS
+
+# ==================================================================================================
+# INITIALISATIONS
+# ==================================================================================================
+
+# Nombre de sous-images ajoutées à chaque destination
+NOMBRE_DE_SOUS_IMAGES = 12
+
+# ==================================================================================================
+# CLASSES
+# ==================================================================================================
+
+
+# ====================================================
+class TestDestinationsDeSauvegarde(unittest.TestCase):
+    """
+        Tests des destinations tar, zip et npz : les sous-images relues sont celles ajoutées, quel que soit l'ordre des canaux,
+        et le fichier n'apparaît sous son nom définitif qu'à la fermeture
+    """
+
+    # ==============
+    def setUp(self):
+        """
+            Création d'un dossier de sauvegarde et de sous-images aléatoires (RGB)
+        """
+
+        self.dossier = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dossier)
+
+        generateur = numpy.random.default_rng(0)
+        self.sous_images = {"sous_image_{}.png".format(indice): generateur.integers(0, 256, (*generateur.integers(1, 40, 2).tolist(), 3),
+                                                                                    dtype = numpy.uint8)
+                            for indice in range(NOMBRE_DE_SOUS_IMAGES)}
+
+    # ==========================================================
+    def ecriture(self, nom_de_la_destination, ordre_des_canaux):
+        """
+            Méthode qui permet d'ajouter toutes les sous-images à une destination (dans un dossier propre à l'ordre des canaux),
+            depuis plusieurs fils d'exécution, puis de la fermer
+
+            :param nom_de_la_destination: nom de la destination (cf. DESTINATIONS_DE_SAUVEGARDE)
+            :type nom_de_la_destination: str
+
+            :param ordre_des_canaux: ordre des canaux des données transmises à la destination ("RGB" ou "BGR")
+            :type ordre_des_canaux: str
+
+            :return: les noms absolus des fichiers écrits
+            :rtype: list[str]
+        """
+
+        dossier_de_sauvegarde = os.path.join(self.dossier, ordre_des_canaux)
+        nom_absolu = os.path.join(dossier_de_sauvegarde, "image.{}".format(nom_de_la_destination))
+        destination = DESTINATIONS_DE_SAUVEGARDE[nom_de_la_destination](dossier_de_sauvegarde, "image", ordre_des_canaux)
+
+        with ThreadPoolExecutor(4) as executeur:
+
+            list(executeur.map(lambda element: destination.ajout(element[0], conversion(element[1], ordre_des_canaux)),
+                               self.sous_images.items()))
+
+        # avant la fermeture, seul le fichier temporaire existe
+        self.assertTrue(os.path.isfile(nom_absolu + SUFFIXE_DES_FICHIERS_EN_COURS))
+        self.assertFalse(os.path.exists(nom_absolu))
+
+        fichiers_ecrits = destination.fermeture()
+
+        self.assertEqual(fichiers_ecrits, [nom_absolu])
+        self.assertFalse(os.path.exists(nom_absolu + SUFFIXE_DES_FICHIERS_EN_COURS))
+
+        return fichiers_ecrits
+
+    # =========================
+    def test_archive_tar(self):
+        """
+            Les sous-images décodées depuis l'archive tar sont celles ajoutées
+        """
+
+        for ordre_des_canaux in ("RGB", "BGR"):
+
+            with self.subTest(ordre_des_canaux = ordre_des_canaux):
+
+                nom_absolu, = self.ecriture("tar", ordre_des_canaux)
+
+                with tarfile.open(nom_absolu) as archive:
+
+                    contenus = {entree.name: archive.extractfile(entree).read() for entree in archive.getmembers()}
+
+                self.comparaison_des_contenus_encodes(contenus)
+
+    # =========================
+    def test_archive_zip(self):
+        """
+            Les sous-images décodées depuis l'archive zip sont celles ajoutées
+        """
+
+        for ordre_des_canaux in ("RGB", "BGR"):
+
+            with self.subTest(ordre_des_canaux = ordre_des_canaux):
+
+                nom_absolu, = self.ecriture("zip", ordre_des_canaux)
+
+                with zipfile.ZipFile(nom_absolu) as archive:
+
+                    contenus = {nom: archive.read(nom) for nom in archive.namelist()}
+
+                self.comparaison_des_contenus_encodes(contenus)
+
+    # ==========================
+    def test_tableaux_npz(self):
+        """
+            Les tableaux relus depuis le fichier npz sont les sous-images ajoutées (RGB, contiguës), nommées sans extension
+        """
+
+        for ordre_des_canaux in ("RGB", "BGR"):
+
+            with self.subTest(ordre_des_canaux = ordre_des_canaux):
+
+                nom_absolu, = self.ecriture("npz", ordre_des_canaux)
+
+                with numpy.load(nom_absolu) as tableaux:
+
+                    self.assertEqual(sorted(tableaux.files), sorted(os.path.splitext(nom)[0] for nom in self.sous_images))
+
+                    for nom, donnees_image in self.sous_images.items():
+
+                        tableau = tableaux[os.path.splitext(nom)[0]]
+
+                        self.assertTrue(tableau.flags.c_contiguous)
+                        numpy.testing.assert_array_equal(tableau, donnees_image)
+
+    # =================================
+    def test_ecriture_abandonnee(self):
+        """
+            Une écriture abandonnée ne laisse ni fichier définitif, ni fichier temporaire
+        """
+
+        for nom_de_la_destination in ("tar", "zip", "npz"):
+
+            with self.subTest(destination = nom_de_la_destination):
+
+                nom_absolu = os.path.join(self.dossier, "image.{}".format(nom_de_la_destination))
+                destination = DESTINATIONS_DE_SAUVEGARDE[nom_de_la_destination](self.dossier, "image")
+                destination.ajout("sous_image_0.png", self.sous_images["sous_image_0.png"])
+
+                self.assertEqual(destination.fermeture(reussite = False), [])
+                self.assertFalse(os.path.exists(nom_absolu))
+                self.assertFalse(os.path.exists(nom_absolu + SUFFIXE_DES_FICHIERS_EN_COURS))
+
+    # ===================================================
+    def comparaison_des_contenus_encodes(self, contenus):
+        """
+            Méthode qui permet de comparer les sous-images encodées lues dans une archive aux sous-images ajoutées
+
+            :param contenus: contenu encodé de chaque entrée de l'archive, indexé par son nom
+            :type contenus: dict[str, bytes]
+        """
+
+        self.assertEqual(sorted(contenus), sorted(self.sous_images))
+
+        for nom, donnees_image in self.sous_images.items():
+
+            decodage = cv2.imdecode(numpy.frombuffer(contenus[nom], dtype = numpy.uint8), cv2.IMREAD_UNCHANGED)
+            numpy.testing.assert_array_equal(cv2.cvtColor(decodage, cv2.COLOR_BGR2RGB), donnees_image)
+
+# ==================================================================================================
+# FONCTIONS
+# ==================================================================================================
+
+
+# ==============================================
+def conversion(donnees_image, ordre_des_canaux):
+    """
+        Fonction qui permet de présenter les données RGB d'une sous-image dans l'ordre des canaux transmis à la destination
+        (une vue inversée, non contiguë, pour l'ordre BGR)
+
+        :param donnees_image: données RGB de la sous-image
+        :type donnees_image: numpy.ndarray
+
+        :param ordre_des_canaux: ordre des canaux ("RGB" ou "BGR")
+        :type ordre_des_canaux: str
+
+        :return: les données de la sous-image dans l'ordre demandé
+        :rtype: numpy.ndarray
+    """
+
+    return donnees_image[..., ::-1] if ordre_des_canaux == "BGR" else donnees_image
+
+# ==================================================================================================
+# UTILISATION
+# ==================================================================================================
@@ -0,0 +1,250 @@
+# coding=utf-8
+
+"""
+    Tests du traitement d'un ensemble d'images (Sepim.modules.gestionnaire_des_images_a_traiter)
+"""
+
+# ==================================================================================================
+# IMPORTS
+# ==================================================================================================
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import cv2
+import numpy
+
+from Sepim.modules.gestionnaire_d_image import GestionnaireDImage
+from Sepim.modules.gestionnaire_des_images_a_traiter import GestionnaireDesImagesATraiter
+
+# ==================================================================================================
+# INITIALISATIONS
+# ==================================================================================================
+
+# Dossier des images fournies avec le projet
+DOSSIER_DES_DONNEES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Donnees")
+
+# Images fournies traitées par les tests (test.png comporte des sous-images à redresser)
+IMAGES_TRAITEES = ("t1.png", "t3.png", "test_x9.png", "test.png")
+
+# Nom de l'image illisible ajoutée au dossier des images
+IMAGE_ILLISIBLE = "illisible.png"
+
+# Durée maximale (en secondes) du traitement d'un lot comportant une image en échec, au-delà de laquelle le traitement est considéré bloqué
+DUREE_MAXIMALE_DU_TRAITEMENT = 60
+
+# ==================================================================================================
+# CLASSES
+# ==================================================================================================
+
+
+# =====================================================
+class GestionnaireDImageDefaillant(GestionnaireDImage):
+    """
+        Gestionnaire d'une image dont la rotation des sous-images échoue (échec au milieu du traitement, après le chargement et l'extraction)
+    """
+
+    # =================================
+    def rotation_des_sous_images(self):
+        """
+            Méthode qui lève une exception à la place de la rotation des sous-images
+
+            :raise RuntimeError: toujours
+        """
+
+        raise RuntimeError("rotation impossible")
+
+
+# =============================================
+class TestModesDeTraitement(unittest.TestCase):
+    """
+        Tests des modes de traitement d'un ensemble d'images : chaque mode produit les mêmes résumés et les mêmes fichiers que le traitement séquentiel,
+        et l'échec d'une image est consigné dans son résumé sans interrompre le traitement des autres
+    """
+
+    # ==============
+    def setUp(self):
+        """
+            Création d'un dossier de travail contenant des images fournies et une image illisible, puis traitement séquentiel de référence
+        """
+
+        self.dossier = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dossier)
+
+        os.mkdir(os.path.join(self.dossier, "images"))
+
+        for nom in IMAGES_TRAITEES:
+
+            shutil.copy(os.path.join(DOSSIER_DES_DONNEES, nom), os.path.join(self.dossier, "images"))
+
+        with open(os.path.join(self.dossier, "images", IMAGE_ILLISIBLE), "wb") as fichier:
+
+            fichier.write(b"ceci n'est pas une image")
+
+        self.resumes_de_reference = self.traitement("sequentiel")
+
+    # ========================================================
+    def traitement(self, dossier_de_sauvegarde, **parametres):
+        """
+            Méthode qui permet de traiter les images du dossier de travail
+
+            :param dossier_de_sauvegarde: dossier de sauvegarde des sous-images (relatif au dossier de travail)
+            :type dossier_de_sauvegarde: str
+
+            :param parametres: autres paramètres du gestionnaire des images à traiter
+
+            :return: le résumé du traitement de chaque image, sans les durées ni les mesures des étapes, trié par image
+            :rtype: list[dict]
+        """
+
+        gestionnaire = GestionnaireDesImagesATraiter(dossier_contenant_les_images = os.path.join(self.dossier, "images"),
+                                                     dossier_de_sauvegarde = os.path.join(self.dossier, dossier_de_sauvegarde), **parametres)
+
+        return sorted(({cle: valeur for cle, valeur in resume.items() if cle not in ("duree", "etapes")}
+                       for resume in gestionnaire.lancement_du_traitement_des_images()), key = lambda resume: resume["image"])
+
+    # ==================================================================================
+    def comparaison_au_traitement_sequentiel(self, dossier_de_sauvegarde, **parametres):
+        """
+            Méthode qui permet de comparer les résumés et les fichiers d'un mode de traitement à ceux du traitement séquentiel
+
+            :param dossier_de_sauvegarde: dossier de sauvegarde des sous-images du mode comparé (relatif au dossier de travail)
+            :type dossier_de_sauvegarde: str
+
+            :param parametres: paramètres du gestionnaire des images à traiter propres au mode comparé
+        """
+
+        resumes = self.traitement(dossier_de_sauvegarde, **parametres)
+
+        self.assertEqual(resumes, self.resumes_de_reference)
+        self.assertEqual([resume["image"] for resume in resumes if resume["erreur"] is not None], [IMAGE_ILLISIBLE])
+        self.assertTrue(any(resume["nombre_de_rotations"] for resume in resumes))
+
+        reference = lecture_des_fichiers(os.path.join(self.dossier, "sequentiel"))
+        fichiers = lecture_des_fichiers(os.path.join(self.dossier, dossier_de_sauvegarde))
+
+        self.assertEqual(sorted(fichiers), sorted(reference))
+
+        for nom, donnees_image in reference.items():
+
+            with self.subTest(fichier = nom):
+
+                numpy.testing.assert_array_equal(fichiers[nom], donnees_image)
+
+    # ===================================
+    def test_ensemble_de_processus(self):
+        """
+            Le traitement par un ensemble de processus produit les mêmes résumés et les mêmes fichiers que le traitement séquentiel ;
+            l'image illisible est consignée en échec
+        """
+
+        self.comparaison_au_traitement_sequentiel("processus", nombre_de_processus = 2)
+
+    # ================================
+    def test_traitement_en_flux(self):
+        """
+            Le traitement en flux produit les mêmes résumés et les mêmes fichiers que le traitement séquentiel, quels que soient
+            le nombre de fils d'exécution des étapes et la taille des files ; l'image illisible est consignée en échec
+        """
+
+        for indice, (parallelisme, taille_des_files) in enumerate((({}, 2),
+                                                                   ({"chargement": 1, "extraction": 1, "rotation": 1, "sauvegarde": 1}, 1),
+                                                                   ({"chargement": 3, "extraction": 2, "rotation": 3, "sauvegarde": 1}, 1))):
+
+            with self.subTest(parallelisme = parallelisme, taille_des_files = taille_des_files):
+
+                self.comparaison_au_traitement_sequentiel("flux_{}".format(indice), parallelisme_des_etapes = parallelisme,
+                                                          taille_des_files = taille_des_files)
+
+    # ============================================================
+    def traitement_avec_une_image_defaillante(self, **parametres):
+        """
+            Méthode qui permet de traiter un lot d'images dont l'une échoue lors de sa rotation, et de vérifier que le traitement se termine
+            et que cet échec est consigné dans son résumé sans empêcher le traitement des autres images
+
+            :param parametres: paramètres du gestionnaire des images à traiter propres au mode testé
+        """
+
+        gestionnaire = GestionnaireDesImagesATraiter(dossier_contenant_les_images = os.path.join(self.dossier, "images"),
+                                                     dossier_de_sauvegarde = os.path.join(self.dossier, "defaillant"), **parametres)
+        couleur_de_separation = numpy.array([181, 230, 29])
+        gestionnaires = [GestionnaireDImage("t1.png", os.path.join(self.dossier, "images"), couleur_de_separation,
+                                            dossier_de_sauvegarde_des_sous_images = os.path.join(self.dossier, "defaillant")),
+                         GestionnaireDImageDefaillant("t3.png", os.path.join(self.dossier, "images"), couleur_de_separation,
+                                                      dossier_de_sauvegarde_des_sous_images = os.path.join(self.dossier, "defaillant")),
+                         GestionnaireDImage("test_x9.png", os.path.join(self.dossier, "images"), couleur_de_separation,
+                                            dossier_de_sauvegarde_des_sous_images = os.path.join(self.dossier, "defaillant"))]
+
+        resultats = []
+
+        # traitement dans un fil d'exécution séparé : un traitement bloqué fait échouer le test au lieu de l'interrompre
+        gestionnaire.ouverture_des_ressources()
+        fil = threading.Thread(target = lambda: resultats.extend(gestionnaire.traitement_des_gestionnaires(gestionnaires)), daemon = True)
+        fil.start()
+        fil.join(DUREE_MAXIMALE_DU_TRAITEMENT)
+
+        self.assertFalse(fil.is_alive(), "traitement bloqué")
+        gestionnaire.fermeture_des_ressources()
+
+        resumes = {resume["image"]: resume for resume in resultats}
+
+        self.assertEqual(sorted(resumes), ["t1.png", "t3.png", "test_x9.png"])
+        self.assertEqual(resumes["t3.png"]["erreur"], "RuntimeError: rotation impossible")
+        self.assertEqual(resumes["t3.png"]["nombre_de_sous_images"], 4)
+        self.assertIsNone(resumes["t1.png"]["erreur"])
+        self.assertIsNone(resumes["test_x9.png"]["erreur"])
+        self.assertEqual(gestionnaire.get_rapport_du_traitement()["images_en_echec"], 1)
+        self.assertEqual(len(os.listdir(os.path.join(self.dossier, "defaillant"))),
+                         resumes["t1.png"]["nombre_de_sous_images"] + resumes["test_x9.png"]["nombre_de_sous_images"])
+
+    # =============================================
+    def test_echec_d_une_image_en_sequentiel(self):
+        """
+            Traitement séquentiel : l'échec d'une image au milieu de son traitement est consigné dans son résumé
+        """
+
+        self.traitement_avec_une_image_defaillante()
+
+    # =================================================
+    def test_echec_d_une_image_dans_un_processus(self):
+        """
+            Ensemble de processus : l'échec d'une image au milieu de son traitement, dans un processus, est consigné dans son résumé
+        """
+
+        self.traitement_avec_une_image_defaillante(nombre_de_processus = 2)
+
+    # =======================================
+    def test_echec_d_une_image_en_flux(self):
+        """
+            Traitement en flux : l'image en échec n'est pas transmise à l'étape suivante, son échec est consigné dans son résumé
+            et le traitement se termine (des files d'une place imposent que chaque étape continue de consommer après l'échec)
+        """
+
+        self.traitement_avec_une_image_defaillante(parallelisme_des_etapes = {"chargement": 1, "extraction": 1, "rotation": 1, "sauvegarde": 1},
+                                                   taille_des_files = 1)
+
+# ==================================================================================================
+# FONCTIONS
+# ==================================================================================================
+
+
+# ================================
+def lecture_des_fichiers(dossier):
+    """
+        Fonction qui permet de lire les sous-images sauvegardées dans un dossier
+
+        :param dossier: dossier de sauvegarde des sous-images
+        :type dossier: str
+
+        :return: les données de chaque sous-image, indexées par le nom de son fichier
+        :rtype: dict[str, numpy.ndarray]
+    """
+
+    return {nom: cv2.imread(os.path.join(dossier, nom), cv2.IMREAD_UNCHANGED) for nom in os.listdir(dossier)}
+
+# ==================================================================================================
+# UTILISATION
+# ==================================================================================================
@@ -0,0 +1,169 @@
+# coding=utf-8
+
+"""
+    Tests du cache des résultats (Sepim.modules.gestionnaire_du_cache_des_resultats)
+"""
+
+# ==================================================================================================
+# IMPORTS
+# ==================================================================================================
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from Sepim.modules.gestionnaire_des_images_a_traiter import GestionnaireDesImagesATraiter
+from Sepim.modules.gestionnaire_du_cache_des_resultats import CacheDesResultats
+
+# ==================================================================================================
+# INITIALISATIONS
+# ==================================================================================================
+
+# Dossier des images fournies avec le projet
+DOSSIER_DES_DONNEES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Donnees")
+
+# ==================================================================================================
+# CLASSES
+# ==================================================================================================
+
+
+# =============================================
+class TestCacheDesResultats(unittest.TestCase):
+    """
+        Tests de la classe CacheDesResultats, seule ou au travers du traitement des images
+    """
+
+    # ==============
+    def setUp(self):
+        """
+            Création d'un dossier de travail contenant une image à traiter
+        """
+
+        self.dossier = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dossier)
+
+        os.mkdir(os.path.join(self.dossier, "images"))
+        shutil.copy(os.path.join(DOSSIER_DES_DONNEES, "t1.png"), os.path.join(self.dossier, "images"))
+
+    # =====================================================
+    def traitement(self, dossier_de_sauvegarde = "sortie"):
+        """
+            Méthode qui permet de traiter les images du dossier de travail avec le cache du dossier de travail
+
+            :param dossier_de_sauvegarde: dossier de sauvegarde des sous-images (relatif au dossier de travail)
+            :type dossier_de_sauvegarde: str
+
+            :return: le résumé du traitement de chaque image
+            :rtype: list[dict]
+        """
+
+        gestionnaire = GestionnaireDesImagesATraiter(dossier_contenant_les_images = os.path.join(self.dossier, "images"),
+                                                     dossier_de_sauvegarde = os.path.join(self.dossier, dossier_de_sauvegarde),
+                                                     dossier_du_cache = os.path.join(self.dossier, "cache"))
+
+        return gestionnaire.lancement_du_traitement_des_images()
+
+    # ===================================
+    def test_absence_puis_presence(self):
+        """
+            Une image est traitée lors du premier traitement, puis son résultat est lu dans le cache lors du second
+        """
+
+        premier, = self.traitement()
+        second, = self.traitement()
+
+        self.assertIsNone(premier["erreur"])
+        self.assertFalse(premier["depuis_le_cache"])
+        self.assertTrue(second["depuis_le_cache"])
+        self.assertEqual(second["nombre_de_sous_images"], premier["nombre_de_sous_images"])
+        self.assertEqual(second["nombre_de_rotations"], premier["nombre_de_rotations"])
+
+    # =============================================
+    def test_sous_image_sauvegardee_reecrite(self):
+        """
+            Une sous-image sauvegardée réécrite depuis le traitement (date de modification différente) invalide l'entrée de l'image
+        """
+
+        self.traitement()
+
+        nom = os.path.join(self.dossier, "sortie", sorted(os.listdir(os.path.join(self.dossier, "sortie")))[0])
+        etat = os.stat(nom)
+        os.utime(nom, ns = (etat.st_atime_ns, etat.st_mtime_ns + 1))
+
+        resume, = self.traitement()
+
+        self.assertFalse(resume["depuis_le_cache"])
+        self.assertTrue(self.traitement()[0]["depuis_le_cache"])
+
+    # =====================================
+    def test_changement_de_parametre(self):
+        """
+            Un autre dossier de sauvegarde est un autre paramètre du traitement : l'image est traitée à nouveau
+        """
+
+        self.traitement()
+
+        self.assertFalse(self.traitement("autre_sortie")[0]["depuis_le_cache"])
+        self.assertTrue(os.listdir(os.path.join(self.dossier, "autre_sortie")))
+        self.assertTrue(self.traitement()[0]["depuis_le_cache"])
+
+    # ==========================================
+    def test_eviction_de_la_moins_recente(self):
+        """
+            Au-delà de la taille maximale, l'entrée la moins récemment utilisée est supprimée (une lecture compte comme une utilisation)
+        """
+
+        cache = CacheDesResultats(os.path.join(self.dossier, "cache"))
+        entree = {"image": "image.png", "limites_des_sous_images": [], "angles_de_rotation": [], "fichiers_sauvegardes": []}
+
+        cache.ecriture("a", entree)
+        cache.ecriture("b", entree)
+
+        # dates d'utilisation distinctes : "a" puis "b", puis lecture de "a"
+        taille_d_une_entree = os.path.getsize(cache.calcul_du_chemin("a"))
+        os.utime(cache.calcul_du_chemin("a"), (1, 1))
+        os.utime(cache.calcul_du_chemin("b"), (2, 2))
+        self.assertIsNotNone(cache.lecture("a"))
+
+        cache = CacheDesResultats(os.path.join(self.dossier, "cache"), 2 * taille_d_une_entree)
+        cache.ecriture("c", entree)
+
+        self.assertIsNotNone(cache.lecture("a"))
+        self.assertIsNone(cache.lecture("b"))
+        self.assertIsNotNone(cache.lecture("c"))
+
+    # ==========================
+    def test_invalidation(self):
+        """
+            L'invalidation supprime une entrée, ou toutes les entrées
+        """
+
+        cache = CacheDesResultats(os.path.join(self.dossier, "cache"))
+        entree = {"image": "image.png", "limites_des_sous_images": [], "angles_de_rotation": [], "fichiers_sauvegardes": []}
+
+        for cle in ("a", "b", "c"):
+
+            cache.ecriture(cle, entree)
+
+        self.assertEqual(cache.invalidation("a"), 1)
+        self.assertIsNone(cache.lecture("a"))
+        self.assertIsNotNone(cache.lecture("b"))
+
+        self.assertEqual(cache.invalidation(), 2)
+        self.assertIsNone(cache.lecture("b"))
+        self.assertEqual(cache.invalidation("a"), 0)
+
+        # après l'invalidation de tout le cache, l'image est traitée à nouveau
+        self.traitement()
+        cache.invalidation()
+
+        self.assertFalse(self.traitement()[0]["depuis_le_cache"])
+
+# ==================================================================================================
+# FONCTIONS
+# ==================================================================================================
+
+# ==================================================================================================
+# UTILISATION
+# ==================================================================================================
@@ -0,0 +1,189 @@
+# coding=utf-8
+
+"""
+    Tests du masque de séparation (Sepim.modules.gestionnaire_du_masque_de_separation)
+"""
+
+# ==================================================================================================
+# IMPORTS
+# ==================================================================================================
+
+import unittest
+
+import numpy
+
+from Sepim.modules.gestionnaire_du_masque_de_separation import MasqueDeSeparationCompact, TableDesSommesCumulees
+
+# ==================================================================================================
+# INITIALISATIONS
+# ==================================================================================================
+
+# Nombre de masques aléatoires comparés à leur équivalent numpy
+NOMBRE_DE_MASQUES_ALEATOIRES = 40
+
+# ==================================================================================================
+# CLASSES
+# ==================================================================================================
+
+
+# =====================================================
+class TestMasqueDeSeparationCompact(unittest.TestCase):
+    """
+        Tests de la classe MasqueDeSeparationCompact, comparée à un masque numpy sur des masques aléatoires
+        (largeurs quelconques, plages de toutes longueurs, effacements débordant de l'image)
+    """
+
+    # =================================
+    def test_comparaison_a_numpy(self):
+        """
+            Chaque requête du masque compact renvoie le même résultat qu'un parcours du masque numpy, avant et après des effacements
+        """
+
+        generateur = numpy.random.default_rng(0)
+
+        for essai in range(NOMBRE_DE_MASQUES_ALEATOIRES):
+
+            with self.subTest(essai = essai):
+
+                separation = creation_d_un_masque_aleatoire(generateur)
+                hauteur, largeur = separation.shape
+                masque = MasqueDeSeparationCompact(~separation)
+
+                for _ in range(4):
+
+                    self.comparaison(masque, separation, generateur)
+
+                    haut, bas = sorted(generateur.integers(0, hauteur + 3, 2).tolist())
+                    gauche, droite = sorted(generateur.integers(0, largeur + 3, 2).tolist())
+
+                    masque.effacement(haut, gauche, bas, droite)
+                    separation[haut:bas + 1, gauche:droite + 1] = True
+
+                self.comparaison(masque, separation, generateur)
+
+    # ====================================================
+    def comparaison(self, masque, separation, generateur):
+        """
+            Méthode qui permet de comparer chaque requête du masque compact au masque numpy de référence
+
+            :param masque: masque compact
+            :type masque: MasqueDeSeparationCompact
+
+            :param separation: masque numpy de référence (True si le pixel est sur la séparation)
+            :type separation: numpy.ndarray
+
+            :param generateur: générateur de nombres aléatoires
+            :type generateur: numpy.random.Generator
+        """
+
+        hauteur, largeur = separation.shape
+
+        for ligne in range(hauteur):
+
+            hors_separation = numpy.flatnonzero(~separation[ligne]).tolist()
+            sur_la_separation = numpy.flatnonzero(separation[ligne]).tolist()
+
+            numpy.testing.assert_array_equal(masque.calcul_masque_de_la_ligne(ligne), separation[ligne])
+            self.assertEqual(masque.premier_pixel_hors_separation(ligne), hors_separation[0] if hors_separation else -1)
+
+            for colonne in range(largeur):
+
+                self.assertEqual(masque.est_sur_la_separation(ligne, colonne), separation[ligne, colonne])
+                self.assertEqual(masque.est_sur_la_separation(ligne, colonne - largeur), separation[ligne, colonne])
+
+            for colonne in range(largeur + 1):
+
+                self.assertEqual(masque.dernier_pixel_hors_separation_avant(ligne, colonne),
+                                 max([position for position in hors_separation if position < colonne], default = -1))
+
+            for debut in range(largeur):
+
+                for fin in range(debut, largeur):
+
+                    self.assertEqual(masque.dernier_pixel_sur_la_separation(ligne, debut, fin),
+                                     max([position for position in sur_la_separation if debut <= position <= fin], default = -1))
+
+        for _ in range(10):
+
+            lignes = tuple(generateur.choice(hauteur, size = generateur.integers(1, min(hauteur, 4) + 1), replace = False).tolist())
+            colonne = int(generateur.integers(0, largeur + 1))
+            positions = numpy.flatnonzero(separation[list(lignes)].all(axis = 0)).tolist()
+
+            self.assertEqual(masque.prochain_pixel_sur_la_separation(lignes, colonne),
+                             min([position for position in positions if position >= colonne], default = largeur))
+
+
+# ==================================================
+class TestTableDesSommesCumulees(unittest.TestCase):
+    """
+        Tests de la classe TableDesSommesCumulees, comparée aux sommes d'un masque numpy sur des masques aléatoires
+        (blocs petits devant l'image, pour que les rectangles couvrent des blocs intérieurs et des blocs de contour)
+    """
+
+    # =================================
+    def test_comparaison_a_numpy(self):
+        """
+            Chaque requête (rectangles débordant de l'image compris) et chaque effacement renvoient le même nombre de pixels que le masque numpy
+        """
+
+        generateur = numpy.random.default_rng(1)
+
+        for essai in range(NOMBRE_DE_MASQUES_ALEATOIRES):
+
+            taille_des_blocs = int(generateur.choice((1, 2, 3, 5, 8, 64)))
+
+            with self.subTest(essai = essai, taille_des_blocs = taille_des_blocs):
+
+                contenu = ~creation_d_un_masque_aleatoire(generateur)
+                hauteur, largeur = contenu.shape
+                table = TableDesSommesCumulees(contenu, taille_des_blocs)
+
+                for _ in range(20):
+
+                    haut, bas = sorted(generateur.integers(0, hauteur + 3, 2).tolist())
+                    gauche, droite = sorted(generateur.integers(0, largeur + 3, 2).tolist())
+                    zone = contenu[haut:bas + 1, gauche:droite + 1]
+
+                    self.assertEqual(table.nombre_de_pixels_hors_separation(haut, gauche, bas, droite), zone.sum())
+                    self.assertEqual(table.est_entierement_sur_la_separation(haut, gauche, bas, droite), not zone.any())
+                    self.assertAlmostEqual(table.taux_de_remplissage(haut, gauche, bas, droite), zone.mean() if zone.size else 0.0)
+
+                    if generateur.random() < 0.5:
+
+                        self.assertEqual(table.effacement(haut, gauche, bas, droite), zone.sum())
+                        contenu[haut:bas + 1, gauche:droite + 1] = False
+
+                    self.assertEqual(table.get_nombre_total_de_pixels_hors_separation(), contenu.sum())
+
+# ==================================================================================================
+# FONCTIONS
+# ==================================================================================================
+
+
+# =============================================
+def creation_d_un_masque_aleatoire(generateur):
+    """
+        Fonction qui permet de créer un masque de séparation aléatoire : un fond aléatoire sur lequel sont posés des rectangles de contenu
+        (les plages hors séparation sont ainsi de toutes longueurs)
+
+        :param generateur: générateur de nombres aléatoires
+        :type generateur: numpy.random.Generator
+
+        :return: le masque (True si le pixel est sur la séparation)
+        :rtype: numpy.ndarray
+    """
+
+    hauteur, largeur = generateur.integers(1, 40, 2).tolist()
+    separation = generateur.random((hauteur, largeur)) < generateur.random()
+
+    for _ in range(generateur.integers(0, 4)):
+
+        haut, bas = sorted(generateur.integers(0, hauteur, 2).tolist())
+        gauche, droite = sorted(generateur.integers(0, largeur, 2).tolist())
+        separation[haut:bas + 1, gauche:droite + 1] = False
+
+    return separation
+
+# ==================================================================================================
+# UTILISATION
+# ==================================================================================================
@@ -0,0 +1,271 @@
+# coding=utf-8
+
+"""
+    Tests des moteurs vectorisés d'extraction des sous-images (Sepim.modules.gestionnaire_extraction_des_sous_images)
+"""
+
+# ==================================================================================================
+# IMPORTS
+# ==================================================================================================
+
+import os
+import unittest
+
+import numpy
+
+from Sepim.modules.gestionnaire_d_image import GestionnaireDImage
+from Sepim.modules.gestionnaire_extraction_des_sous_images import ExtractionParBandes, ExtractionParComposantesConnexes
+
+# ==================================================================================================
+# INITIALISATIONS
+# ==================================================================================================
+
+# Couleur de séparation utilisée par les tests
+COULEUR_DE_SEPARATION = numpy.array([181, 230, 29], dtype = numpy.uint8)
+
+# Nombre d'images aléatoires comparées
+NOMBRE_D_IMAGES_ALEATOIRES = 30
+
+# Dossier des images fournies avec le projet
+DOSSIER_DES_DONNEES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Donnees")
+
+# ==================================================================================================
+# CLASSES
+# ==================================================================================================
+
+
+# ===============================================
+class TestExtractionParBandes(unittest.TestCase):
+    """
+        Tests de la classe ExtractionParBandes : les limites des sous-images sont celles de ExtractionParComposantesConnexes,
+        quelle que soit la hauteur des bandes (les raccordements entre bandes étant assurés par l'union des étiquettes)
+    """
+
+    # ================================================
+    def comparaison(self, image, hauteurs_des_bandes):
+        """
+            Méthode qui permet de comparer les limites des sous-images extraites par bandes à celles de l'extraction en une passe
+
+            :param image: données de l'image
+            :type image: numpy.ndarray
+
+            :param hauteurs_des_bandes: hauteurs des bandes essayées
+            :type hauteurs_des_bandes: iterable[int]
+        """
+
+        reference = calcul_limites(ExtractionParComposantesConnexes(image, COULEUR_DE_SEPARATION).extraction_des_sous_images())
+
+        for hauteur_des_bandes in hauteurs_des_bandes:
+
+            with self.subTest(hauteur_des_bandes = hauteur_des_bandes):
+
+                self.assertEqual(calcul_limites(ExtractionParBandes(image, COULEUR_DE_SEPARATION, hauteur_des_bandes).extraction_des_sous_images()),
+                                 reference)
+
+    # ===============================================
+    def test_sous_images_traversant_les_bandes(self):
+        """
+            Des sous-images traversent une ou plusieurs frontières entre bandes, y compris avec des bandes d'un pixel de hauteur
+        """
+
+        image = creation_d_un_fond(40, 50)
+        image[3:9, 2:12] = (10, 20, 30)
+        image[5:35, 15:20] = (40, 50, 60)
+        image[12:14, 25:48] = (70, 80, 90)
+        image[20:39, 30:45] = (100, 110, 120)
+
+        self.comparaison(image, (1, 2, 3, 4, 7, 13, 40, 64))
+
+    # ===========================================
+    def test_contacts_uniquement_diagonaux(self):
+        """
+            Des pixels qui ne se touchent que par un coin, de part et d'autre d'une frontière, appartiennent à la même sous-image (8-connexité)
+        """
+
+        image = creation_d_un_fond(30, 30)
+
+        # escalier descendant vers la droite, puis vers la gauche : chaque marche ne touche la suivante que par un coin
+        for position in range(12):
+
+            image[position, position] = (10, 20, 30)
+            image[position + 15, 20 - position] = (40, 50, 60)
+
+        self.comparaison(image, (1, 2, 3, 5, 30))
+        self.assertEqual(len(ExtractionParBandes(image, COULEUR_DE_SEPARATION, 1).extraction_des_sous_images()), 2)
+
+    # =============================================
+    def test_composantes_raccordees_plus_bas(self):
+        """
+            Les deux branches d'un « U » sont distinctes dans les premières bandes et ne se rejoignent que dans une bande suivante
+            (le raccordement doit remonter aux étiquettes des bandes précédentes)
+        """
+
+        image = creation_d_un_fond(30, 30)
+        image[2:20, 3:6] = (10, 20, 30)
+        image[2:20, 20:23] = (10, 20, 30)
+        image[18:21, 3:23] = (10, 20, 30)
+
+        # « U » renversé, dont les branches se séparent après leur jonction
+        image[22:23, 8:18] = (40, 50, 60)
+        image[22:29, 8:9] = (40, 50, 60)
+        image[22:29, 17:18] = (40, 50, 60)
+
+        self.comparaison(image, (1, 2, 3, 4, 30))
+
+    # ===============================
+    def test_images_aleatoires(self):
+        """
+            Images aléatoires : rectangles, pixels isolés et traits diagonaux, pour des hauteurs de bandes quelconques
+        """
+
+        generateur = numpy.random.default_rng(0)
+
+        for essai in range(NOMBRE_D_IMAGES_ALEATOIRES):
+
+            with self.subTest(essai = essai):
+
+                image = creation_d_une_image_aleatoire(generateur)
+                self.comparaison(image, (1, 2, 3, int(generateur.integers(4, image.shape[0] + 2))))
+
+
+
+# ========================================================
+class TestPariteAvecLeMoteurHistorique(unittest.TestCase):
+    """
+        Tests des moteurs vectorisés sur les images fournies : les limites des sous-images sont celles du moteur historique
+    """
+
+    # =================================================
+    def comparaison_au_moteur_historique(self, moteur):
+        """
+            Méthode qui permet de comparer, pour chaque image fournie, les limites des sous-images extraites par un moteur à celles du moteur historique
+
+            :param moteur: nom du moteur d'extraction (cf. Sepim.modules.gestionnaire_extraction_des_sous_images.MOTEURS_D_EXTRACTION)
+            :type moteur: str
+        """
+
+        for nom in sorted(os.listdir(DOSSIER_DES_DONNEES)):
+
+            with self.subTest(image = nom):
+
+                reference = calcul_limites_extraites(nom, "historique")
+
+                self.assertTrue(reference)
+                self.assertEqual(calcul_limites_extraites(nom, moteur), reference)
+
+    # ========================
+    def test_decoupe_xy(self):
+        """
+            Le moteur de découpe XY extrait les mêmes sous-images que le moteur historique
+        """
+
+        self.comparaison_au_moteur_historique("decoupe_xy")
+
+    # ==================================
+    def test_composantes_connexes(self):
+        """
+            Le moteur par composantes connexes extrait les mêmes sous-images que le moteur historique
+        """
+
+        self.comparaison_au_moteur_historique("composantes_connexes")
+
+# ==================================================================================================
+# FONCTIONS
+# ==================================================================================================
+
+
+# =======================================
+def creation_d_un_fond(hauteur, largeur):
+    """
+        Fonction qui permet de créer une image entièrement de la couleur de séparation
+
+        :param hauteur: hauteur de l'image
+        :type hauteur: int
+
+        :param largeur: largeur de l'image
+        :type largeur: int
+
+        :return: les données de l'image
+        :rtype: numpy.ndarray
+    """
+
+    return numpy.tile(COULEUR_DE_SEPARATION, (hauteur, largeur, 1))
+
+
+# =============================================
+def creation_d_une_image_aleatoire(generateur):
+    """
+        Fonction qui permet de créer une image aléatoire : rectangles, pixels isolés et traits diagonaux sur la couleur de séparation
+
+        :param generateur: générateur de nombres aléatoires
+        :type generateur: numpy.random.Generator
+
+        :return: les données de l'image
+        :rtype: numpy.ndarray
+    """
+
+    hauteur, largeur = generateur.integers(8, 60, 2).tolist()
+    image = creation_d_un_fond(hauteur, largeur)
+
+    for _ in range(generateur.integers(1, 8)):
+
+        haut, bas = sorted(generateur.integers(0, hauteur, 2).tolist())
+        gauche, droite = sorted(generateur.integers(0, largeur, 2).tolist())
+        image[haut:bas + 1, gauche:droite + 1] = generateur.integers(0, 180, 3)
+
+    for _ in range(generateur.integers(0, 10)):
+
+        image[generateur.integers(0, hauteur), generateur.integers(0, largeur)] = (0, 0, 0)
+
+    for _ in range(generateur.integers(0, 3)):
+
+        ligne, colonne, sens = int(generateur.integers(0, hauteur)), int(generateur.integers(0, largeur)), int(generateur.choice((-1, 1)))
+
+        while 0 <= ligne < hauteur and 0 <= colonne < largeur:
+
+            image[ligne, colonne] = (255, 255, 255)
+            ligne, colonne = ligne + 1, colonne + sens
+
+    return image
+
+
+# ========================================
+def calcul_limites_extraites(nom, moteur):
+    """
+        Fonction qui permet d'extraire les sous-images d'une image fournie et de récupérer leurs limites
+
+        :param nom: nom de l'image, dans le dossier des images fournies
+        :type nom: str
+
+        :param moteur: nom du moteur d'extraction
+        :type moteur: str
+
+        :return: les limites (haute, gauche, basse, droite) de chaque sous-image, triées
+        :rtype: list[tuple(int, int, int, int)]
+    """
+
+    gestionnaire = GestionnaireDImage(nom, DOSSIER_DES_DONNEES, COULEUR_DE_SEPARATION, moteur_d_extraction = moteur)
+    gestionnaire.chargement_de_l_image_a_traiter()
+    gestionnaire.extraction_des_sous_images()
+
+    return sorted(tuple(limites) for limites in gestionnaire.get_limites_des_sous_images_extraites())
+
+
+# ==============================
+def calcul_limites(sous_images):
+    """
+        Fonction qui permet de récupérer les limites (haute, gauche, basse, droite) de chaque sous-image
+
+        :param sous_images: sous-images extraites
+        :type sous_images: list[Sepim.modules.objet_image.ObjetImage]
+
+        :return: les limites de chaque sous-image
+        :rtype: list[tuple(int, int, int, int)]
+    """
+
+    return [(int(sous_image.get_limite_haute()), int(sous_image.get_limite_gauche()), int(sous_image.get_limite_basse()),
+             int(sous_image.get_limite_droite())) for sous_image in sous_images]
+
+# ==================================================================================================
+# UTILISATION
+# ==================================================================================================
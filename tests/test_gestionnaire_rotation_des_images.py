@@ -0,0 +1,145 @@
+# coding=utf-8
+
+"""
+    Tests de la rotation des sous-images (Sepim.modules.gestionnaire_rotation_des_images)
+"""
+
+# ==================================================================================================
+# IMPORTS
+# ==================================================================================================
+
+import unittest
+import warnings
+
+import cv2
+import numpy
+
+from Sepim.modules.objet_image import ObjetImage
+from Sepim.modules.gestionnaire_rotation_des_images import RotationDesImages
+
+# ==================================================================================================
+# INITIALISATIONS
+# ==================================================================================================
+
+# Couleur de séparation utilisée par les tests
+COULEUR_DE_SEPARATION = numpy.array([181, 230, 29], dtype = numpy.uint8)
+
+# ==================================================================================================
+# CLASSES
+# ==================================================================================================
+
+
+# =============================================
+class TestRotationDesImages(unittest.TestCase):
+    """
+        Tests de la classe RotationDesImages
+    """
+
+    # ==================================
+    def test_grande_image_tournee(self):
+        """
+            Une image tournée plus grande que la copie réduite d'estimation est redressée à ses dimensions d'origine
+            (les coins d'une image tournée ne doivent pas être perdus par la réduction)
+        """
+
+        for angle in (7, 30, 41):
+
+            with self.subTest(angle = angle), warnings.catch_warnings():
+
+                warnings.simplefilter("error")
+
+                image = creation_d_une_sous_image(creation_d_une_image_tournee(1000, 1500, angle))
+                angle_applique = RotationDesImages(image, COULEUR_DE_SEPARATION).detection_rotation()
+
+                self.assertAlmostEqual(angle_applique, -angle, delta = 0.5)
+                self.assertLessEqual(abs(image.get_donnees_image().shape[0] - 1000), 10)
+                self.assertLessEqual(abs(image.get_donnees_image().shape[1] - 1500), 10)
+
+    # ==========================
+    def test_image_droite(self):
+        """
+            Une image droite n'est pas tournée
+        """
+
+        donnees_image = creation_d_une_image_tournee(300, 500, 0)
+        image = creation_d_une_sous_image(donnees_image)
+
+        self.assertEqual(RotationDesImages(image, COULEUR_DE_SEPARATION).detection_rotation(), 0.0)
+        self.assertEqual(image.get_donnees_image().shape, donnees_image.shape)
+
+    # =========================================
+    def test_points_de_contact_bord_vide(self):
+        """
+            Un bord de l'image sans contenu ne produit pas de point de contact indéfini : les bords sont ceux de la boîte englobante du contenu
+        """
+
+        masque_du_contenu = numpy.zeros((20, 30), dtype = bool)
+        masque_du_contenu[5:15, 8:20] = True
+
+        rotation = RotationDesImages(None, COULEUR_DE_SEPARATION)
+
+        self.assertEqual(rotation.calcul_points_de_contact(masque_du_contenu), [(5.0, 13.5), (9.5, 8.0), (14.0, 13.5), (9.5, 19.0)])
+        self.assertIsNone(rotation.calcul_points_de_contact(numpy.zeros((20, 30), dtype = bool)))
+
+# ==================================================================================================
+# FONCTIONS
+# ==================================================================================================
+
+
+# ========================================================
+def creation_d_une_image_tournee(hauteur, largeur, angle):
+    """
+        Fonction qui permet de créer une image (hauteur x largeur) de contenu aléatoire, tournée de l'angle indiqué sur un fond de la couleur de séparation,
+        et réduite à la boîte englobante de son contenu
+
+        :param hauteur: hauteur de l'image avant rotation
+        :type hauteur: int
+
+        :param largeur: largeur de l'image avant rotation
+        :type largeur: int
+
+        :param angle: angle de la rotation (en degrés, sens trigonométrique)
+        :type angle: float
+
+        :return: les données de l'image tournée
+        :rtype: numpy.ndarray
+    """
+
+    generateur = numpy.random.default_rng(0)
+
+    # contenu en blocs de 20 pixels, aucun bloc n'ayant la couleur de séparation
+    contenu = cv2.resize(generateur.integers(0, 180, (hauteur // 20 + 1, largeur // 20 + 1, 3), dtype = numpy.uint8), (largeur, hauteur),
+                         interpolation = cv2.INTER_NEAREST)
+
+    diagonale = int(numpy.hypot(hauteur, largeur)) + 4
+    matrice = cv2.getRotationMatrix2D((largeur / 2.0, hauteur / 2.0), angle, 1.0)
+    matrice[:, 2] += ((diagonale - largeur) / 2.0, (diagonale - hauteur) / 2.0)
+
+    donnees_image = cv2.warpAffine(contenu, matrice, (diagonale, diagonale), flags = cv2.INTER_NEAREST, borderMode = cv2.BORDER_CONSTANT,
+                                   borderValue = COULEUR_DE_SEPARATION.tolist())
+
+    lignes, colonnes = numpy.nonzero((donnees_image != COULEUR_DE_SEPARATION).any(axis = 2))
+
+    return numpy.ascontiguousarray(donnees_image[lignes.min():lignes.max() + 1, colonnes.min():colonnes.max() + 1])
+
+
+# ===========================================
+def creation_d_une_sous_image(donnees_image):
+    """
+        Fonction qui permet de créer une sous-image couvrant l'ensemble des données indiquées
+
+        :param donnees_image: données de l'image
+        :type donnees_image: numpy.ndarray
+
+        :return: la sous-image
+        :rtype: Sepim.modules.objet_image.ObjetImage
+    """
+
+    image = ObjetImage(0, 0, donnees_image.shape[0] - 1, donnees_image.shape[1] - 1)
+    image.set_donnees_image(donnees_image)
+
+    return image
+
+# ==================================================================================================
+# UTILISATION
+# ==================================================================================================